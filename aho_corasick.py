@@ -0,0 +1,104 @@
+from bisect import bisect_right
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+class AhoCorasick:
+    """Autômato de Aho-Corasick para buscar vários padrões numa única passada pelo texto."""
+
+    def __init__(self, padroes: Iterable[str]):
+        # Cada estado guarda suas transições, o link de falha, o comprimento do
+        # padrão que termina nele (0 se nenhum), a posição desse padrão na lista
+        # recebida e o link para o próximo estado terminal alcançável pelos links de falha.
+        self._transicoes: List[Dict[str, int]] = [{}]
+        self._falha: List[int] = [0]
+        self._comprimento: List[int] = [0]
+        self._ordem: List[int] = [0]
+        self._saida: List[int] = [0]
+
+        for ordem, padrao in enumerate(padroes):
+            if padrao:
+                self._adicionar(padrao, ordem)
+        self._construir_links()
+
+    def _adicionar(self, padrao: str, ordem: int):
+        estado = 0
+        for caractere in padrao:
+            proximo = self._transicoes[estado].get(caractere)
+            if proximo is None:
+                proximo = len(self._transicoes)
+                self._transicoes.append({})
+                self._falha.append(0)
+                self._comprimento.append(0)
+                self._ordem.append(0)
+                self._saida.append(0)
+                self._transicoes[estado][caractere] = proximo
+            estado = proximo
+        if not self._comprimento[estado]:
+            self._comprimento[estado] = len(padrao)
+            self._ordem[estado] = ordem
+
+    def _construir_links(self):
+        fila = deque(self._transicoes[0].values())
+        while fila:
+            estado = fila.popleft()
+            for caractere, proximo in self._transicoes[estado].items():
+                fila.append(proximo)
+                falha = self._falha[estado]
+                while falha and caractere not in self._transicoes[falha]:
+                    falha = self._falha[falha]
+                destino = self._transicoes[falha].get(caractere, 0)
+                self._falha[proximo] = destino if destino != proximo else 0
+                alvo = self._falha[proximo]
+                self._saida[proximo] = alvo if self._comprimento[alvo] else self._saida[alvo]
+
+    def __bool__(self) -> bool:
+        return len(self._transicoes) > 1
+
+    def encontrar(self, texto: str) -> Iterator[Tuple[int, int]]:
+        """Gera (inicio, fim) de todas as ocorrências, inclusive sobrepostas."""
+        for inicio, fim, _ in self._ocorrencias(texto):
+            yield inicio, fim
+
+    def _ocorrencias(self, texto: str) -> Iterator[Tuple[int, int, int]]:
+        transicoes, falha = self._transicoes, self._falha
+        comprimento, ordem, saida = self._comprimento, self._ordem, self._saida
+        estado = 0
+
+        for posicao, caractere in enumerate(texto):
+            while estado and caractere not in transicoes[estado]:
+                estado = falha[estado]
+            estado = transicoes[estado].get(caractere, 0)
+
+            terminal = estado if comprimento[estado] else saida[estado]
+            while terminal:
+                fim = posicao + 1
+                yield fim - comprimento[terminal], fim, ordem[terminal]
+                terminal = saida[terminal]
+
+    def encontrar_mais_longos(self, texto: str) -> List[Tuple[int, int]]:
+        """Retorna as ocorrências sem sobreposição, em ordem de posição, escolhidas
+        como numa sequência de str.replace do padrão mais longo para o mais curto:
+        os mais longos do texto inteiro vêm primeiro (empates na ordem em que os
+        padrões foram recebidos), cada um da esquerda para a direita, e uma
+        ocorrência que cruza um trecho já escolhido é descartada."""
+        ocorrencias = sorted(self._ocorrencias(texto), key=lambda o: (o[0] - o[1], o[2], o[0]))
+
+        inicios: List[int] = []
+        fins: List[int] = []
+        for inicio, fim, _ in ocorrencias:
+            # Trechos escolhidos não se sobrepõem: basta olhar o vizinho de cada lado.
+            indice = bisect_right(inicios, inicio)
+            if indice and fins[indice - 1] > inicio:
+                continue
+            if indice < len(inicios) and inicios[indice] < fim:
+                continue
+            inicios.insert(indice, inicio)
+            fins.insert(indice, fim)
+        return list(zip(inicios, fins))
+
+    def contem_algum(self, texto: str) -> bool:
+        """Indica se ao menos um padrão ocorre no texto."""
+        for _ in self.encontrar(texto):
+            return True
+        return False
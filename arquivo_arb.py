@@ -0,0 +1,58 @@
+import json
+import os
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+def gravar_atomicamente(caminho: str, conteudo: str):
+    """Grava num arquivo temporário e troca pelo destino com rename, para que quem
+    lê o arquivo (ou uma queda no meio da escrita) nunca veja metade do conteúdo."""
+    diretorio = os.path.dirname(caminho)
+    if diretorio:
+        os.makedirs(diretorio, exist_ok=True)
+    caminho_temporario = f"{caminho}.tmp"
+    with open(caminho_temporario, 'w', encoding='utf-8') as f:
+        f.write(conteudo)
+    os.replace(caminho_temporario, caminho)
+
+
+def nome_arquivo_idioma(idioma: str) -> str:
+    # Hifens viram underscores no nome do arquivo (ex: zh-CN -> app_zh_CN.arb).
+    return f"app_{idioma.replace('-', '_')}.arb"
+
+
+def caminho_snapshot(caminho_saida: str) -> str:
+    """Arquivo com os valores de origem usados na última tradução de `caminho_saida`."""
+    diretorio, nome = os.path.split(caminho_saida)
+    return os.path.join(diretorio, f".{nome}.fonte.json")
+
+
+def ler_arb(caminho: str, ausente_vazio: bool = False) -> Optional[Dict[str, Any]]:
+    """Carrega um .arb. Em caso de erro imprime a mensagem e retorna None; com
+    `ausente_vazio`, um arquivo que não existe equivale a um .arb vazio."""
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+    except FileNotFoundError:
+        if ausente_vazio:
+            return {}
+        print(f"Erro: Arquivo .arb não encontrado em '{caminho}'")
+        return None
+    except json.JSONDecodeError:
+        print(f"Erro: O arquivo '{caminho}' não é um JSON válido.")
+        return None
+    if not isinstance(dados, dict):
+        print(f"Erro: O arquivo '{caminho}' não é um objeto .arb.")
+        return None
+    return dados
+
+
+def entradas_de_texto(dados_arb: Dict[str, Any]) -> Iterator[Tuple[str, str]]:
+    """Pares (chave, valor) traduzíveis do .arb: sem os metadados '@' e só valores de texto."""
+    for chave, valor in dados_arb.items():
+        if not chave.startswith('@') and isinstance(valor, str):
+            yield chave, valor
+
+
+def gravar_arb(caminho: str, dados_arb: Dict[str, Any]):
+    """Grava o .arb no formato usado pelo Flutter (indentação 2, acentos sem escape)."""
+    gravar_atomicamente(caminho, json.dumps(dados_arb, ensure_ascii=False, indent=2))
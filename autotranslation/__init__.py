@@ -0,0 +1 @@
+"""CLI única das ferramentas: python -m autotranslation <comando> [opções]."""
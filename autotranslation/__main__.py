@@ -0,0 +1,10 @@
+import os
+import sys
+
+if not __package__:
+    # Executado como `python caminho/para/autotranslation ...` (ex: num hook do git de outro projeto).
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from autotranslation.cli import main
+
+sys.exit(main())
@@ -0,0 +1,56 @@
+import importlib
+import os
+import sys
+from typing import List, NamedTuple, Optional
+
+# Os módulos das ferramentas ficam na raiz do repositório, fora do pacote.
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Comando(NamedTuple):
+    modulo: str
+    funcao: str
+    descricao: str
+
+
+# Cada comando só importa o módulo da sua ferramenta (e as dependências dela) quando
+# é executado, então `extract` e `replace` não pagam pelo tradutor, SQLite, etc.
+COMANDOS = {
+    'extract': Comando('main4-v2', 'main', "Extrai as strings dos arquivos Dart para um JSON (main4-v2.py)."),
+    'keygen': Comando('main3', 'main', "Gera um .arb com chaves a partir de uma lista de valores (main3.py)."),
+    'replace': Comando('main', 'main', "Substitui as strings dos arquivos pelas chaves do .arb (main.py)."),
+    'translate': Comando('main2', 'main2', "Traduz os valores de um .arb para outros idiomas (main2.py)."),
+    'pipeline': Comando('pipeline', 'main', "Extrai, gera as chaves, substitui e traduz num único processo (pipeline.py)."),
+    'catalog': Comando('catalogo', 'main', "Catálogo SQLite com todos os idiomas; importa e exporta os .arb (catalogo.py)."),
+}
+
+
+def texto_de_uso() -> str:
+    linhas = ["uso: autotranslation <comando> [opções]", "", "comandos:"]
+    for nome, comando in COMANDOS.items():
+        linhas.append(f"  {nome:<10} {comando.descricao}")
+    linhas += ["", "Use 'autotranslation <comando> --help' para ver as opções de cada comando."]
+    return '\n'.join(linhas)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argumentos = sys.argv[1:] if argv is None else list(argv)
+    if not argumentos or argumentos[0] in ('-h', '--help'):
+        print(texto_de_uso())
+        return 0 if argumentos else 2
+
+    nome = argumentos[0]
+    comando = COMANDOS.get(nome)
+    if comando is None:
+        print(f"autotranslation: comando desconhecido '{nome}'.\n", file=sys.stderr)
+        print(texto_de_uso(), file=sys.stderr)
+        return 2
+
+    if RAIZ not in sys.path:
+        sys.path.insert(0, RAIZ)
+    # importlib porque 'main4-v2' não é um nome válido num import comum.
+    modulo = importlib.import_module(comando.modulo)
+    # As ferramentas imprimem os erros e retornam False (ou None); o código de saída
+    # diferente de zero é o que permite a um hook do git saber que a execução falhou.
+    sucesso = getattr(modulo, comando.funcao)(argumentos[1:], prog=f"autotranslation {nome}")
+    return 0 if sucesso else 1
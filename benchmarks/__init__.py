@@ -0,0 +1,5 @@
+"""Benchmarks reprodutíveis das ferramentas sobre um corpus Flutter sintético.
+
+    python -m benchmarks.gerador --pasta /tmp/corpus --arb /tmp/corpus/app_pt.arb
+    python -m benchmarks.executar --saida resultados.json --comparar resultados_anteriores.json
+"""
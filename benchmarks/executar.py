@@ -0,0 +1,238 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from benchmarks.gerador import ParametrosCorpus, gerar_arb, gerar_arvore_dart, gerar_valores
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+VERSAO_RESULTADOS = 1
+FERRAMENTAS = ['substituicao', 'extracao', 'chaves', 'traducao']
+CHAVES_PADRAO = [1000, 10000, 100000]
+TOLERANCIA_PADRAO = 0.10
+
+
+class Benchmark(NamedTuple):
+    nome: str
+    ferramenta: str
+    tamanho: int
+    argumentos: List[str]
+    # Executado antes de cada repetição, fora da medição (ex: restaurar arquivos alterados).
+    preparar: Optional[Callable[[], None]] = None
+
+
+def executar_script(argumentos: List[str], pasta: str) -> Tuple[float, Optional[int]]:
+    """Roda um script do repositório num processo novo e retorna o tempo de
+    parede em segundos e o pico de memória do processo em KB (quando disponível)."""
+    with tempfile.TemporaryFile() as erros:
+        inicio = time.perf_counter()
+        processo = subprocess.Popen([sys.executable, *argumentos], cwd=pasta,
+                                    stdout=subprocess.DEVNULL, stderr=erros)
+        if hasattr(os, 'wait4'):
+            _, status, uso = os.wait4(processo.pid, 0)
+            duracao = time.perf_counter() - inicio
+            processo.returncode = os.waitstatus_to_exitcode(status)
+            memoria_kb: Optional[int] = uso.ru_maxrss
+        else:
+            processo.wait()
+            duracao = time.perf_counter() - inicio
+            memoria_kb = None
+
+        if processo.returncode != 0:
+            erros.seek(0)
+            mensagem = erros.read().decode('utf-8', 'replace').strip().splitlines()
+            raise RuntimeError(f"'{' '.join(argumentos)}' terminou com código {processo.returncode}: "
+                               f"{mensagem[-1] if mensagem else ''}")
+    return duracao, memoria_kb
+
+
+def _restaurar_copia(origem: str, destino: str) -> Callable[[], None]:
+    def preparar():
+        shutil.rmtree(destino, ignore_errors=True)
+        shutil.copytree(origem, destino)
+    return preparar
+
+
+def montar_benchmarks(pasta: str, semente: int, parametros: ParametrosCorpus, tamanhos: List[int],
+                      ferramentas: List[str], jobs: int) -> List[Benchmark]:
+    """Gera o corpus, os ARBs e as listas de valores em `pasta` e monta os comandos."""
+    script = lambda nome: os.path.join(RAIZ, nome)
+    corpus = os.path.join(pasta, 'corpus')
+    textos = gerar_arvore_dart(corpus, semente, parametros)
+    lib = os.path.join(corpus, 'lib')
+    benchmarks = []
+
+    if 'extracao' in ferramentas:
+        benchmarks.append(Benchmark('extracao', 'main4-v2.py', parametros.arquivos, [
+            script('main4-v2.py'), '--pasta', lib, '--saida', os.path.join(pasta, 'extraido.json'),
+            '--sem-cache', '--jobs', str(jobs)]))
+
+    for tamanho in tamanhos:
+        arb = os.path.join(pasta, f'app_pt_{tamanho}.arb')
+        if {'substituicao', 'traducao'} & set(ferramentas):
+            gerar_arb(arb, tamanho, semente, textos)
+
+        if 'substituicao' in ferramentas:
+            copia = os.path.join(pasta, f'substituicao_{tamanho}')
+            benchmarks.append(Benchmark(f'substituicao_{tamanho}', 'main.py', tamanho, [
+                script('main.py'), '--arb', arb, '--pasta', copia, '--sem-cache', '--jobs', str(jobs)],
+                _restaurar_copia(lib, copia)))
+
+        if 'chaves' in ferramentas:
+            valores = os.path.join(pasta, f'valores_{tamanho}.json')
+            gerar_valores(valores, tamanho, semente)
+            for variante, extra in (('', []), ('_streaming', ['--streaming'])):
+                benchmarks.append(Benchmark(f'chaves{variante}_{tamanho}', 'main3.py', tamanho, [
+                    script('main3.py'), '--entrada', valores, '--saida', os.path.join(pasta, f'chaves_{tamanho}.arb'), *extra]))
+
+        if 'traducao' in ferramentas:
+            # Backend pseudo: offline e determinístico, mede só o custo das ferramentas.
+            for variante, extra in (('', []), ('_lotes', ['--lotes'])):
+                benchmarks.append(Benchmark(f'traducao{variante}_{tamanho}', 'main2.py', tamanho, [
+                    script('main2.py'), '--entrada', arb, '--saida', os.path.join(pasta, f'app_en_{tamanho}.arb'),
+                    '--idioma', 'en', '--fonte', 'pt', '--tradutor', 'pseudo', '--sem-memoria', '--silencioso', *extra]))
+
+    return benchmarks
+
+
+def medir(benchmark: Benchmark, pasta: str, repeticoes: int) -> Dict[str, Any]:
+    tempos = []
+    memoria_maxima = None
+    for _ in range(repeticoes):
+        if benchmark.preparar:
+            benchmark.preparar()
+        duracao, memoria_kb = executar_script(benchmark.argumentos, pasta)
+        tempos.append(round(duracao, 4))
+        if memoria_kb is not None:
+            memoria_maxima = max(memoria_maxima or 0, memoria_kb)
+    return {
+        'ferramenta': benchmark.ferramenta,
+        'tamanho': benchmark.tamanho,
+        'tempos_segundos': tempos,
+        'mediana_segundos': round(statistics.median(tempos), 4),
+        'minimo_segundos': min(tempos),
+        'memoria_maxima_kb': memoria_maxima,
+    }
+
+
+def commit_atual() -> Optional[str]:
+    try:
+        saida = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=RAIZ, capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return saida.stdout.strip()
+
+
+def comparar(atual: Dict[str, Any], anterior: Dict[str, Any], tolerancia: float) -> int:
+    """Imprime a variação da mediana de cada benchmark em relação a uma execução
+    anterior e retorna quantos ficaram mais lentos que a tolerância."""
+    campos_do_corpus = ('semente', 'arquivos', 'linhas', 'densidade', 'jobs')
+    parametros_anteriores = anterior.get('parametros', {})
+    if any(atual['parametros'][campo] != parametros_anteriores.get(campo) for campo in campos_do_corpus):
+        print("Aviso: os parâmetros do corpus diferem entre as execuções; a comparação pode não ser justa.")
+
+    commit = (anterior.get('commit') or '?')[:10]
+    print(f"\nComparação com {commit} ({anterior.get('data', '?')}):")
+    regressoes = 0
+    for nome, resultado in atual['resultados'].items():
+        referencia = anterior.get('resultados', {}).get(nome)
+        if not referencia:
+            print(f"  {nome:<28} {resultado['mediana_segundos']:>9.3f}s  (novo)")
+            continue
+        antes = referencia['mediana_segundos']
+        depois = resultado['mediana_segundos']
+        variacao = (depois - antes) / antes if antes else 0.0
+        marcador = ''
+        if variacao > tolerancia:
+            marcador = '  REGRESSÃO'
+            regressoes += 1
+        print(f"  {nome:<28} {antes:>9.3f}s -> {depois:>9.3f}s  {variacao:+7.1%}{marcador}")
+    return regressoes
+
+
+def main():
+    padrao = ParametrosCorpus()
+    parser = argparse.ArgumentParser(
+        description="Mede main.py, main4-v2.py, main3.py e main2.py sobre um corpus sintético gerado com semente fixa\n"
+                    "e grava os resultados em JSON, para comparar execuções entre commits.",
+        formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument('--saida', default='resultados_benchmark.json', help="Arquivo JSON com os resultados. Padrão: resultados_benchmark.json")
+    parser.add_argument('--comparar', help="Resultados de uma execução anterior; imprime a variação de cada benchmark.")
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA_PADRAO,
+                        help=f"Aumento da mediana considerado regressão no --comparar (o código de saída vira 1). Padrão: {TOLERANCIA_PADRAO}")
+    parser.add_argument('--so', nargs='+', choices=FERRAMENTAS, default=FERRAMENTAS, help="Roda só estes benchmarks. Padrão: todos")
+    parser.add_argument('--chaves', type=int, nargs='+', default=CHAVES_PADRAO, help=f"Tamanhos dos ARBs e listas de valores. Padrão: {' '.join(map(str, CHAVES_PADRAO))}")
+    parser.add_argument('--repeticoes', type=int, default=3, help="Execuções de cada benchmark; a mediana é usada na comparação. Padrão: 3")
+    parser.add_argument('--jobs', type=int, default=1, help="Valor de --jobs passado ao main.py e ao main4-v2.py. Padrão: 1")
+    parser.add_argument('--semente', type=int, default=1, help="Semente do corpus. Padrão: 1")
+    parser.add_argument('--arquivos', type=int, default=padrao.arquivos, help=f"Arquivos .dart do corpus. Padrão: {padrao.arquivos}")
+    parser.add_argument('--linhas', type=int, default=padrao.linhas_por_arquivo, help=f"Linhas médias por arquivo. Padrão: {padrao.linhas_por_arquivo}")
+    parser.add_argument('--densidade', type=float, default=padrao.densidade_literais, help=f"Fração das linhas com um literal. Padrão: {padrao.densidade_literais}")
+    parser.add_argument('--manter', help="Gera o corpus nesta pasta e a mantém no final, em vez de usar uma pasta temporária.")
+    args = parser.parse_args()
+
+    parametros = ParametrosCorpus(arquivos=args.arquivos, linhas_por_arquivo=args.linhas, densidade_literais=args.densidade)
+    pasta = args.manter or tempfile.mkdtemp(prefix='autotranslation-bench-')
+    os.makedirs(pasta, exist_ok=True)
+
+    try:
+        print(f"Gerando o corpus em '{pasta}'...")
+        benchmarks = montar_benchmarks(pasta, args.semente, parametros, args.chaves, args.so, args.jobs)
+        resultados = {}
+        for benchmark in benchmarks:
+            try:
+                resultado = medir(benchmark, pasta, args.repeticoes)
+            except RuntimeError as e:
+                print(f"Erro no benchmark '{benchmark.nome}': {e}")
+                continue
+            resultados[benchmark.nome] = resultado
+            memoria = f", {resultado['memoria_maxima_kb'] / 1024:.0f} MB" if resultado['memoria_maxima_kb'] else ''
+            print(f"  {benchmark.nome:<28} mediana {resultado['mediana_segundos']:.3f}s, mínimo {resultado['minimo_segundos']:.3f}s{memoria}")
+    finally:
+        if not args.manter:
+            shutil.rmtree(pasta, ignore_errors=True)
+
+    execucao = {
+        'versao': VERSAO_RESULTADOS,
+        'commit': commit_atual(),
+        'data': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+        'parametros': {
+            'semente': args.semente,
+            'arquivos': args.arquivos,
+            'linhas': args.linhas,
+            'densidade': args.densidade,
+            'chaves': args.chaves,
+            'repeticoes': args.repeticoes,
+            'jobs': args.jobs,
+        },
+        'resultados': resultados,
+    }
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump(execucao, f, ensure_ascii=False, indent=2)
+    print(f"Resultados salvos em '{args.saida}'.")
+
+    if args.comparar:
+        try:
+            with open(args.comparar, 'r', encoding='utf-8') as f:
+                anterior = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Erro ao ler '{args.comparar}': {e}")
+            sys.exit(2)
+        if comparar(execucao, anterior, args.tolerancia):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+import argparse
+import json
+import os
+import random
+import unicodedata
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Set
+
+PALAVRAS = (
+    "acesso agenda aluno aula avaliação bem-vindo busca cadastro calendário câmera cancelar carregando "
+    "confirmar conta continuar dados desafio descrição editar email enviar erro exercício falha "
+    "frequência grupo histórico hoje início meta minutos mensagem nome notificação novo objetivo "
+    "ontem opções pagamento perfil plano pontos preço próximo relatório resultado salvar semana "
+    "senha sessão sucesso telefone tempo treino usuário valor vídeo voltar zona cardíaca ritmo "
+    "distância calorias progresso amigos convite equipe ranking personal academia unidade horário "
+    "reservar vaga disponível esgotado lembrete ativar desativar permissão localização "
+    "configurações idioma tema escuro claro sair entrar recuperar código verificação termos "
+    "privacidade ajuda suporte contato sobre versão atualizar baixar compartilhar excluir "
+    "arquivo foto galeria selecionar anterior seguinte concluir iniciar pausar retomar finalizar "
+    "parabéns atenção aviso importante obrigatório inválido campo preencha corretamente"
+).split()
+
+CONECTORES = ['de', 'do', 'da', 'para', 'com', 'sem', 'no', 'na', 'e', 'ou', 'seu', 'sua']
+VARIAVEIS = ['nome', 'usuario.nome', 'total', 'aluno.pontos', 'minutos', 'data', 'meta.valor']
+CHAMADAS_LOG = ['debugPrint(', 'print(', 'log(', 'logger.e(', "logInfo(title: "]
+# (abertura, fechamento) em volta de cada texto de interface.
+CONTEXTOS_UI = [('Text(', ')'), ('title: ', ''), ('label: ', ''), ('hintText: ', ''),
+                ('SnackBar(content: Text(', '))'), ('tooltip: ', '')]
+
+
+@dataclass
+class ParametrosCorpus:
+    """Forma do corpus Dart gerado. As frações são probabilidades por linha ou literal."""
+    arquivos: int = 200
+    linhas_por_arquivo: int = 150
+    arquivos_por_pasta: int = 20
+    densidade_literais: float = 0.4
+    fracao_interpolacoes: float = 0.2
+    fracao_logs: float = 0.1
+    fracao_aspas_duplas: float = 0.15
+    imports_por_arquivo: int = 4
+
+
+def _frase(aleatorio: random.Random) -> str:
+    palavras = []
+    for i in range(aleatorio.randint(1, 6)):
+        if i and aleatorio.random() < 0.3:
+            palavras.append(aleatorio.choice(CONECTORES))
+        palavras.append(aleatorio.choice(PALAVRAS))
+    frase = ' '.join(palavras)
+    return frase[0].upper() + frase[1:]
+
+
+def gerar_frases(aleatorio: random.Random, quantidade: int) -> List[str]:
+    """`quantidade` frases distintas em português."""
+    vistas: Set[str] = set()
+    frases = []
+    while len(frases) < quantidade:
+        frase = _frase(aleatorio)
+        if frase in vistas:
+            # As frases geradas não têm dígitos, então o índice garante uma frase nova.
+            frase = f"{frase} {len(frases)}"
+        vistas.add(frase)
+        frases.append(frase)
+    return frases
+
+
+def _chave(frase: str, indice: int) -> str:
+    ascii_ = unicodedata.normalize('NFKD', frase).encode('ascii', 'ignore').decode('ascii').lower()
+    palavras = ''.join(c if c.isalnum() else ' ' for c in ascii_).split()
+    return '_'.join(palavras[:5] + [str(indice)])
+
+
+def _literal(texto: str, aspas: str) -> str:
+    if aspas == "'":
+        return "'" + texto.replace("'", "\\'") + "'"
+    return '"' + texto.replace('"', '\\"') + '"'
+
+
+def _linhas_do_arquivo(aleatorio: random.Random, parametros: ParametrosCorpus, frases: List[str],
+                       usadas: Set[str], indice: int, caminhos: List[str]) -> Iterator[str]:
+    yield "import 'package:flutter/material.dart';"
+    for caminho in aleatorio.sample(caminhos, min(parametros.imports_por_arquivo, len(caminhos))):
+        yield f"import 'package:app/{caminho}';"
+    yield ''
+    yield f"class Tela{indice} extends StatelessWidget {{"
+    yield '  @override'
+    yield '  Widget build(BuildContext context) {'
+
+    total = max(1, int(parametros.linhas_por_arquivo * aleatorio.uniform(0.5, 1.5)))
+    for linha in range(total):
+        if aleatorio.random() >= parametros.densidade_literais:
+            # Código sem texto traduzível, incluindo chaves de mapa que o extrator deve ignorar.
+            if aleatorio.random() < 0.2:
+                yield f"    final campo{linha} = json['campo_{linha}'];"
+            else:
+                yield f"    final v{linha} = v{max(0, linha - 1)} + {linha};"
+            continue
+
+        frase = aleatorio.choice(frases)
+        aspas = '"' if aleatorio.random() < parametros.fracao_aspas_duplas else "'"
+        if aleatorio.random() < parametros.fracao_logs:
+            yield f"    {aleatorio.choice(CHAMADAS_LOG)}{_literal('Carregando ' + frase, aspas)});"
+        elif aleatorio.random() < parametros.fracao_interpolacoes:
+            variavel = aleatorio.choice(VARIAVEIS)
+            interpolacao = f"${{{variavel}}}" if '.' in variavel else f"${variavel}"
+            yield f"    Text({_literal(f'{frase}: {interpolacao}', aspas)}),"
+        else:
+            if aspas == "'":
+                usadas.add(frase)
+            abertura, fechamento = aleatorio.choice(CONTEXTOS_UI)
+            yield f"    {abertura}{_literal(frase, aspas)}{fechamento},"
+
+    yield '  }'
+    yield '}'
+
+
+def gerar_arvore_dart(pasta: str, semente: int, parametros: Optional[ParametrosCorpus] = None,
+                      frases_distintas: Optional[int] = None) -> List[str]:
+    """Grava o corpus em `pasta`/lib e retorna, em ordem, as frases usadas em
+    literais simples com aspas simples (as que o main.py substitui)."""
+    parametros = parametros or ParametrosCorpus()
+    aleatorio = random.Random(semente)
+    literais_previstos = parametros.arquivos * parametros.linhas_por_arquivo * parametros.densidade_literais
+    frases = gerar_frases(aleatorio, frases_distintas or max(10, int(literais_previstos // 3)))
+
+    caminhos = []
+    for indice in range(parametros.arquivos):
+        modulo = indice // parametros.arquivos_por_pasta
+        subpasta = ('pages', 'widgets', 'components')[indice % 3]
+        caminhos.append(f"modulo{modulo}/{subpasta}/tela{indice}.dart")
+
+    usadas: Set[str] = set()
+    for indice, relativo in enumerate(caminhos):
+        caminho = os.path.join(pasta, 'lib', *relativo.split('/'))
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        with open(caminho, 'w', encoding='utf-8') as f:
+            for linha in _linhas_do_arquivo(aleatorio, parametros, frases, usadas, indice, caminhos):
+                f.write(linha + '\n')
+
+    return [frase for frase in frases if frase in usadas]
+
+
+def gerar_arb(caminho: str, chaves: int, semente: int, textos: Optional[List[str]] = None, idioma: str = 'pt'):
+    """ARB com `chaves` entradas. Os `textos` (ex: os do corpus) entram primeiro,
+    para que a substituição encontre os valores nos arquivos Dart."""
+    aleatorio = random.Random(semente)
+    valores = list(dict.fromkeys(textos or []))[:chaves]
+    conhecidos = set(valores)
+    # Frases suficientes mesmo que todas as do corpus se repitam entre as geradas.
+    for frase in gerar_frases(aleatorio, chaves + len(valores)):
+        if len(valores) >= chaves:
+            break
+        if frase not in conhecidos:
+            valores.append(frase)
+
+    dados = {'@@locale': idioma}
+    for indice, valor in enumerate(valores):
+        dados[_chave(valor, indice)] = valor
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(dados, f, ensure_ascii=False, indent=2)
+
+
+def gerar_valores(caminho: str, quantidade: int, semente: int, fracao_repetidos: float = 0.05):
+    """Lista JSON de strings para o main3, com alguns valores repetidos."""
+    aleatorio = random.Random(semente)
+    valores = gerar_frases(aleatorio, quantidade)
+    for indice in range(int(quantidade * fracao_repetidos)):
+        valores[aleatorio.randrange(quantidade)] = valores[indice]
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(valores, f, ensure_ascii=False, indent=2)
+
+
+def main():
+    padrao = ParametrosCorpus()
+    parser = argparse.ArgumentParser(description="Gera um corpus Flutter sintético e reprodutível para benchmarks.")
+    parser.add_argument('--pasta', required=True, help="Pasta onde o corpus (lib/...) é gravado.")
+    parser.add_argument('--semente', type=int, default=1, help="Semente do gerador; a mesma semente gera os mesmos arquivos. Padrão: 1")
+    parser.add_argument('--arquivos', type=int, default=padrao.arquivos, help=f"Número de arquivos .dart. Padrão: {padrao.arquivos}")
+    parser.add_argument('--linhas', type=int, default=padrao.linhas_por_arquivo, help=f"Linhas médias por arquivo (varia entre 50%% e 150%%). Padrão: {padrao.linhas_por_arquivo}")
+    parser.add_argument('--densidade', type=float, default=padrao.densidade_literais, help=f"Fração das linhas com um literal. Padrão: {padrao.densidade_literais}")
+    parser.add_argument('--interpolacoes', type=float, default=padrao.fracao_interpolacoes, help=f"Fração dos literais com interpolação. Padrão: {padrao.fracao_interpolacoes}")
+    parser.add_argument('--logs', type=float, default=padrao.fracao_logs, help=f"Fração dos literais em chamadas de log. Padrão: {padrao.fracao_logs}")
+    parser.add_argument('--imports', type=int, default=padrao.imports_por_arquivo, help=f"Imports por arquivo. Padrão: {padrao.imports_por_arquivo}")
+    parser.add_argument('--arb', help="Também grava um ARB com os textos do corpus neste caminho.")
+    parser.add_argument('--chaves', type=int, default=1000, help="Número de chaves do ARB gerado (completado com frases novas). Padrão: 1000")
+    parser.add_argument('--valores', help="Também grava uma lista JSON de valores para o main3 neste caminho (com --chaves valores).")
+    args = parser.parse_args()
+
+    parametros = ParametrosCorpus(
+        arquivos=args.arquivos,
+        linhas_por_arquivo=args.linhas,
+        densidade_literais=args.densidade,
+        fracao_interpolacoes=args.interpolacoes,
+        fracao_logs=args.logs,
+        imports_por_arquivo=args.imports,
+    )
+    textos = gerar_arvore_dart(args.pasta, args.semente, parametros)
+    print(f"Corpus gravado em '{args.pasta}': {parametros.arquivos} arquivos, {len(textos)} textos substituíveis.")
+    if args.arb:
+        gerar_arb(args.arb, args.chaves, args.semente, textos)
+        print(f"ARB com {args.chaves} chaves gravado em '{args.arb}'.")
+    if args.valores:
+        gerar_valores(args.valores, args.chaves, args.semente)
+        print(f"Lista com {args.chaves} valores gravada em '{args.valores}'.")
+
+
+if __name__ == "__main__":
+    main()
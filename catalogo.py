@@ -0,0 +1,468 @@
+import argparse
+import glob
+import json
+import os
+import sqlite3
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from arquivo_arb import caminho_snapshot, gravar_atomicamente, nome_arquivo_idioma
+from importar_memoria import carregar_arb, idioma_do_arb
+from manifesto import hash_conteudo, stat_inalterado
+
+ARQUIVO_CATALOGO_PADRAO = '.autotranslation-catalogo.sqlite'
+
+# Limite de variáveis por consulta nas versões mais antigas do SQLite.
+TAMANHO_CONSULTA = 500
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS propriedades (
+    nome TEXT PRIMARY KEY,
+    valor TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS idiomas (
+    idioma TEXT PRIMARY KEY,
+    arquivo TEXT,
+    tamanho INTEGER,
+    mtime_ns INTEGER,
+    sha1 TEXT,
+    revisao INTEGER NOT NULL DEFAULT 0,
+    revisao_exportada INTEGER NOT NULL DEFAULT -1
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS entradas (
+    chave TEXT NOT NULL,
+    idioma TEXT NOT NULL,
+    valor TEXT,
+    metadados TEXT,
+    hash_fonte TEXT,
+    origem TEXT,
+    ordem INTEGER NOT NULL,
+    atualizado REAL NOT NULL,
+    PRIMARY KEY (idioma, chave)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_entradas_chave ON entradas (chave, idioma);
+"""
+
+# Um valor só muda de origem quando o texto muda; reimportar um arquivo só com
+# metadados ou a ordem diferentes preserva a procedência da tradução. O hash da fonte
+# também é mantido para o mesmo texto, a menos que um novo seja informado.
+GRAVAR_ENTRADA = """
+INSERT INTO entradas (chave, idioma, valor, metadados, hash_fonte, origem, ordem, atualizado)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (idioma, chave) DO UPDATE SET
+    hash_fonte = CASE WHEN valor IS excluded.valor THEN COALESCE(excluded.hash_fonte, hash_fonte) ELSE excluded.hash_fonte END,
+    origem = CASE WHEN valor IS excluded.valor THEN origem ELSE excluded.origem END,
+    valor = excluded.valor,
+    metadados = excluded.metadados,
+    ordem = excluded.ordem,
+    atualizado = excluded.atualizado
+WHERE valor IS NOT excluded.valor OR metadados IS NOT excluded.metadados OR ordem IS NOT excluded.ordem
+    OR (excluded.hash_fonte IS NOT NULL AND hash_fonte IS NOT excluded.hash_fonte)
+"""
+
+
+def _serializar(valor: Any) -> str:
+    return json.dumps(valor, ensure_ascii=False)
+
+
+def _hashes_do_snapshot(caminho: str) -> Dict[str, str]:
+    """Hash do valor de origem de que cada chave de um .arb traduzido foi traduzida,
+    segundo o snapshot gravado ao lado dele pelo main2 --incremental ou pelo pipeline."""
+    try:
+        snapshot = carregar_arb(caminho_snapshot(caminho))
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"Aviso: O snapshot de '{caminho}' não pôde ser lido e será ignorado. Erro: {e}")
+        return {}
+    return {chave: hash_conteudo(_serializar(valor)) for chave, valor in snapshot.items()}
+
+
+def _linhas_do_arb(caminho: str) -> List[Tuple[str, Optional[str], Optional[str]]]:
+    """(chave, valor, metadados) de um ARB na ordem do arquivo, com os valores em JSON.
+    Cada '@chave' vira os metadados da chave; entradas '@@' (ex: @@locale) são chaves comuns."""
+    linhas: Dict[str, List[Optional[str]]] = {}
+    for chave, valor in carregar_arb(caminho).items():
+        if chave.startswith('@') and not chave.startswith('@@'):
+            linhas.setdefault(chave[1:], [None, None])[1] = _serializar(valor)
+        else:
+            linhas.setdefault(chave, [None, None])[0] = _serializar(valor)
+    return [(chave, valor, metadados) for chave, (valor, metadados) in linhas.items()]
+
+
+class CatalogoTraducoes:
+    """Todas as traduções do projeto num único SQLite, indexado por (chave, idioma),
+    com os metadados '@chave', o hash do valor de origem que cada tradução traduziu e
+    a origem dela. Os .arb são importados e exportados sob demanda; só os idiomas que
+    mudaram desde a última exportação são reescritos."""
+
+    def __init__(self, caminho: str = ARQUIVO_CATALOGO_PADRAO):
+        self.caminho = caminho
+        self._conexao = sqlite3.connect(caminho)
+        self._conexao.execute('PRAGMA journal_mode=WAL')
+        self._conexao.execute('PRAGMA synchronous=NORMAL')
+        self._conexao.executescript(ESQUEMA)
+        self._conexao.commit()
+
+    @property
+    def idioma_fonte(self) -> Optional[str]:
+        linha = self._conexao.execute("SELECT valor FROM propriedades WHERE nome = 'idioma_fonte'").fetchone()
+        return linha[0] if linha else None
+
+    @idioma_fonte.setter
+    def idioma_fonte(self, idioma: str):
+        with self._conexao:
+            self._conexao.execute("INSERT OR REPLACE INTO propriedades (nome, valor) VALUES ('idioma_fonte', ?)", (idioma,))
+
+    def idiomas(self) -> List[str]:
+        return [linha[0] for linha in self._conexao.execute("SELECT idioma FROM idiomas ORDER BY idioma")]
+
+    def _hashes_da_fonte(self, chaves: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """Hash do valor atual de cada chave no idioma de origem."""
+        fonte = self.idioma_fonte
+        if fonte is None:
+            return {}
+        if chaves is None:
+            linhas = self._conexao.execute(
+                "SELECT chave, valor FROM entradas WHERE idioma = ? AND valor IS NOT NULL", (fonte,)).fetchall()
+        else:
+            linhas = []
+            chaves = list(chaves)
+            for inicio in range(0, len(chaves), TAMANHO_CONSULTA):
+                parte = chaves[inicio:inicio + TAMANHO_CONSULTA]
+                marcadores = ','.join('?' * len(parte))
+                linhas += self._conexao.execute(
+                    f"SELECT chave, valor FROM entradas WHERE idioma = ? AND valor IS NOT NULL AND chave IN ({marcadores})",
+                    [fonte, *parte]).fetchall()
+        return {chave: hash_conteudo(valor) for chave, valor in linhas}
+
+    def _registrar_idioma(self, idioma: str):
+        self._conexao.execute("INSERT OR IGNORE INTO idiomas (idioma) VALUES (?)", (idioma,))
+
+    def _nova_revisao(self, idioma: str):
+        self._conexao.execute("UPDATE idiomas SET revisao = revisao + 1 WHERE idioma = ?", (idioma,))
+
+    def importar_arb(self, caminho: str, idioma: Optional[str] = None, origem: Optional[str] = None,
+                     forcar: bool = False) -> Optional[int]:
+        """Substitui o idioma pelo conteúdo do .arb. Retorna quantas entradas mudaram,
+        ou None se o arquivo é o mesmo da última importação ou exportação (sem lê-lo
+        quando o tamanho e a data de modificação não mudaram).
+
+        Uma tradução importada só guarda o hash da fonte se o snapshot ao lado do arquivo
+        diz de qual valor de origem ela foi feita; sem isso, uma tradução nova ou alterada
+        fica pendente até ser revisada, em vez de parecer atualizada."""
+        idioma = idioma or idioma_do_arb(caminho)
+        if not idioma:
+            raise ValueError(f"não foi possível identificar o idioma de '{caminho}'")
+        caminho_absoluto = os.path.abspath(caminho)
+        registro = self._conexao.execute(
+            "SELECT arquivo, tamanho, mtime_ns, sha1 FROM idiomas WHERE idioma = ?", (idioma,)).fetchone()
+        mesmo_arquivo = registro is not None and registro[0] == caminho_absoluto
+        if mesmo_arquivo and not forcar and stat_inalterado(caminho, {'tamanho': registro[1], 'mtime_ns': registro[2]}):
+            return None
+
+        sha1 = self._sha1_do_arquivo(caminho)
+        if mesmo_arquivo and not forcar and sha1 == registro[3]:
+            self._gravar_estado_arquivo(idioma, caminho_absoluto, sha1)
+            self._conexao.commit()
+            return None
+
+        linhas = _linhas_do_arb(caminho)
+        fonte = self.idioma_fonte
+        hashes_fonte = {} if idioma == fonte else _hashes_do_snapshot(caminho)
+        origem = origem or f"arb:{os.path.basename(caminho)}"
+        agora = time.time()
+
+        with self._conexao:
+            self._registrar_idioma(idioma)
+            antes = self._conexao.total_changes
+            self._conexao.executemany(GRAVAR_ENTRADA, [
+                (chave, idioma, valor, metadados,
+                 hash_conteudo(valor) if idioma == fonte and valor is not None else hashes_fonte.get(chave),
+                 origem, ordem, agora)
+                for ordem, (chave, valor, metadados) in enumerate(linhas)
+            ])
+            presentes = {chave for chave, _, _ in linhas}
+            removidas = [(idioma, chave) for (chave,) in self._conexao.execute(
+                "SELECT chave FROM entradas WHERE idioma = ?", (idioma,)) if chave not in presentes]
+            self._conexao.executemany("DELETE FROM entradas WHERE idioma = ? AND chave = ?", removidas)
+            alteradas = self._conexao.total_changes - antes
+            if alteradas:
+                self._nova_revisao(idioma)
+            # O arquivo importado já reflete o idioma; exportar sem outras mudanças não o reescreve.
+            self._gravar_estado_arquivo(idioma, caminho_absoluto, sha1, exportado=True)
+        return alteradas
+
+    @staticmethod
+    def _sha1_do_arquivo(caminho: str) -> str:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            return hash_conteudo(f.read())
+
+    def _gravar_estado_arquivo(self, idioma: str, caminho_absoluto: str, sha1: str, exportado: bool = False):
+        info = os.stat(caminho_absoluto)
+        self._conexao.execute(
+            f"""UPDATE idiomas SET arquivo = ?, tamanho = ?, mtime_ns = ?, sha1 = ?
+                {', revisao_exportada = revisao' if exportado else ''} WHERE idioma = ?""",
+            (caminho_absoluto, info.st_size, info.st_mtime_ns, sha1, idioma))
+
+    def arb_do_idioma(self, idioma: str) -> Dict[str, Any]:
+        """Monta o .arb do idioma na ordem de importação, cada '@chave' logo após a chave."""
+        dados: Dict[str, Any] = {}
+        for chave, valor, metadados in self._conexao.execute(
+                "SELECT chave, valor, metadados FROM entradas WHERE idioma = ? ORDER BY ordem", (idioma,)):
+            if valor is not None:
+                dados[chave] = json.loads(valor)
+            if metadados is not None:
+                dados[f"@{chave}"] = json.loads(metadados)
+        return dados
+
+    def exportar(self, pasta: Optional[str] = None, idiomas: Optional[List[str]] = None,
+                 forcar: bool = False) -> List[str]:
+        """Grava o .arb de cada idioma alterado desde a última importação ou exportação.
+        Sem `pasta`, cada idioma volta para o último arquivo de onde foi importado ou
+        para onde foi exportado; um arquivo editado fora do catálogo só é sobrescrito
+        com `forcar`. Retorna os caminhos gravados."""
+        registros = self._conexao.execute(
+            "SELECT idioma, arquivo, tamanho, mtime_ns, sha1, revisao, revisao_exportada FROM idiomas ORDER BY idioma").fetchall()
+        donos = {arquivo: idioma for idioma, arquivo, *_ in registros if arquivo}
+        # Idiomas que nunca tiveram arquivo (ex: criados com definir) vão para a pasta do idioma de origem.
+        pasta_padrao = next((os.path.dirname(arquivo) for idioma, arquivo, *_ in registros
+                             if idioma == self.idioma_fonte and arquivo), '.')
+        gravados = []
+        for idioma, arquivo, tamanho, mtime_ns, sha1, revisao, revisao_exportada in registros:
+            if idiomas is not None and idioma not in idiomas:
+                continue
+            if pasta or not arquivo:
+                destino = os.path.abspath(os.path.join(pasta or pasta_padrao, nome_arquivo_idioma(idioma)))
+            else:
+                destino = arquivo
+            if donos.get(destino, idioma) != idioma:
+                print(f"Aviso: '{destino}' pertence ao idioma '{donos[destino]}'; '{idioma}' não foi exportado.")
+                continue
+            if not forcar and destino == arquivo and os.path.exists(destino):
+                if not stat_inalterado(destino, {'tamanho': tamanho, 'mtime_ns': mtime_ns}):
+                    # Editado fora do catálogo desde a última sincronização: exportar perderia as edições.
+                    if self._sha1_do_arquivo(destino) != sha1:
+                        print(f"Aviso: '{destino}' foi alterado fora do catálogo; importe-o antes ou use --forcar.")
+                        continue
+                    # Só a data de modificação mudou (ex: checkout ou touch): atualiza o stat guardado.
+                    with self._conexao:
+                        self._gravar_estado_arquivo(idioma, destino, sha1)
+                if revisao == revisao_exportada:
+                    continue
+            elif (not forcar and revisao == revisao_exportada and sha1 and os.path.exists(destino)
+                  and self._sha1_do_arquivo(destino) == sha1):
+                # Com --pasta: o destino já tem o conteúdo da última sincronização do idioma.
+                continue
+
+            conteudo = json.dumps(self.arb_do_idioma(idioma), ensure_ascii=False, indent=2)
+            gravar_atomicamente(destino, conteudo)
+            with self._conexao:
+                self._gravar_estado_arquivo(idioma, destino, hash_conteudo(conteudo), exportado=True)
+            gravados.append(destino)
+        return gravados
+
+    def definir(self, idioma: str, valores: Dict[str, str], origem: str = 'manual'):
+        """Atualização parcial: grava só estas chaves do idioma, sem ler nenhum .arb.
+        Chaves novas vão para o final do arquivo."""
+        if not valores:
+            return
+        fonte = self.idioma_fonte
+        hashes_fonte = {} if idioma == fonte else self._hashes_da_fonte(valores)
+        agora = time.time()
+        with self._conexao:
+            self._registrar_idioma(idioma)
+            existentes = {chave: (ordem, metadados) for chave, ordem, metadados in self._conexao.execute(
+                "SELECT chave, ordem, metadados FROM entradas WHERE idioma = ?", (idioma,))}
+            proxima = max((ordem for ordem, _ in existentes.values()), default=-1) + 1
+            linhas = []
+            for chave, valor in valores.items():
+                serializado = _serializar(valor)
+                if chave in existentes:
+                    ordem, metadados = existentes[chave]
+                else:
+                    (ordem, metadados), proxima = (proxima, None), proxima + 1
+                hash_fonte = hash_conteudo(serializado) if idioma == fonte else hashes_fonte.get(chave)
+                linhas.append((chave, idioma, serializado, metadados, hash_fonte, origem, ordem, agora))
+            antes = self._conexao.total_changes
+            self._conexao.executemany(GRAVAR_ENTRADA, linhas)
+            if self._conexao.total_changes != antes:
+                self._nova_revisao(idioma)
+
+    def remover(self, chaves: List[str], idiomas: Optional[List[str]] = None):
+        """Remove as chaves (e seus metadados) de todos os idiomas, ou só dos informados."""
+        with self._conexao:
+            idiomas = idiomas if idiomas is not None else self.idiomas()
+            for idioma in idiomas:
+                antes = self._conexao.total_changes
+                self._conexao.executemany("DELETE FROM entradas WHERE idioma = ? AND chave = ?",
+                                          [(idioma, chave) for chave in chaves])
+                if self._conexao.total_changes != antes:
+                    self._nova_revisao(idioma)
+
+    def valores_da_chave(self, chave: str) -> Dict[str, Any]:
+        """{idioma: valor} da chave em todos os idiomas, numa única consulta ao índice."""
+        return {
+            idioma: json.loads(valor)
+            for idioma, valor in self._conexao.execute(
+                "SELECT idioma, valor FROM entradas WHERE chave = ? AND valor IS NOT NULL ORDER BY idioma", (chave,))
+        }
+
+    def pendentes(self, idioma: str) -> List[Tuple[str, Any]]:
+        """(chave, valor de origem) das chaves sem tradução no idioma ou cuja tradução
+        foi feita a partir de um valor de origem que já mudou."""
+        fonte = self.idioma_fonte
+        if fonte is None:
+            raise ValueError("o catálogo ainda não tem um idioma de origem")
+        linhas = self._conexao.execute(
+            """
+            SELECT f.chave, f.valor, t.valor, t.hash_fonte FROM entradas f
+            LEFT JOIN entradas t ON t.chave = f.chave AND t.idioma = ?
+            WHERE f.idioma = ? AND f.valor IS NOT NULL AND f.chave NOT LIKE '@@%'
+            ORDER BY f.ordem
+            """,
+            (idioma, fonte),
+        )
+        return [
+            (chave, json.loads(valor))
+            for chave, valor, traducao, hash_fonte in linhas
+            if traducao is None or hash_fonte != hash_conteudo(valor)
+        ]
+
+    def fechar(self):
+        self._conexao.commit()
+        self._conexao.close()
+
+    def __enter__(self) -> 'CatalogoTraducoes':
+        return self
+
+    def __exit__(self, *_):
+        self.fechar()
+
+
+def _comando_importar(catalogo: CatalogoTraducoes, args: argparse.Namespace):
+    if args.fonte:
+        catalogo.idioma_fonte = args.fonte
+    caminhos = list(args.arbs)
+    if args.pasta:
+        caminhos.extend(sorted(glob.glob(os.path.join(args.pasta, '*.arb'))))
+    if not caminhos:
+        print("Erro: informe os arquivos .arb ou --pasta.")
+        return False
+
+    # O idioma de origem entra primeiro: os outros guardam o hash dos valores dele.
+    sucesso = True
+    idiomas = {}
+    for caminho in caminhos:
+        try:
+            idiomas[caminho] = args.idioma or idioma_do_arb(caminho)
+        except (OSError, ValueError) as e:
+            print(f"Aviso: Não foi possível ler '{caminho}'. Erro: {e}")
+            sucesso = False
+    ordenados = sorted(idiomas, key=lambda caminho: idiomas[caminho] != catalogo.idioma_fonte)
+
+    for caminho in ordenados:
+        try:
+            alteradas = catalogo.importar_arb(caminho, idiomas[caminho], forcar=args.forcar)
+        except (OSError, ValueError) as e:
+            print(f"Aviso: Não foi possível importar '{caminho}'. Erro: {e}")
+            sucesso = False
+            continue
+        if alteradas is None:
+            print(f"  -> '{caminho}' ({idiomas[caminho]}): inalterado desde a última sincronização")
+        else:
+            print(f"  -> '{caminho}' ({idiomas[caminho]}): {alteradas} entradas alteradas")
+    return sucesso
+
+
+def _comando_exportar(catalogo: CatalogoTraducoes, args: argparse.Namespace):
+    gravados = catalogo.exportar(args.pasta, args.idiomas, args.forcar)
+    for caminho in gravados:
+        print(f"  -> '{caminho}' gravado")
+    print(f"{len(gravados)} arquivos gravados; os idiomas sem alterações não foram reescritos.")
+    return True
+
+
+def _comando_mostrar(catalogo: CatalogoTraducoes, args: argparse.Namespace):
+    for chave in args.chaves:
+        print(f"{chave}:")
+        valores = catalogo.valores_da_chave(chave)
+        if not valores:
+            print("  (não encontrada)")
+        for idioma, valor in valores.items():
+            print(f"  {idioma:<8} {valor}")
+    return True
+
+
+def _comando_definir(catalogo: CatalogoTraducoes, args: argparse.Namespace):
+    if len(args.pares) % 2:
+        print("Erro: informe pares de chave e valor.")
+        return False
+    valores = dict(zip(args.pares[::2], args.pares[1::2]))
+    catalogo.definir(args.idioma, valores, args.origem)
+    print(f"{len(valores)} chaves gravadas em '{args.idioma}'.")
+    return True
+
+
+def _comando_pendentes(catalogo: CatalogoTraducoes, args: argparse.Namespace):
+    if catalogo.idioma_fonte is None:
+        print("Erro: o catálogo ainda não tem um idioma de origem. Importe o .arb de origem com --fonte.")
+        return False
+    for idioma in args.idiomas or [idioma for idioma in catalogo.idiomas() if idioma != catalogo.idioma_fonte]:
+        pendentes = catalogo.pendentes(idioma)
+        print(f"{idioma}: {len(pendentes)} chaves pendentes")
+        if args.detalhes:
+            for chave, valor in pendentes:
+                print(f"  {chave}: {valor}")
+    return True
+
+
+def main(argv: Optional[List[str]] = None, prog: Optional[str] = None):
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description="Catálogo com as traduções de todos os idiomas num único SQLite, indexado por (chave, idioma).\n"
+                    "Importa e exporta os .arb sob demanda; a exportação só reescreve os idiomas que mudaram.",
+        formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument('--catalogo', default=ARQUIVO_CATALOGO_PADRAO, help=f"Banco SQLite do catálogo. Padrão: {ARQUIVO_CATALOGO_PADRAO}")
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+
+    importar = subcomandos.add_parser('importar', help="Importa arquivos .arb; os que não mudaram desde a última sincronização não são lidos.")
+    importar.add_argument('arbs', nargs='*', help="Arquivos .arb. Ex: lib/l10n/app_pt.arb lib/l10n/app_en.arb")
+    importar.add_argument('--pasta', help="Importa todos os .arb desta pasta (além dos informados individualmente).")
+    importar.add_argument('--fonte', help="Idioma de origem do projeto; as traduções guardam o hash do valor de origem dele. Ex: pt")
+    importar.add_argument('--idioma', help="Força o idioma em vez de deduzi-lo do @@locale ou do nome do arquivo.")
+    importar.add_argument('--forcar', action='store_true', help="Lê os arquivos mesmo que não tenham mudado.")
+    importar.set_defaults(executar=_comando_importar)
+
+    exportar = subcomandos.add_parser('exportar', help="Grava os .arb dos idiomas alterados desde a última sincronização.")
+    exportar.add_argument('--pasta', help="Grava app_<idioma>.arb nesta pasta. Padrão: o último arquivo importado ou exportado de cada idioma")
+    exportar.add_argument('--idiomas', nargs='+', help="Exporta só estes idiomas.")
+    exportar.add_argument('--forcar', action='store_true', help="Reescreve também os idiomas sem alterações.")
+    exportar.set_defaults(executar=_comando_exportar)
+
+    mostrar = subcomandos.add_parser('mostrar', help="Mostra o valor das chaves em todos os idiomas.")
+    mostrar.add_argument('chaves', nargs='+')
+    mostrar.set_defaults(executar=_comando_mostrar)
+
+    definir = subcomandos.add_parser('definir', help="Grava valores de algumas chaves de um idioma, sem tocar nos .arb.")
+    definir.add_argument('--idioma', required=True)
+    definir.add_argument('--origem', default='manual', help="Origem registrada para os valores. Padrão: manual")
+    definir.add_argument('pares', nargs='+', metavar='CHAVE VALOR', help="Pares de chave e valor. Ex: key_70f8bb9a 'Início'")
+    definir.set_defaults(executar=_comando_definir)
+
+    pendentes = subcomandos.add_parser('pendentes', help="Conta as chaves sem tradução ou traduzidas de um valor de origem antigo.")
+    pendentes.add_argument('--idiomas', nargs='+', help="Padrão: todos os idiomas, menos o de origem")
+    pendentes.add_argument('--detalhes', action='store_true', help="Lista as chaves pendentes e o valor de origem.")
+    pendentes.set_defaults(executar=_comando_pendentes)
+
+    args = parser.parse_args(argv)
+    with CatalogoTraducoes(args.catalogo) as catalogo:
+        return args.executar(catalogo, args)
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,177 @@
+import re
+from typing import Iterator, List, NamedTuple, Tuple
+
+IDENTIFIER_START = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_')
+IDENTIFIER_CHARS = IDENTIFIER_START | frozenset('0123456789$')
+QUOTES = ('"', "'")
+
+# Saltos até o próximo caractere relevante, para não percorrer o texto caractere a caractere.
+CODE_SPECIAL = re.compile(r"""['"/rR{}]""")
+STRING_SPECIAL = re.compile(r"""['"\n\\$]""")
+RAW_STRING_SPECIAL = re.compile(r"""['"\n]""")
+
+
+class Segment(NamedTuple):
+    """Trecho do conteúdo de um literal: texto puro ou interpolação ($nome ou ${...})."""
+    interpolation: bool
+    start: int
+    end: int
+
+
+class DartLiteral(NamedTuple):
+    start: int            # Início do literal, incluindo o prefixo r de strings raw
+    end: int              # Posição logo após a aspa de fechamento
+    content_start: int
+    content_end: int
+    quote: str            # ', ", ''' ou """
+    raw: bool
+    segments: Tuple[Segment, ...]
+    depth: int            # 0 para literais no código, >0 dentro de interpolações
+
+    def content(self, source: str) -> str:
+        return source[self.content_start:self.content_end]
+
+
+def tokenize_literals(source: str) -> Iterator[DartLiteral]:
+    """Percorre o código Dart uma única vez e gera os literais de string.
+
+    Comentários são ignorados; aspas escapadas, strings raw, triplas,
+    multilinha e interpolações aninhadas são tratadas. Os literais são gerados
+    na ordem em que terminam, então um literal dentro de uma interpolação
+    aparece antes do literal que o contém."""
+    found: List[DartLiteral] = []
+    position = 0
+    length = len(source)
+    while position < length:
+        position = _scan_code(source, position, 0, found)
+        yield from found
+        found.clear()
+
+
+def _scan_code(source: str, position: int, depth: int, found: List[DartLiteral]) -> int:
+    """Avança pelo código até a chave que fecha a interpolação atual ou, no
+    nível do arquivo, até o fim do próximo literal. Retorna a posição logo
+    após onde parou."""
+    length = len(source)
+    braces = 0
+
+    while position < length:
+        match = CODE_SPECIAL.search(source, position)
+        if not match:
+            return length
+        position = match.start()
+        char = source[position]
+
+        if char == '/' and position + 1 < length:
+            following = source[position + 1]
+            if following == '/':
+                newline = source.find('\n', position)
+                position = length if newline == -1 else newline + 1
+                continue
+            if following == '*':
+                position = _skip_block_comment(source, position)
+                continue
+
+        if char in QUOTES:
+            position = _scan_string(source, position, position, False, depth, found)
+            if not depth:
+                return position
+            continue
+
+        if (char in 'rR' and position + 1 < length and source[position + 1] in QUOTES
+                and (position == 0 or source[position - 1] not in IDENTIFIER_CHARS)):
+            position = _scan_string(source, position, position + 1, True, depth, found)
+            if not depth:
+                return position
+            continue
+
+        if depth:
+            if char == '{':
+                braces += 1
+            elif char == '}':
+                if not braces:
+                    return position + 1
+                braces -= 1
+
+        position += 1
+
+    return position
+
+
+def _skip_block_comment(source: str, position: int) -> int:
+    # Comentários de bloco em Dart podem ser aninhados.
+    length = len(source)
+    level = 0
+    while position < length:
+        pair = source[position:position + 2]
+        if pair == '/*':
+            level += 1
+            position += 2
+        elif pair == '*/':
+            level -= 1
+            position += 2
+            if not level:
+                return position
+        else:
+            position += 1
+    return length
+
+
+def _scan_string(source: str, start: int, quote_position: int, raw: bool, depth: int, found: List[DartLiteral]) -> int:
+    length = len(source)
+    quote = source[quote_position]
+    if source[quote_position:quote_position + 3] == quote * 3:
+        quote = quote * 3
+    multiline = len(quote) == 3
+
+    content_start = quote_position + len(quote)
+    position = content_start
+    segments: List[Segment] = []
+    text_start = content_start
+
+    special = RAW_STRING_SPECIAL if raw else STRING_SPECIAL
+
+    while position < length:
+        match = special.search(source, position)
+        if not match:
+            return length
+        position = match.start()
+        char = source[position]
+
+        if char == quote[0] and source.startswith(quote, position):
+            if position > text_start:
+                segments.append(Segment(False, text_start, position))
+            found.append(DartLiteral(start, position + len(quote), content_start, position,
+                                     quote, raw, tuple(segments), depth))
+            return position + len(quote)
+
+        if char == '\n' and not multiline:
+            # String não terminada: descarta o literal e segue a partir da quebra de linha.
+            return position
+
+        if char == '\\':
+            position += 2
+            continue
+
+        if char == '$' and position + 1 < length:
+            following = source[position + 1]
+            if following == '{':
+                if position > text_start:
+                    segments.append(Segment(False, text_start, position))
+                end = _scan_code(source, position + 2, depth + 1, found)
+                segments.append(Segment(True, position, end))
+                position = text_start = end
+                continue
+            if following in IDENTIFIER_START:
+                if position > text_start:
+                    segments.append(Segment(False, text_start, position))
+                end = position + 2
+                while end < length and source[end] in IDENTIFIER_CHARS and source[end] != '$':
+                    end += 1
+                segments.append(Segment(True, position, end))
+                position = text_start = end
+                continue
+
+        position += 1
+
+    return length
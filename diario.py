@@ -0,0 +1,90 @@
+import json
+import os
+from typing import Dict, Tuple
+
+# Quando o diário acumula tantas linhas substituídas por outras da mesma chave, ele é
+# compactado num arquivo novo e trocado por rename atômico.
+INTERVALO_COMPACTACAO = 500
+
+
+def caminho_diario(caminho_saida: str) -> str:
+    diretorio, nome = os.path.split(caminho_saida)
+    return os.path.join(diretorio, f".{nome}.diario.jsonl")
+
+
+class DiarioTraducao:
+    """Diário append-only das traduções já obtidas para um arquivo de saída.
+
+    Cada tradução vira uma linha JSON gravada assim que chega, então uma
+    execução interrompida pode ser retomada sem repetir as chamadas já feitas.
+    Uma linha truncada por uma queda no meio da escrita é ignorada na leitura."""
+
+    def __init__(self, caminho_saida: str, retomar: bool = False, intervalo_compactacao: int = INTERVALO_COMPACTACAO):
+        self.caminho = caminho_diario(caminho_saida)
+        self.intervalo_compactacao = intervalo_compactacao
+        self.entradas: Dict[str, Tuple[str, str]] = self._ler() if retomar else {}
+        self._linhas_no_arquivo = 0
+
+        diretorio = os.path.dirname(self.caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        self._compactar()
+
+    def _ler(self) -> Dict[str, Tuple[str, str]]:
+        entradas: Dict[str, Tuple[str, str]] = {}
+        try:
+            with open(self.caminho, 'r', encoding='utf-8') as f:
+                for linha in f:
+                    try:
+                        chave, fonte, traducao = json.loads(linha)
+                    except (json.JSONDecodeError, ValueError):
+                        continue
+                    entradas[chave] = (fonte, traducao)
+        except FileNotFoundError:
+            pass
+        return entradas
+
+    def _compactar(self):
+        caminho_temporario = f"{self.caminho}.tmp"
+        with open(caminho_temporario, 'w', encoding='utf-8') as f:
+            for chave, (fonte, traducao) in self.entradas.items():
+                f.write(json.dumps([chave, fonte, traducao], ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(caminho_temporario, self.caminho)
+
+        self._arquivo = open(self.caminho, 'a', encoding='utf-8')
+        self._linhas_no_arquivo = len(self.entradas)
+
+    def traducoes_validas(self, dados_fonte: Dict[str, str]) -> Dict[str, str]:
+        """Traduções do diário cujo valor de origem ainda é o atual."""
+        return {
+            chave: traducao
+            for chave, (fonte, traducao) in self.entradas.items()
+            if dados_fonte.get(chave) == fonte
+        }
+
+    def registrar(self, chave: str, fonte: str, traducao: str):
+        self.entradas[chave] = (fonte, traducao)
+        self._arquivo.write(json.dumps([chave, fonte, traducao], ensure_ascii=False) + '\n')
+        self._arquivo.flush()
+
+        # Só compacta quando há linhas obsoletas: reescrever um diário sem repetições a
+        # cada poucas entradas tornaria a gravação quadrática no número de chaves.
+        self._linhas_no_arquivo += 1
+        if self._linhas_no_arquivo - len(self.entradas) >= self.intervalo_compactacao:
+            self._arquivo.close()
+            self._compactar()
+
+    def fechar(self):
+        self._arquivo.close()
+        self._compactar()
+        self._arquivo.close()
+
+    def remover(self):
+        """Descarta o diário depois que o arquivo de saída foi gravado por completo."""
+        self._arquivo.close()
+        try:
+            os.remove(self.caminho)
+        except FileNotFoundError:
+            pass
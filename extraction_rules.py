@@ -0,0 +1,377 @@
+import json
+import os
+import re
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Pattern, Set, Tuple
+
+DEFAULT_RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'extraction_rules.json')
+DEFAULT_CONTEXT_CHARS = 30
+
+# Condições aceitas em cada regra de literal. Todas as condições de uma regra
+# precisam valer para que ela rejeite o literal; as listas valem se qualquer
+# um dos itens estiver presente.
+POSITIVE_CONDITIONS = {
+    'text_contains', 'text_contains_lower', 'text_regex', 'text_startswith',
+    'context_contains', 'context_regex',
+    'text_single_case', 'text_has_no_lowercase', 'text_min_length',
+}
+NEGATIVE_CONDITIONS = {'unless_text_contains', 'unless_text_regex', 'unless_context_contains'}
+# Condições que, sozinhas numa regra, podem ser fundidas numa única regex por alvo.
+FUSIBLE_CONDITIONS = {
+    'text_contains': 'text', 'text_regex': 'text',
+    'text_contains_lower': 'lower',
+    'context_contains': 'context', 'context_regex': 'context',
+}
+
+
+class Check(NamedTuple):
+    """Uma condição compilada de uma regra composta. `cost` ordena a avaliação:
+    0 para predicados simples, 1 para uma palavra, 2 para regex."""
+    target: str
+    negate: bool
+    test: Callable[[str], bool]
+    cost: int
+
+
+class CompositeRule(NamedTuple):
+    name: str
+    checks: Tuple[Check, ...]
+
+
+def keywords_pattern(keywords: List[str]) -> str:
+    """Regex que encontra qualquer uma das palavras, fatorada como uma trie
+    (prefixos comuns viram um único ramo), o que o motor de regex percorre bem
+    mais rápido do que uma alternação simples com uma opção por palavra."""
+    trie: Dict[str, Any] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # Uma palavra que termina aqui torna o resto opcional; o ramo guloso prefere a mais longa.
+        return f"(?:{body})?" if '' in node else body
+
+    return build(trie)
+
+
+def keywords_first_chars(keywords: List[str]) -> Optional[Set[str]]:
+    """Caracteres com que a trie das palavras pode começar; None se alguma palavra é vazia."""
+    if not keywords or not all(keywords):
+        return None
+    return {keyword[0] for keyword in keywords}
+
+
+def with_first_char_filter(pattern: str, chars: Optional[Set[str]]) -> str:
+    """Antepõe à regex um lookahead com os caracteres iniciais possíveis. Numa
+    alternação de grupos, o motor de regex deixa de testar cada opção em toda
+    posição do texto e pula direto as posições que não podem iniciar um match.
+    Usado só nas tries de palavras, em que esses caracteres são conhecidos
+    exatamente; as regex das regras são compiladas como estão."""
+    if not chars:
+        return pattern
+    return f"(?=[{''.join(re.escape(char) for char in sorted(chars))}])(?:{pattern})"
+
+
+def _check_value(rule_name: str, condition: str, value: Any):
+    if condition.endswith('_regex'):
+        if not isinstance(value, str):
+            raise ValueError(f"regra '{rule_name}': '{condition}' deve ser uma regex")
+    elif not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ValueError(f"regra '{rule_name}': '{condition}' deve ser uma lista de textos")
+
+
+def _condition_pattern(condition: str, value: Any) -> str:
+    if condition.endswith('_regex'):
+        re.compile(value)
+        return value
+    return keywords_pattern(value)
+
+
+def _compile_check(rule_name: str, condition: str, value: Any) -> Check:
+    negate = condition.startswith('unless_')
+    kind = condition[len('unless_'):] if negate else condition
+
+    if kind == 'text_single_case':
+        return Check('text', not value, lambda text: text.isupper() or text.islower(), 0)
+    if kind == 'text_has_no_lowercase':
+        return Check('text', not value, lambda text: not any(letter.islower() for letter in text), 0)
+    if kind == 'text_min_length':
+        minimum = int(value)
+        return Check('text', False, lambda text: len(text) >= minimum, 0)
+    if kind == 'text_startswith':
+        _check_value(rule_name, condition, value)
+        prefixes = tuple(value)
+        return Check('text', False, lambda text: text.startswith(prefixes), 0)
+
+    _check_value(rule_name, condition, value)
+    target = FUSIBLE_CONDITIONS.get(kind, 'text')
+    if kind.endswith('_contains') or kind.endswith('_contains_lower'):
+        keywords = list(value)
+        if len(keywords) == 1:
+            keyword = keywords[0]
+            return Check(target, negate, lambda text: keyword in text, 1)
+    first_chars = None if kind.endswith('_regex') else keywords_first_chars(value)
+    search = re.compile(with_first_char_filter(_condition_pattern(kind, value), first_chars)).search
+    return Check(target, negate, lambda text: search(text) is not None, 2)
+
+
+class RuleSet:
+    """Filtros do extrator compilados a partir do arquivo de regras.
+
+    As regras com uma única condição de texto ou contexto (listas de palavras
+    ou regex) são fundidas numa regex por alvo, então cada literal passa uma vez
+    pelo texto, uma pelo texto em minúsculas e uma pelo contexto. As regras
+    compostas (com exceções ou várias condições) são avaliadas em seguida,
+    com as condições mais baratas primeiro e parada na primeira que falhar."""
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+        self.context_chars = int(data.get('context_chars', DEFAULT_CONTEXT_CHARS))
+
+        files = data.get('files', {})
+        self.ignore_suffixes = tuple(files.get('ignore_suffixes', []))
+        self.ignore_names_containing = list(files.get('ignore_names_containing', []))
+        self.ignore_paths_containing = list(files.get('ignore_paths_containing', []))
+        self.restricted_dirs = [(entry['path_contains'], list(entry.get('allow', []))) for entry in files.get('restricted_dirs', [])]
+
+        self.rule_names: List[str] = []
+        self.fused: Dict[str, Optional[Pattern]] = {}
+        self.keywords: Dict[str, Optional[Pattern]] = {}
+        self.keyword_rules: Dict[str, Dict[str, str]] = {}
+        self.composite: List[CompositeRule] = []
+        self._individual: Optional[List[CompositeRule]] = None
+        self._compile(data.get('literals', []))
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_RULES_FILE) -> 'RuleSet':
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"o arquivo de regras '{path}' não é um JSON válido: {e}")
+        return cls(data)
+
+    def _compile(self, rules: List[Dict[str, Any]]):
+        alternatives: Dict[str, List[str]] = {'text': [], 'lower': [], 'context': []}
+        keyword_rules: Dict[str, Dict[str, str]] = {'text': {}, 'lower': {}, 'context': {}}
+
+        for index, rule in enumerate(rules):
+            name = rule.get('name') or f"regra_{index}"
+            conditions = {key: value for key, value in rule.items() if key not in ('name', 'comment')}
+            unknown = set(conditions) - POSITIVE_CONDITIONS - NEGATIVE_CONDITIONS
+            if unknown:
+                raise ValueError(f"regra '{name}': condições desconhecidas {sorted(unknown)}")
+            if not any(key in POSITIVE_CONDITIONS for key in conditions):
+                raise ValueError(f"regra '{name}': é preciso ao menos uma condição que não seja 'unless_'")
+            self.rule_names.append(name)
+
+            try:
+                if len(conditions) == 1 and next(iter(conditions)) in FUSIBLE_CONDITIONS:
+                    condition, value = next(iter(conditions.items()))
+                    _check_value(name, condition, value)
+                    target = FUSIBLE_CONDITIONS[condition]
+                    if condition.endswith('_regex'):
+                        alternatives[target].append(f"(?P<r{index}>{_condition_pattern(condition, value)})")
+                    else:
+                        # Palavras de todas as regras simples de um alvo vão para uma só trie;
+                        # a palavra encontrada indica a regra (a primeira que a declarou).
+                        for keyword in value:
+                            keyword_rules[target].setdefault(keyword, name)
+                    continue
+
+                checks = [_compile_check(name, condition, value) for condition, value in conditions.items()]
+            except re.error as e:
+                raise ValueError(f"regra '{name}': regex inválida: {e}")
+            checks.sort(key=lambda check: check.cost)
+            self.composite.append(CompositeRule(name, tuple(checks)))
+
+        for target, parts in alternatives.items():
+            self.fused[target] = re.compile('|'.join(parts)) if parts else None
+            keywords = list(keyword_rules[target])
+            self.keywords[target] = re.compile(with_first_char_filter(keywords_pattern(keywords), keywords_first_chars(keywords))) if keywords else None
+        self.keyword_rules = keyword_rules
+
+    def _simple_rule(self, target: str, subject: str) -> Optional[str]:
+        pattern = self.keywords[target]
+        if pattern is not None:
+            match = pattern.search(subject)
+            if match:
+                return self.keyword_rules[target][match.group()]
+        pattern = self.fused[target]
+        if pattern is not None:
+            match = pattern.search(subject)
+            if match:
+                return self.rule_names[int(match.lastgroup[1:])]
+        return None
+
+    def skip_file(self, path: str) -> bool:
+        """Indica se o arquivo inteiro fica fora da extração."""
+        path = path.replace(os.sep, '/')
+        name = os.path.basename(path)
+
+        if path.endswith(self.ignore_suffixes):
+            return True
+        if any(fragment in name for fragment in self.ignore_names_containing):
+            return True
+        if any(fragment in path for fragment in self.ignore_paths_containing):
+            return True
+        for directory, allowed in self.restricted_dirs:
+            if directory in path and not any(fragment in path for fragment in allowed):
+                return True
+        return False
+
+    def _individual_rules(self) -> List[CompositeRule]:
+        # Usadas só no modo de perfil: cada regra compilada sozinha, sem fusão.
+        if self._individual is None:
+            self._individual = []
+            for name, rule in zip(self.rule_names, self.data.get('literals', [])):
+                checks = [_compile_check(name, condition, value)
+                          for condition, value in rule.items() if condition not in ('name', 'comment')]
+                checks.sort(key=lambda check: check.cost)
+                self._individual.append(CompositeRule(name, tuple(checks)))
+        return self._individual
+
+    def rejecting_rule_profiled(self, text: str, context: str, profile: 'RuleProfile') -> Optional[str]:
+        """Mesmo resultado de rejecting_rule, mas avalia as regras uma a uma, na
+        ordem do arquivo, registrando no perfil as avaliações, rejeições e o tempo
+        de cada uma. A regra apontada é a primeira do arquivo que rejeita o literal."""
+        lower = None
+        for rule in self._individual_rules():
+            started = time.perf_counter()
+            rejected = True
+            for check in rule.checks:
+                if check.target == 'context':
+                    subject = context
+                elif check.target == 'lower':
+                    if lower is None:
+                        lower = text.lower()
+                    subject = lower
+                else:
+                    subject = text
+                if check.test(subject) == check.negate:
+                    rejected = False
+                    break
+            profile.record_rule(rule.name, time.perf_counter() - started, rejected)
+            if rejected:
+                return rule.name
+        return None
+
+    def rejecting_rule(self, text: str, context: str) -> Optional[str]:
+        """Nome da regra que rejeita o literal, ou None se ele deve ser extraído."""
+        rule = self._simple_rule('text', text) or self._simple_rule('context', context)
+        if rule:
+            return rule
+
+        lower = None
+        if self.fused['lower'] is not None or self.keywords['lower'] is not None:
+            lower = text.lower()
+            rule = self._simple_rule('lower', lower)
+            if rule:
+                return rule
+
+        for composite in self.composite:
+            for check in composite.checks:
+                if check.target == 'context':
+                    subject = context
+                elif check.target == 'lower':
+                    if lower is None:
+                        lower = text.lower()
+                    subject = lower
+                else:
+                    subject = text
+                if check.test(subject) == check.negate:
+                    break
+            else:
+                return composite.name
+        return None
+
+
+class RuleProfile:
+    """Contadores do modo de perfil do extrator: por regra (avaliações,
+    rejeições e tempo acumulado) e por arquivo (tempo de análise e literais).
+    Perfis dos processos do pool são somados com merge."""
+
+    def __init__(self):
+        self.rules: Dict[str, List[Any]] = {}
+        self.files: List[Dict[str, Any]] = []
+        self.skipped_files = 0
+
+    def record_rule(self, name: str, seconds: float, rejected: bool):
+        counters = self.rules.get(name)
+        if counters is None:
+            counters = self.rules[name] = [0, 0, 0.0]
+        counters[0] += 1
+        counters[1] += rejected
+        counters[2] += seconds
+
+    def record_file(self, path: str, seconds: float, literals: int, extracted: int):
+        self.files.append({'path': path, 'seconds': seconds, 'literals': literals, 'extracted': extracted})
+
+    def merge(self, other: 'RuleProfile'):
+        for name, (evaluations, rejections, seconds) in other.rules.items():
+            counters = self.rules.setdefault(name, [0, 0, 0.0])
+            counters[0] += evaluations
+            counters[1] += rejections
+            counters[2] += seconds
+        self.files.extend(other.files)
+        self.skipped_files += other.skipped_files
+
+    def rule_rows(self) -> List[Dict[str, Any]]:
+        """Regras da mais cara para a mais barata."""
+        rows = [
+            {'rule': name, 'evaluations': evaluations, 'rejections': rejections, 'seconds': seconds}
+            for name, (evaluations, rejections, seconds) in self.rules.items()
+        ]
+        rows.sort(key=lambda row: (-row['seconds'], row['rule']))
+        return rows
+
+    def to_dict(self) -> Dict[str, Any]:
+        files = sorted(self.files, key=lambda entry: (-entry['seconds'], entry['path']))
+        return {
+            'rules': self.rule_rows(),
+            'files': files,
+            'totals': {
+                'files': len(self.files),
+                'skipped_files': self.skipped_files,
+                'literals': sum(entry['literals'] for entry in self.files),
+                'extracted': sum(entry['extracted'] for entry in self.files),
+                'scan_seconds': sum(entry['seconds'] for entry in self.files),
+                'rule_seconds': sum(counters[2] for counters in self.rules.values()),
+            },
+        }
+
+    def save_json(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    def table(self, top_files: int = 10) -> str:
+        report = self.to_dict()
+        totals = report['totals']
+        width = max([len('regra')] + [len(row['rule']) for row in report['rules']])
+        lines = [
+            f"{'regra':<{width}}  {'avaliações':>10}  {'rejeições':>10}  {'% rejeita':>9}  {'tempo (ms)':>10}  {'µs/aval.':>8}",
+        ]
+        for row in report['rules']:
+            evaluations = row['evaluations']
+            rate = 100 * row['rejections'] / evaluations if evaluations else 0.0
+            per_evaluation = 1e6 * row['seconds'] / evaluations if evaluations else 0.0
+            lines.append(
+                f"{row['rule']:<{width}}  {evaluations:>10}  {row['rejections']:>10}  {rate:>8.1f}%  "
+                f"{1000 * row['seconds']:>10.2f}  {per_evaluation:>8.2f}"
+            )
+        lines.append(
+            f"Arquivos analisados: {totals['files']} (ignorados pelas regras de arquivo: {totals['skipped_files']}), "
+            f"literais: {totals['literals']}, extraídos: {totals['extracted']}, "
+            f"tempo de análise: {1000 * totals['scan_seconds']:.1f} ms, nas regras: {1000 * totals['rule_seconds']:.1f} ms"
+        )
+        if report['files'] and top_files:
+            lines.append("Arquivos mais lentos:")
+            for entry in report['files'][:top_files]:
+                lines.append(f"  {1000 * entry['seconds']:8.2f} ms  {entry['literals']:>6} literais  {entry['extracted']:>6} extraídos  {entry['path']}")
+        return '\n'.join(lines)
@@ -0,0 +1,133 @@
+import os
+import re
+import json
+import glob
+import argparse
+from typing import Any, Dict, List, Optional
+
+from memoria_traducao import ARQUIVO_MEMORIA_PADRAO, MemoriaTraducao
+
+# app_pt.arb -> pt, app_zh_CN.arb -> zh-CN, v1-en.arb -> en, my_app_de.arb -> de
+IDIOMA_NO_NOME = re.compile(r'^(?:.*[_-])?([a-z]{2,3}(?:[_-][A-Z][a-z]{3}|[_-][A-Z]{2})?)$')
+
+
+def carregar_arb(caminho: str) -> Dict[str, Any]:
+    """Lê o ARB inteiro com um único json.load. Levanta OSError, ou ValueError
+    (json.JSONDecodeError inclusive) se o arquivo não é um objeto JSON válido."""
+    with open(caminho, 'r', encoding='utf-8') as f:
+        dados = json.load(f)
+    if not isinstance(dados, dict):
+        raise ValueError(f"'{caminho}' não é um objeto .arb")
+    return dados
+
+
+def idioma_do_arb(caminho: str, dados: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """Usa o @@locale do arquivo, se houver, ou o sufixo do nome (app_<idioma>.arb).
+    Com `dados`, o conteúdo já carregado do arquivo, ele não é lido de novo."""
+    if dados is None:
+        dados = carregar_arb(caminho)
+    locale = dados.get('@@locale')
+    if isinstance(locale, str):
+        return locale.replace('_', '-')
+
+    nome = os.path.splitext(os.path.basename(caminho))[0]
+    encontrado = IDIOMA_NO_NOME.match(nome)
+    return encontrado.group(1).replace('_', '-') if encontrado else None
+
+
+def importar_pares_arb(memoria: MemoriaTraducao, caminho_fonte: str, idioma_fonte: str, caminhos_alvo: List[str], idioma_alvo: Optional[str] = None) -> Dict[str, int]:
+    """Une cada ARB de destino ao ARB de origem pela chave e grava os pares
+    (valor de origem, valor traduzido) na memória. Retorna pares importados por idioma."""
+    try:
+        fonte = {
+            chave: valor
+            for chave, valor in carregar_arb(caminho_fonte).items()
+            if not chave.startswith('@') and isinstance(valor, str) and valor.strip()
+        }
+    except (OSError, ValueError) as e:
+        print(f"Erro: Não foi possível ler o .arb de origem '{caminho_fonte}'. Erro: {e}")
+        return {}
+    importados: Dict[str, int] = {}
+
+    for caminho in caminhos_alvo:
+        if os.path.abspath(caminho) == os.path.abspath(caminho_fonte):
+            continue
+
+        try:
+            dados = carregar_arb(caminho)
+            idioma = idioma_alvo or idioma_do_arb(caminho, dados)
+            if not idioma:
+                print(f"Aviso: Não foi possível identificar o idioma de '{caminho}'. Use --idioma-alvo.")
+                continue
+            if idioma == idioma_fonte:
+                continue
+
+            pares = [
+                (fonte[chave], valor)
+                for chave, valor in dados.items()
+                if chave in fonte and isinstance(valor, str) and valor.strip()
+            ]
+        except (OSError, ValueError) as e:
+            print(f"Aviso: Não foi possível ler '{caminho}'. Erro: {e}")
+            continue
+
+        memoria.gravar_varios(idioma_fonte, idioma, pares)
+        importados[idioma] = importados.get(idioma, 0) + len(pares)
+        print(f"  -> '{caminho}' ({idioma}): {len(pares)} pares")
+
+    return importados
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Alimenta a memória de tradução com pares de arquivos .arb já traduzidos.",
+        formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument(
+        '--fonte-arb',
+        required=True,
+        help="Arquivo .arb de origem, usado para unir as traduções pela chave. Ex: lib/l10n/app_pt.arb"
+    )
+    parser.add_argument(
+        '--fonte',
+        required=True,
+        help="Código do idioma de origem, o mesmo passado para main2.py em --fonte. Ex: pt"
+    )
+    parser.add_argument(
+        'arbs',
+        nargs='*',
+        help="Arquivos .arb traduzidos. Ex: lib/l10n/app_de.arb lib/l10n/app_zh.arb"
+    )
+    parser.add_argument(
+        '--pasta',
+        help="Importa todos os .arb desta pasta (além dos informados individualmente)."
+    )
+    parser.add_argument(
+        '--idioma-alvo',
+        help="Força o idioma de destino em vez de deduzi-lo do @@locale ou do nome do arquivo."
+    )
+    parser.add_argument(
+        '--memoria',
+        default=ARQUIVO_MEMORIA_PADRAO,
+        help=f"Banco SQLite da memória de tradução. Padrão: {ARQUIVO_MEMORIA_PADRAO}"
+    )
+
+    args = parser.parse_args()
+
+    caminhos = list(args.arbs)
+    if args.pasta:
+        caminhos.extend(sorted(glob.glob(os.path.join(args.pasta, '*.arb'))))
+    if not caminhos:
+        parser.error("informe os arquivos .arb traduzidos ou --pasta.")
+
+    with MemoriaTraducao(args.memoria) as memoria:
+        importados = importar_pares_arb(memoria, args.fonte_arb, args.fonte, caminhos, args.idioma_alvo)
+        total = memoria.tamanho()
+
+    print("\n--- Resumo ---")
+    print(f"Idiomas importados: {len(importados)}")
+    print(f"Pares importados: {sum(importados.values())}")
+    print(f"Entradas na memória: {total}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import random
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+from metricas import MetricasTraducao
+
+
+class LimitadorTaxa:
+    """Token bucket thread-safe com ajuste AIMD: cada sucesso aumenta a taxa
+    aos poucos e cada limitação do servidor corta a taxa pela metade.
+    Com `taxa` None o limitador não restringe nada (backends offline)."""
+
+    def __init__(self, taxa: Optional[float] = 5.0, taxa_minima: float = 0.2, taxa_maxima: float = 50.0,
+                 incremento: float = 0.1, fator_reducao: float = 0.5, intervalo_reducao: float = 1.0):
+        self.taxa = taxa
+        self.taxa_minima = taxa_minima
+        self.taxa_maxima = taxa_maxima
+        self.incremento = incremento
+        self.fator_reducao = fator_reducao
+        self.intervalo_reducao = intervalo_reducao
+        self.limitacoes = 0
+
+        self._tokens = 1.0
+        self._ultima_recarga = time.monotonic()
+        self._ultima_reducao = float('-inf')
+        self._trava = threading.Lock()
+
+    def _recarregar(self):
+        agora = time.monotonic()
+        capacidade = max(1.0, self.taxa)
+        self._tokens = min(capacidade, self._tokens + (agora - self._ultima_recarga) * self.taxa)
+        self._ultima_recarga = agora
+
+    def adquirir(self):
+        """Bloqueia até haver um token disponível."""
+        if self.taxa is None:
+            return
+        while True:
+            with self._trava:
+                self._recarregar()
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                espera = (1.0 - self._tokens) / self.taxa
+            time.sleep(espera)
+
+    def registrar_sucesso(self):
+        if self.taxa is None:
+            return
+        with self._trava:
+            self.taxa = min(self.taxa_maxima, self.taxa + self.incremento)
+
+    def registrar_limitacao(self):
+        with self._trava:
+            self.limitacoes += 1
+            if self.taxa is None:
+                return
+            # Várias requisições em voo recebem a mesma limitação; reduz uma vez só por intervalo.
+            agora = time.monotonic()
+            if agora - self._ultima_reducao < self.intervalo_reducao:
+                return
+            self._ultima_reducao = agora
+            self.taxa = max(self.taxa_minima, self.taxa * self.fator_reducao)
+            # Descarta o que estava acumulado para que a redução tenha efeito imediato.
+            self._tokens = min(self._tokens, 0.0)
+
+
+# Erros do deep_translator que não mudam com uma nova tentativa.
+ERROS_DEFINITIVOS = {
+    'NotValidPayload', 'NotValidLength', 'LanguageNotSupportedException',
+    'InvalidSourceOrTargetLanguage', 'TranslationNotFound', 'ErroSeparacaoLote',
+}
+
+
+def eh_definitivo(erro: Exception) -> bool:
+    return type(erro).__name__ in ERROS_DEFINITIVOS
+
+
+def espera_exponencial(tentativa: int, base: float = 1.0, maxima: float = 30.0) -> float:
+    """Backoff exponencial com jitter: em média base * 2^tentativa, limitado a `maxima`."""
+    return min(maxima, base * (2 ** tentativa)) * random.uniform(0.5, 1.5)
+
+
+def eh_limitacao(erro: Exception) -> bool:
+    """Reconhece respostas de limitação de taxa (HTTP 429 e equivalentes)."""
+    if type(erro).__name__ == 'TooManyRequests':
+        return True
+    mensagem = str(erro).lower()
+    return '429' in mensagem or 'too many requests' in mensagem
+
+
+class TradutorLimitado:
+    """Envolve um tradutor com o limitador de taxa. Cada thread usa sua própria
+    instância, criada pela fábrica, pois os tradutores guardam estado por requisição."""
+
+    def __init__(self, fabrica: Callable[[], Any], limitador: LimitadorTaxa, tentativas: int = 5,
+                 espera_base: float = 1.0, espera_maxima: float = 30.0, metricas: Optional[MetricasTraducao] = None):
+        self.fabrica = fabrica
+        self.limitador = limitador
+        self.tentativas = tentativas
+        self.espera_base = espera_base
+        self.espera_maxima = espera_maxima
+        self.novas_tentativas = 0
+        self.metricas = metricas
+        self._local = threading.local()
+
+    def _tradutor(self) -> Any:
+        tradutor = getattr(self._local, 'tradutor', None)
+        if tradutor is None:
+            tradutor = self._local.tradutor = self.fabrica()
+        return tradutor
+
+    def translate(self, texto: str) -> str:
+        return self._chamar(lambda tradutor: tradutor.translate(texto), 1, len(texto))
+
+    def translate_batch(self, textos: List[str]) -> List[str]:
+        return self._chamar(lambda tradutor: tradutor.translate_batch(textos), len(textos), sum(map(len, textos)))
+
+    def _chamar(self, chamada: Callable[[Any], Any], itens: int = 1, caracteres: int = 0) -> Any:
+        metricas = self.metricas
+        for tentativa in range(self.tentativas):
+            if metricas:
+                inicio_espera = time.perf_counter()
+                self.limitador.adquirir()
+                inicio = time.perf_counter()
+                metricas.registrar_espera_limitador(inicio - inicio_espera)
+            else:
+                self.limitador.adquirir()
+            try:
+                traduzido = chamada(self._tradutor())
+            except Exception as e:
+                if metricas:
+                    metricas.registrar_requisicao(time.perf_counter() - inicio, itens, caracteres, erro=True)
+                if eh_definitivo(e) or tentativa == self.tentativas - 1:
+                    raise
+                limitacao = eh_limitacao(e)
+                if limitacao:
+                    self.limitador.registrar_limitacao()
+                # Falhas transitórias (rede, limitação, 5xx) são repetidas com
+                # espera crescente em vez de devolver o texto original.
+                self.novas_tentativas += 1
+                espera = espera_exponencial(tentativa, self.espera_base, self.espera_maxima)
+                if metricas:
+                    metricas.registrar_nova_tentativa(espera, limitacao)
+                time.sleep(espera)
+                continue
+            if metricas:
+                metricas.registrar_requisicao(time.perf_counter() - inicio, itens, caracteres)
+            self.limitador.registrar_sucesso()
+            return traduzido
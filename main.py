@@ -1,88 +1,204 @@
 import os
-import json
+import sys
 import argparse
-from typing import Dict, List
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from aho_corasick import AhoCorasick
+from arquivo_arb import entradas_de_texto, ler_arb
+from dart_lexer import tokenize_literals
+from manifesto import (ARQUIVO_MANIFESTO_PADRAO, carregar_manifesto, criar_entrada,
+                       hash_conteudo, hash_objeto, salvar_manifesto, stat_inalterado)
+from varredura import percorrer_arquivos
 
 def criar_mapa_de_substituicao(caminho_arquivo_arb: str) -> Dict[str, str]:
-    try:
-        with open(caminho_arquivo_arb, 'r', encoding='utf-8') as f:
-            dados_arb = json.load(f)
-    except FileNotFoundError:
-        print(f"Erro: Arquivo .arb não encontrado em '{caminho_arquivo_arb}'")
-        return {}
-    except json.JSONDecodeError:
-        print(f"Erro: O arquivo '{caminho_arquivo_arb}' não é um JSON válido.")
+    dados_arb = ler_arb(caminho_arquivo_arb)
+    if dados_arb is None:
         return {}
+    return mapa_de_substituicao(dados_arb)
 
-    mapa_invertido = {
-        valor: chave
-        for chave, valor in dados_arb.items()
-        if not chave.startswith('@') and isinstance(valor, str)
-    }
+def mapa_de_substituicao(dados_arb: Dict[str, Any]) -> Dict[str, str]:
+    """Valor -> chave, com os valores mais longos primeiro."""
+    mapa_invertido = {valor: chave for chave, valor in entradas_de_texto(dados_arb)}
     mapa_ordenado = dict(sorted(mapa_invertido.items(), key=lambda item: len(item[0]), reverse=True))
 
     return mapa_ordenado
 
-def processar_arquivos_na_pasta(pasta_alvo: str, mapa_substituicao: Dict[str, str], extensoes_permitidas: List[str], caminhos_excluidos: List[str]):
+def criar_automato_de_substituicao(mapa_substituicao: Dict[str, str]) -> AhoCorasick:
+    return AhoCorasick(f"'{valor_string}'" for valor_string in mapa_substituicao)
+
+def _emendar(conteudo: str, trechos: Iterable[Tuple[int, int, str]]) -> Tuple[str, int]:
+    partes = []
+    ultimo_fim = 0
+    substituicoes = 0
+
+    for inicio, fim, chave_arb in trechos:
+        partes.append(conteudo[ultimo_fim:inicio])
+        partes.append(f'AppLocalizations.of(context)!.{chave_arb}')
+        ultimo_fim = fim
+        substituicoes += 1
+
+    if not substituicoes:
+        return conteudo, 0
+
+    partes.append(conteudo[ultimo_fim:])
+    return ''.join(partes), substituicoes
+
+def substituir_conteudo(conteudo: str, mapa_substituicao: Dict[str, str], automato: AhoCorasick) -> Tuple[str, int]:
+    """Substituição textual de 'valor' por chave, para arquivos que não são Dart."""
+    trechos = (
+        (inicio, fim, mapa_substituicao[conteudo[inicio + 1:fim - 1]])
+        for inicio, fim in automato.encontrar_mais_longos(conteudo)
+    )
+    return _emendar(conteudo, trechos)
+
+def substituir_literais_dart(conteudo: str, mapa_substituicao: Dict[str, str]) -> Tuple[str, int]:
+    """Substitui os literais Dart com aspas simples cujo conteúdo está no mapa.
+    O arquivo é tokenizado uma vez e cada literal é trocado pela sua posição."""
+    trechos = []
+    for literal in sorted(tokenize_literals(conteudo)):
+        if literal.quote != "'" or literal.raw:
+            continue
+        chave_arb = mapa_substituicao.get(literal.content(conteudo))
+        if chave_arb is not None:
+            trechos.append((literal.start, literal.end, chave_arb))
+
+    # Um literal dentro da interpolação de outro já substituído desaparece junto com ele.
+    selecionados = []
+    limite = 0
+    for trecho in trechos:
+        if trecho[0] >= limite:
+            selecionados.append(trecho)
+            limite = trecho[1]
+
+    return _emendar(conteudo, selecionados)
+
+_mapa_do_worker: Dict[str, str] = {}
+_automato_do_worker: Optional[AhoCorasick] = None
+
+def _inicializar_worker(mapa_substituicao: Dict[str, str]):
+    # Executado uma vez por processo: o mapa é serializado só na criação do
+    # worker, em vez de viajar junto com cada tarefa.
+    global _mapa_do_worker, _automato_do_worker
+    _mapa_do_worker = mapa_substituicao
+    _automato_do_worker = None
+
+def _obter_automato() -> AhoCorasick:
+    # Só arquivos que não são Dart precisam do autômato; ele é montado na primeira vez.
+    global _automato_do_worker
+    if _automato_do_worker is None:
+        _automato_do_worker = criar_automato_de_substituicao(_mapa_do_worker)
+    return _automato_do_worker
+
+def listar_arquivos(pasta_alvo: str, extensoes_permitidas: List[str], caminhos_excluidos: List[str],
+                    usar_gitignore: bool = True) -> List[str]:
+    return list(percorrer_arquivos(pasta_alvo, extensoes_permitidas, caminhos_excluidos, usar_gitignore))
+
+class ResultadoArquivo(NamedTuple):
+    caminho: str
+    substituicoes: int
+    erro: Optional[str]
+    entrada_manifesto: Optional[Dict[str, Any]]
+    ignorado_pelo_cache: bool
+
+def processar_arquivo(caminho_completo: str, entrada_manifesto: Optional[Dict[str, Any]] = None) -> ResultadoArquivo:
+    """Substitui as strings de um arquivo usando o mapa do worker atual.
+    Arquivos cujo conteúdo bate com a entrada do manifesto não são reprocessados."""
+    if stat_inalterado(caminho_completo, entrada_manifesto):
+        return ResultadoArquivo(caminho_completo, 0, None, entrada_manifesto, True)
+
+    try:
+        with open(caminho_completo, 'r', encoding='utf-8') as f:
+            conteudo_original = f.read()
+    except Exception as e:
+        return ResultadoArquivo(caminho_completo, 0, f"Aviso: Não foi possível ler o arquivo '{caminho_completo}'. Erro: {e}", None, False)
+
+    hash_original = hash_conteudo(conteudo_original)
+    if entrada_manifesto and entrada_manifesto.get('sha1') == hash_original:
+        return ResultadoArquivo(caminho_completo, 0, None, criar_entrada(caminho_completo, hash_original), True)
+
+    if caminho_completo.endswith('.dart'):
+        conteudo_modificado, substituicoes_neste_arquivo = substituir_literais_dart(conteudo_original, _mapa_do_worker)
+    else:
+        conteudo_modificado, substituicoes_neste_arquivo = substituir_conteudo(conteudo_original, _mapa_do_worker, _obter_automato())
+
+    if conteudo_modificado == conteudo_original:
+        return ResultadoArquivo(caminho_completo, 0, None, criar_entrada(caminho_completo, hash_original), False)
+
+    try:
+        with open(caminho_completo, 'w', encoding='utf-8') as f:
+            f.write(conteudo_modificado)
+    except Exception as e:
+        return ResultadoArquivo(caminho_completo, 0, f"Erro: Não foi possível escrever no arquivo '{caminho_completo}'. Erro: {e}", None, False)
+
+    entrada = criar_entrada(caminho_completo, hash_conteudo(conteudo_modificado))
+    return ResultadoArquivo(caminho_completo, substituicoes_neste_arquivo, None, entrada, False)
+
+def processar_arquivos_na_pasta(pasta_alvo: str, mapa_substituicao: Dict[str, str], extensoes_permitidas: List[str], caminhos_excluidos: List[str], jobs: int = 1, caminho_manifesto: Optional[str] = None,
+                                usar_gitignore: bool = True) -> bool:
+    """Retorna False se a pasta não existe ou algum arquivo não pôde ser lido ou gravado."""
     if not os.path.isdir(pasta_alvo):
         print(f"Erro: A pasta '{pasta_alvo}' não existe.")
-        return
+        return False
 
     total_substituicoes = 0
     arquivos_modificados = 0
+    arquivos_ignorados = 0
+    arquivos_com_erro = 0
 
     print(f"Iniciando busca na pasta '{pasta_alvo}'...")
 
-    caminhos_excluidos_abs = [os.path.abspath(p) for p in caminhos_excluidos]
-
-    for root, dirs, files in os.walk(pasta_alvo):
-        dirs[:] = [d for d in dirs if os.path.abspath(os.path.join(root, d)) not in caminhos_excluidos_abs]
-
-        for nome_arquivo in files:
-            caminho_completo = os.path.join(root, nome_arquivo)
-
-            if os.path.abspath(caminho_completo) in caminhos_excluidos_abs:
-                continue
-
-            if not any(nome_arquivo.endswith(ext) for ext in extensoes_permitidas):
-                continue
-            
-            try:
-                with open(caminho_completo, 'r', encoding='utf-8') as f:
-                    conteudo_original = f.read()
-            except Exception as e:
-                print(f"Aviso: Não foi possível ler o arquivo '{caminho_completo}'. Erro: {e}")
-                continue
-
-            conteudo_modificado = conteudo_original
-            substituicoes_neste_arquivo = 0
-
-            for valor_string, chave_arb in mapa_substituicao.items():
-                string_para_buscar = f"'{valor_string}'"
-                string_de_substituicao = f'AppLocalizations.of(context)!.{chave_arb}'
-                
-                ocorrencias = conteudo_modificado.count(string_para_buscar)
-                if ocorrencias > 0:
-                    conteudo_modificado = conteudo_modificado.replace(string_para_buscar, string_de_substituicao)
-                    substituicoes_neste_arquivo += ocorrencias
-            
-            if conteudo_modificado != conteudo_original:
-                try:
-                    with open(caminho_completo, 'w', encoding='utf-8') as f:
-                        f.write(conteudo_modificado)
-                    print(f"  -> Modificado '{caminho_completo}' ({substituicoes_neste_arquivo} substituições)")
-                    total_substituicoes += substituicoes_neste_arquivo
-                    arquivos_modificados += 1
-                except Exception as e:
-                    print(f"Erro: Não foi possível escrever no arquivo '{caminho_completo}'. Erro: {e}")
+    arquivos = listar_arquivos(pasta_alvo, extensoes_permitidas, caminhos_excluidos, usar_gitignore)
+
+    hash_mapa = hash_objeto(mapa_substituicao)
+    manifesto = carregar_manifesto(caminho_manifesto, hash_mapa) if caminho_manifesto else {}
+    entradas = [manifesto.get(os.path.abspath(caminho)) for caminho in arquivos]
+    novo_manifesto: Dict[str, Dict[str, Any]] = {}
+
+    if jobs > 1 and len(arquivos) > 1:
+        # Importado só aqui: o multiprocessing pesa no início de execuções curtas (ex: hooks do git).
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=jobs, initializer=_inicializar_worker, initargs=(mapa_substituicao,))
+        tamanho_lote = max(1, len(arquivos) // (jobs * 4))
+        resultados = executor.map(processar_arquivo, arquivos, entradas, chunksize=tamanho_lote)
+    else:
+        executor = None
+        _inicializar_worker(mapa_substituicao)
+        resultados = map(processar_arquivo, arquivos, entradas)
+
+    try:
+        for resultado in resultados:
+            if resultado.entrada_manifesto:
+                novo_manifesto[os.path.abspath(resultado.caminho)] = resultado.entrada_manifesto
+
+            if resultado.erro:
+                print(resultado.erro)
+                arquivos_com_erro += 1
+            elif resultado.ignorado_pelo_cache:
+                arquivos_ignorados += 1
+            elif resultado.substituicoes:
+                print(f"  -> Modificado '{resultado.caminho}' ({resultado.substituicoes} substituições)")
+                total_substituicoes += resultado.substituicoes
+                arquivos_modificados += 1
+    finally:
+        if executor:
+            executor.shutdown()
+
+    if caminho_manifesto:
+        salvar_manifesto(caminho_manifesto, hash_mapa, novo_manifesto)
 
     print("\n--- Resumo ---")
     print(f"Processo concluído!")
     print(f"Arquivos modificados: {arquivos_modificados}")
+    if caminho_manifesto:
+        print(f"Arquivos inalterados (ignorados pelo cache): {arquivos_ignorados}")
     print(f"Total de substituições: {total_substituicoes}")
+    if arquivos_com_erro:
+        print(f"Arquivos com erro: {arquivos_com_erro}")
+    return not arquivos_com_erro
 
-def main():
+def main(argv: Optional[List[str]] = None, prog: Optional[str] = None):
     parser = argparse.ArgumentParser(
+        prog=prog,
         description="Substitui strings literais em arquivos por suas chaves de localização do Flutter (l10n).",
         formatter_class=argparse.RawTextHelpFormatter
     )
@@ -105,18 +221,46 @@ def main():
         '--excluir',
         nargs='*',
         default=[],
-        help="Lista de arquivos ou pastas a serem ignorados durante a análise. Ex: lib/l10n.dart"
+        help="Arquivos, pastas ou padrões no formato do .gitignore a serem ignorados durante a análise.\n"
+             "Ex: lib/l10n.dart 'generated/' '*.freezed.dart'"
+    )
+    parser.add_argument(
+        '--sem-gitignore',
+        action='store_true',
+        help="Não aplica os arquivos .gitignore da pasta e das pastas acima dela."
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help="Número de processos usados para processar os arquivos em paralelo. Padrão: 1"
+    )
+    parser.add_argument(
+        '--cache',
+        default=ARQUIVO_MANIFESTO_PADRAO,
+        help=f"Manifesto com o hash de cada arquivo já processado. Padrão: {ARQUIVO_MANIFESTO_PADRAO}"
+    )
+    parser.add_argument(
+        '--sem-cache',
+        action='store_true',
+        help="Processa todos os arquivos, sem ler nem gravar o manifesto."
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     extensoes = [ext.strip() for ext in args.ext.split(',')]
     caminhos_excluidos = args.excluir
 
-    mapa_substituicao = criar_mapa_de_substituicao(args.arb)
+    dados_arb = ler_arb(args.arb)
+    if dados_arb is None:
+        return False
+    mapa_substituicao = mapa_de_substituicao(dados_arb)
 
-    if mapa_substituicao:
-        processar_arquivos_na_pasta(args.pasta, mapa_substituicao, extensoes, caminhos_excluidos)
+    if not mapa_substituicao:
+        return True
+    caminho_manifesto = None if args.sem_cache else args.cache
+    return processar_arquivos_na_pasta(args.pasta, mapa_substituicao, extensoes, caminhos_excluidos, args.jobs, caminho_manifesto,
+                                       not args.sem_gitignore)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(0 if main() else 1)
\ No newline at end of file
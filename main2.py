@@ -1,59 +1,256 @@
 import json
 import argparse
 import os
-from deep_translator import GoogleTranslator
-from typing import Dict, Any
+import sys
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional
 
-def traduzir_arquivo_arb(caminho_entrada: str, caminho_saida: str, idioma_alvo: str, idioma_fonte: str = 'auto'):
+from arquivo_arb import caminho_snapshot, entradas_de_texto, gravar_arb, ler_arb, nome_arquivo_idioma
+from diario import DiarioTraducao
+from limitador import LimitadorTaxa, TradutorLimitado
+from memoria_traducao import ARQUIVO_MEMORIA_PADRAO, MemoriaTraducao
+from metricas import MetricasTraducao, gravar_metricas
+from traducao import LIMITE_CARACTERES_PADRAO, traduzir_valores
+from tradutores import TRADUTORES
+
+TAXA_PADRAO = 5.0
+# Idiomas traduzidos ao mesmo tempo com --idiomas/--todos.
+IDIOMAS_SIMULTANEOS_PADRAO = 4
+
+# Idiomas traduzidos com --todos (códigos aceitos pelo Google Tradutor).
+IDIOMAS_SUPORTADOS = [
+    "af", "sq", "am", "ar", "hy", "as", "ay", "az", "bm", "eu", "be", "bn", "bho", "bs", "bg", "ca", "ceb", "ny", "zh-CN",
+    "zh-TW", "co", "hr", "cs", "da", "dv", "doi", "nl", "en", "eo", "et", "ee", "tl", "fi", "fr", "fy", "gl", "ka", "de",
+    "el", "gn", "gu", "ht", "ha", "haw", "iw", "hi", "hmong", "hu", "is", "ig", "ilo", "id", "ga", "it", "ja", "jw", "kn",
+    "kk", "km", "rw", "gom", "ko", "kri", "ku", "ckb", "ky", "lo", "la", "lv", "ln", "lt", "lg", "lb", "mk", "mai", "mg",
+    "ms", "ml", "mt", "mi", "mr", "mni-Mtei", "lus", "mn", "my", "ne", "no", "or", "om", "ps", "fa", "pl", "pt", "pa",
+    "qu", "ro", "ru", "sm", "sa", "gd", "nso", "sr", "st", "sn", "sd", "si", "sk", "sl", "so", "es", "su", "sw", "sv",
+    "tg", "ta", "tt", "te", "th", "ti", "ts", "tr", "tk", "ak", "uk", "ur", "ug", "uz", "vi", "cy", "xh", "yi", "yo", "zu",
+]
+
+@dataclass
+class OpcoesTraducao:
+    """Opções de execução comuns a todos os idiomas traduzidos."""
+    em_lotes: bool = False
+    limite_caracteres: int = LIMITE_CARACTERES_PADRAO
+    simultaneas: int = 1
+    taxa: float = TAXA_PADRAO
+    tentativas: int = 5
+    incremental: bool = False
+    retomar: bool = False
+    tradutor: str = 'google'
+    silencioso: bool = False
+    metricas_json: Optional[str] = None
+    metricas_prometheus: Optional[str] = None
+
+def criar_limitador(opcoes: OpcoesTraducao) -> LimitadorTaxa:
+    # Backends sem limite declarado (ex: pseudo) rodam sem restrição de taxa.
+    taxa_maxima = TRADUTORES[opcoes.tradutor].taxa_maxima
+    if taxa_maxima is None:
+        return LimitadorTaxa(None)
+    return LimitadorTaxa(min(opcoes.taxa, taxa_maxima), taxa_maxima=taxa_maxima)
+
+def resolver_simultaneas(simultaneas: Optional[int], idiomas_simultaneos: int, varios_idiomas: bool) -> int:
+    """Valor de --simultaneas, que por padrão acompanha os idiomas atendidos pelo pool compartilhado."""
+    if simultaneas is not None:
+        return simultaneas
+    # Com um pool de uma thread os idiomas só se revezariam; o limitador de taxa continua valendo.
+    return idiomas_simultaneos if varios_idiomas else 1
+
+def carregar_json_opcional(caminho: str) -> Optional[Dict[str, Any]]:
     try:
-        with open(caminho_entrada, 'r', encoding='utf-8') as f:
-            dados_arb = json.load(f)
+        with open(caminho, 'r', encoding='utf-8') as f:
+            return json.load(f)
     except FileNotFoundError:
-        print(f"Erro: Arquivo de entrada não encontrado em '{caminho_entrada}'")
-        return
+        return None
     except json.JSONDecodeError:
-        print(f"Erro: O arquivo '{caminho_entrada}' não é um JSON válido.")
-        return
+        print(f"Aviso: O arquivo '{caminho}' não é um JSON válido e será ignorado.")
+        return None
+
+def traduzir_arquivo_arb(caminho_entrada: str, caminho_saida: str, idioma_alvo: str, idioma_fonte: str = 'auto', opcoes: Optional[OpcoesTraducao] = None, memoria: Optional[MemoriaTraducao] = None) -> bool:
+    dados_arb = ler_arb(caminho_entrada)
+    if dados_arb is None:
+        return False
+
+    opcoes = opcoes or OpcoesTraducao()
+    limitador = criar_limitador(opcoes)
+    metricas = MetricasTraducao()
+    sucesso = traduzir_dados_arb(dados_arb, caminho_saida, idioma_alvo, idioma_fonte, opcoes, limitador, memoria, metricas=metricas)
+    imprimir_resumo_compartilhado(limitador, memoria, metricas, opcoes)
+    return sucesso
+
+def imprimir_resumo_compartilhado(limitador: LimitadorTaxa, memoria: Optional[MemoriaTraducao], metricas: Optional[MetricasTraducao] = None, opcoes: Optional[OpcoesTraducao] = None):
+    if limitador.limitacoes:
+        print(f"Aviso: o tradutor limitou a taxa {limitador.limitacoes} vezes; taxa final: {limitador.taxa:.1f} req/s.")
+
+    if memoria:
+        print(f"Memória de tradução: {memoria.acertos} acertos, {memoria.falhas} falhas ({memoria.taxa_acerto():.0%} de acerto).")
 
+    if metricas:
+        resumo = metricas.resumo(memoria, limitador.taxa)
+        latencia = resumo['latencia_segundos']
+        print(f"Requisições: {resumo['requisicoes']} em {resumo['duracao_segundos']:.1f}s ({resumo['requisicoes_por_segundo']:.1f} req/s), "
+              f"{resumo['caracteres_traduzidos']} caracteres, {resumo['novas_tentativas']} novas tentativas.")
+        print(f"Latência por requisição: p50 {latencia['p50'] * 1000:.0f} ms, p95 {latencia['p95'] * 1000:.0f} ms, p99 {latencia['p99'] * 1000:.0f} ms.")
+
+        if opcoes and (opcoes.metricas_json or opcoes.metricas_prometheus):
+            try:
+                gravar_metricas(metricas, opcoes.metricas_json, opcoes.metricas_prometheus, memoria, limitador.taxa)
+            except OSError as e:
+                print(f"Erro ao gravar as métricas: {e}")
+
+def traduzir_dados_arb(dados_arb: Dict[str, Any], caminho_saida: str, idioma_alvo: str, idioma_fonte: str, opcoes: OpcoesTraducao, limitador: LimitadorTaxa, memoria: Optional[MemoriaTraducao] = None, executor: Optional[Executor] = None, prefixo: str = '', metricas: Optional[MetricasTraducao] = None) -> bool:
+    """Retorna False se o arquivo não pôde ser gravado ou alguma chave ficou sem tradução."""
     dados_traduzidos: Dict[str, Any] = {}
-    tradutor = GoogleTranslator(source=idioma_fonte, target=idioma_alvo)
+    classe_tradutor = TRADUTORES[opcoes.tradutor]
+    tradutor = TradutorLimitado(lambda: classe_tradutor(idioma_fonte, idioma_alvo), limitador, opcoes.tentativas, metricas=metricas)
+    limite_caracteres = min(opcoes.limite_caracteres, classe_tradutor.limite_caracteres)
 
-    print(f"Traduzindo de '{idioma_fonte}' para '{idioma_alvo}'...")
+    print(f"{prefixo}Traduzindo de '{idioma_fonte}' para '{idioma_alvo}'...")
 
+    chaves_pendentes = [chave for chave, _ in entradas_de_texto(dados_arb)]
+    valores_pendentes = [dados_arb[chave] for chave in chaves_pendentes]
     total_chaves = len([k for k in dados_arb if not k.startswith('@')])
     chaves_processadas = 0
+    traducoes: Dict[str, str] = {}
 
-    for chave, valor in dados_arb.items():
-        if chave.startswith('@'):
-            dados_traduzidos[chave] = valor
-            continue
+    if opcoes.incremental:
+        # Mantém as traduções existentes (inclusive as editadas à mão) cujo valor de
+        # origem não mudou desde a última execução; só o resto vai para o tradutor.
+        traducao_anterior = carregar_json_opcional(caminho_saida) or {}
+        fonte_anterior = carregar_json_opcional(caminho_snapshot(caminho_saida))
+        for chave in chaves_pendentes:
+            if chave not in traducao_anterior:
+                continue
+            if fonte_anterior is None or fonte_anterior.get(chave) == dados_arb[chave]:
+                traducoes[chave] = traducao_anterior[chave]
+        removidas = [chave for chave in traducao_anterior if chave not in dados_arb]
+        chaves_pendentes = [chave for chave in chaves_pendentes if chave not in traducoes]
+        valores_pendentes = [dados_arb[chave] for chave in chaves_pendentes]
+        chaves_processadas = len(traducoes)
+        print(f"{prefixo}Modo incremental: {len(traducoes)} chaves mantidas, {len(chaves_pendentes)} novas ou alteradas, {len(removidas)} removidas.")
+
+    # O diário guarda cada tradução assim que chega; com --resume, as que ainda
+    # correspondem ao valor de origem atual são reaproveitadas.
+    diario = DiarioTraducao(caminho_saida, opcoes.retomar)
+    if opcoes.retomar:
+        do_diario = diario.traducoes_validas(dados_arb)
+        retomadas = [chave for chave in chaves_pendentes if chave in do_diario]
+        for chave in retomadas:
+            traducoes[chave] = do_diario[chave]
+        chaves_processadas += len(retomadas)
+        chaves_pendentes = [chave for chave in chaves_pendentes if chave not in traducoes]
+        valores_pendentes = [dados_arb[chave] for chave in chaves_pendentes]
+        print(f"{prefixo}Retomando: {len(retomadas)} chaves recuperadas do diário, {len(chaves_pendentes)} restantes.")
 
-        try:
-            if isinstance(valor, str):
-                valor_traduzido = tradutor.translate(valor)
-                dados_traduzidos[chave] = valor_traduzido
+    if memoria:
+        da_memoria = memoria.buscar_varios(idioma_fonte, idioma_alvo, valores_pendentes)
+        for chave, valor in zip(chaves_pendentes, valores_pendentes):
+            if valor in da_memoria:
+                traducoes[chave] = da_memoria[valor]
                 chaves_processadas += 1
-                print(f"  ({chaves_processadas}/{total_chaves}) '{chave}': '{valor}' -> '{valor_traduzido}'")
-            else:
-                dados_traduzidos[chave] = valor
-        except Exception as e:
-            print(f"Erro ao traduzir a chave '{chave}': {e}")
-            dados_traduzidos[chave] = valor
-    
+                if not opcoes.silencioso:
+                    print(f"{prefixo}  ({chaves_processadas}/{total_chaves}) '{chave}': '{valor}' -> '{da_memoria[valor]}' (memória)")
+        chaves_pendentes = [chave for chave in chaves_pendentes if chave not in traducoes]
+        valores_pendentes = [dados_arb[chave] for chave in chaves_pendentes]
+
+    # Valores repetidos em várias chaves são traduzidos uma única vez.
+    chaves_por_valor: Dict[str, List[str]] = {}
+    for chave, valor in zip(chaves_pendentes, valores_pendentes):
+        chaves_por_valor.setdefault(valor, []).append(chave)
+    valores_unicos = list(chaves_por_valor)
+
+    chaves_com_erro: List[str] = []
+
+    for indice, resultado in traduzir_valores(tradutor, valores_unicos, opcoes.em_lotes, limite_caracteres, opcoes.simultaneas, executor, classe_tradutor.limite_itens):
+        valor = valores_unicos[indice]
+        if resultado.erro is not None:
+            for chave in chaves_por_valor[valor]:
+                chaves_com_erro.append(chave)
+                print(f"{prefixo}Erro ao traduzir a chave '{chave}': {resultado.erro}")
+            continue
+
+        if memoria:
+            memoria.gravar(idioma_fonte, idioma_alvo, valor, resultado.traduzido)
+        for chave in chaves_por_valor[valor]:
+            traducoes[chave] = resultado.traduzido
+            diario.registrar(chave, valor, resultado.traduzido)
+            chaves_processadas += 1
+            if not opcoes.silencioso:
+                print(f"{prefixo}  ({chaves_processadas}/{total_chaves}) '{chave}': '{valor}' -> '{resultado.traduzido}'")
+
+    for chave, valor in dados_arb.items():
+        dados_traduzidos[chave] = traducoes.get(chave, valor)
+
+    if valores_pendentes:
+        reducao = 1 - len(valores_unicos) / len(valores_pendentes)
+        print(f"\n{prefixo}Valores enviados ao tradutor: {len(valores_unicos)} únicos de {len(valores_pendentes)} pendentes (redução de {reducao:.1%}).")
+
     try:
-        diretorio_saida = os.path.dirname(caminho_saida)
-        if diretorio_saida:
-            os.makedirs(diretorio_saida, exist_ok=True)
-        
-        with open(caminho_saida, 'w', encoding='utf-8') as f:
-            json.dump(dados_traduzidos, f, ensure_ascii=False, indent=2)
-        print(f"\nTradução concluída! Arquivo salvo em: '{caminho_saida}'")
+        gravar_arb(caminho_saida, dados_traduzidos)
+
+        if opcoes.incremental:
+            # Só entram no snapshot as chaves realmente traduzidas; as que falharam são tentadas de novo.
+            fonte_traduzida = {chave: dados_arb[chave] for chave in traducoes}
+            gravar_arb(caminho_snapshot(caminho_saida), fonte_traduzida)
+        print(f"\n{prefixo}Tradução concluída! Arquivo salvo em: '{caminho_saida}'")
     except IOError as e:
-        print(f"Erro ao escrever o arquivo de saída '{caminho_saida}': {e}")
+        print(f"{prefixo}Erro ao escrever o arquivo de saída '{caminho_saida}': {e}")
+        diario.fechar()
+        return False
+
+    if chaves_com_erro:
+        # Mantém o diário para que --resume tente de novo apenas as chaves que falharam.
+        diario.fechar()
+        print(f"{prefixo}Aviso: {len(chaves_com_erro)} chaves não foram traduzidas e ficaram com o valor original. Execute novamente com --resume para tentar só elas.")
+        return False
+    diario.remover()
+    return True
+
+def traduzir_para_idiomas(caminho_entrada: str, idiomas: List[str], idioma_fonte: str, pasta_saida: str, opcoes: Optional[OpcoesTraducao] = None, memoria: Optional[MemoriaTraducao] = None, idiomas_simultaneos: int = IDIOMAS_SIMULTANEOS_PADRAO) -> bool:
+    """Traduz o mesmo ARB para vários idiomas num único processo. O arquivo de
+    origem é lido uma vez, e as requisições de todos os idiomas dividem o mesmo
+    pool de threads e o mesmo limitador de taxa. Cada ARB é gravado assim que
+    seu idioma termina."""
+    dados_arb = ler_arb(caminho_entrada)
+    if dados_arb is None:
+        return False
+
+    opcoes = opcoes or OpcoesTraducao()
+    idiomas = [idioma for idioma in dict.fromkeys(idiomas) if idioma != idioma_fonte]
+    limitador = criar_limitador(opcoes)
+    metricas = MetricasTraducao()
 
+    print(f"Traduzindo '{caminho_entrada}' para {len(idiomas)} idiomas...")
 
-def main2():
+    # Os idiomas rodam em threads coordenadoras que só distribuem o trabalho; as
+    # requisições (idioma, lote) ficam todas no pool compartilhado de tradução.
+    with ThreadPoolExecutor(max_workers=max(1, opcoes.simultaneas)) as pool_traducao, \
+         ThreadPoolExecutor(max_workers=max(1, idiomas_simultaneos)) as pool_idiomas:
+        futuros = {
+            pool_idiomas.submit(
+                traduzir_dados_arb, dados_arb, os.path.join(pasta_saida, nome_arquivo_idioma(idioma)), idioma,
+                idioma_fonte, opcoes, limitador, memoria, pool_traducao, f"[{idioma}] ", metricas
+            ): idioma
+            for idioma in idiomas
+        }
+        sucesso = True
+        for futuro in as_completed(futuros):
+            try:
+                sucesso = futuro.result() and sucesso
+            except Exception as e:
+                print(f"Erro ao traduzir para '{futuros[futuro]}': {e}")
+                sucesso = False
+
+    print(f"\nTodas as traduções foram concluídas! ({len(idiomas)} idiomas)")
+    imprimir_resumo_compartilhado(limitador, memoria, metricas, opcoes)
+    return sucesso
+
+
+def main2(argv: Optional[List[str]] = None, prog: Optional[str] = None):
     parser = argparse.ArgumentParser(
+        prog=prog,
         description="Traduz os valores de um arquivo .arb do Flutter para um novo idioma.",
         formatter_class=argparse.RawTextHelpFormatter
     )
@@ -64,23 +261,141 @@ def main2():
     )
     parser.add_argument(
         '--saida',
-        required=True,
         help="Caminho para o novo arquivo .arb traduzido. Ex: lib/l10n/app_es.arb"
     )
     parser.add_argument(
         '--idioma',
-        required=True,
         help="Código do idioma de destino para a tradução. Ex: es (espanhol), en (inglês)"
     )
+    parser.add_argument(
+        '--idiomas',
+        nargs='+',
+        help="Traduz para vários idiomas de uma vez, gerando app_<idioma>.arb para cada um. Ex: --idiomas es en de"
+    )
+    parser.add_argument(
+        '--todos',
+        action='store_true',
+        help="Traduz para todos os idiomas suportados (exceto o de origem)."
+    )
+    parser.add_argument(
+        '--pasta-saida',
+        help="Pasta onde os arquivos app_<idioma>.arb são gravados com --idiomas/--todos. Padrão: a pasta do arquivo de entrada"
+    )
+    parser.add_argument(
+        '--idiomas-simultaneos',
+        type=int,
+        default=IDIOMAS_SIMULTANEOS_PADRAO,
+        help=f"Número de idiomas traduzidos ao mesmo tempo com --idiomas/--todos. Padrão: {IDIOMAS_SIMULTANEOS_PADRAO}"
+    )
     parser.add_argument(
         '--fonte',
         default='auto',
         help="(Opcional) Código do idioma de origem. Padrão: 'auto' para detecção automática."
     )
+    parser.add_argument(
+        '--tradutor',
+        choices=sorted(TRADUTORES),
+        default='google',
+        help="Backend de tradução. 'pseudo' é offline e determinístico, útil para testes e CI. Padrão: google"
+    )
+    parser.add_argument(
+        '--lotes',
+        action='store_true',
+        help="Agrupa vários valores em cada requisição, reduzindo o número de chamadas ao tradutor."
+    )
+    parser.add_argument(
+        '--limite-caracteres',
+        type=int,
+        default=LIMITE_CARACTERES_PADRAO,
+        help=f"Tamanho máximo, em caracteres, de cada requisição em lote. Padrão: {LIMITE_CARACTERES_PADRAO}"
+    )
+    parser.add_argument(
+        '--simultaneas',
+        type=int,
+        default=None,
+        help="Número máximo de requisições em andamento ao mesmo tempo. Padrão: 1 com --idioma; com --idiomas/--todos,\no valor de --idiomas-simultaneos, para que o pool compartilhado atenda vários idiomas ao mesmo tempo."
+    )
+    parser.add_argument(
+        '--taxa',
+        type=float,
+        default=TAXA_PADRAO,
+        help=f"Taxa inicial de requisições por segundo. É reduzida automaticamente quando o tradutor limita as chamadas. Padrão: {TAXA_PADRAO}"
+    )
+    parser.add_argument(
+        '--memoria',
+        default=ARQUIVO_MEMORIA_PADRAO,
+        help=f"Banco SQLite com as traduções já feitas, consultado antes do tradutor. Padrão: {ARQUIVO_MEMORIA_PADRAO}"
+    )
+    parser.add_argument(
+        '--sem-memoria',
+        action='store_true',
+        help="Não consulta nem grava a memória de tradução."
+    )
+    parser.add_argument(
+        '--memoria-max-entradas',
+        type=int,
+        default=None,
+        help="Número máximo de entradas na memória; as usadas há mais tempo são removidas ao final."
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help="Traduz apenas as chaves novas ou cujo valor de origem mudou desde a última execução,\nmantendo as traduções existentes no arquivo de saída."
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help="Retoma uma execução interrompida a partir do diário gravado ao lado de cada arquivo de saída."
+    )
+    parser.add_argument(
+        '--tentativas',
+        type=int,
+        default=5,
+        help="Número de tentativas por requisição em falhas transitórias, com espera exponencial. Padrão: 5"
+    )
+    parser.add_argument(
+        '--silencioso',
+        action='store_true',
+        help="Não imprime uma linha por chave traduzida, só os erros e o resumo (mais rápido em ARBs grandes)."
+    )
+    parser.add_argument(
+        '--metricas-json',
+        help="Grava ao final um resumo em JSON: req/s, latências p50/p95/p99, caracteres, novas tentativas,\nlimitações e acertos da memória."
+    )
+    parser.add_argument(
+        '--metricas-prometheus',
+        help="Grava as mesmas métricas no formato de texto do Prometheus (textfile collector do node exporter).\nEx: /var/lib/node_exporter/textfile/autotranslation.prom"
+    )
+
+    args = parser.parse_args(argv)
 
-    args = parser.parse_args()
-    
-    traduzir_arquivo_arb(args.entrada, args.saida, args.idioma, args.fonte)
+    idiomas = IDIOMAS_SUPORTADOS if args.todos else args.idiomas
+    if not idiomas and not (args.idioma and args.saida):
+        parser.error("informe --idioma e --saida, ou então --idiomas/--todos.")
+
+    opcoes = OpcoesTraducao(
+        em_lotes=args.lotes,
+        limite_caracteres=args.limite_caracteres,
+        simultaneas=resolver_simultaneas(args.simultaneas, args.idiomas_simultaneos, bool(idiomas)),
+        taxa=args.taxa,
+        tentativas=args.tentativas,
+        incremental=args.incremental,
+        retomar=args.resume,
+        tradutor=args.tradutor,
+        silencioso=args.silencioso,
+        metricas_json=args.metricas_json,
+        metricas_prometheus=args.metricas_prometheus,
+    )
+
+    memoria = None if args.sem_memoria else MemoriaTraducao(args.memoria, args.memoria_max_entradas)
+    try:
+        if idiomas:
+            pasta_saida = args.pasta_saida or os.path.dirname(args.entrada)
+            return traduzir_para_idiomas(args.entrada, idiomas, args.fonte, pasta_saida, opcoes, memoria, args.idiomas_simultaneos)
+        return traduzir_arquivo_arb(args.entrada, args.saida, args.idioma, args.fonte, opcoes, memoria)
+    finally:
+        if memoria:
+            memoria.fechar()
 
 if __name__ == "__main__":
-    main2()
+    sys.exit(0 if main2() else 1)
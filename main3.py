@@ -2,9 +2,21 @@ import json
 import argparse
 import os
 import re
-from typing import List, Dict, Set
+import sys
+from typing import List, Dict, Set, Iterator, Any, Optional, Tuple
 import hashlib
 
+from arquivo_arb import entradas_de_texto, gravar_arb, ler_arb
+
+# Tamanho de cada leitura no modo streaming.
+CHUNK_SIZE = 1 << 16
+# Intervalo, em valores lidos, das mensagens de progresso do modo streaming.
+PROGRESS_INTERVAL = 100000
+# Espaços permitidos entre os tokens do JSON.
+WHITESPACE = ' \t\r\n'
+# Caracteres que ainda podem continuar um número JSON.
+NUMBER_TAIL = re.compile(r'[0-9.eE+-]*')
+
 def generate_key_from_value(value: str, existing_keys: Set[str]) -> str:
     """Gera uma chave única usando um hash do valor da string."""
     if not value.strip():
@@ -22,8 +34,8 @@ def generate_key_from_value(value: str, existing_keys: Set[str]) -> str:
     
     return key
 
-def read_values_from_file(input_path: str) -> List[str]:
-    """Lê uma lista de valores de um arquivo .json ou .txt."""
+def read_values_from_file(input_path: str) -> Optional[List[str]]:
+    """Lê uma lista de valores de um arquivo .json ou .txt. Em caso de erro imprime a mensagem e retorna None."""
     _, ext = os.path.splitext(input_path)
     values = []
 
@@ -40,21 +52,208 @@ def read_values_from_file(input_path: str) -> List[str]:
                 values = [line.strip() for line in f if line.strip()]
             else:
                 print(f"Erro: Formato de arquivo não suportado '{ext}'. Use .json ou .txt.")
+                return None
     except FileNotFoundError:
         print(f"Erro: Arquivo de entrada não encontrado em '{input_path}'")
+        return None
     except json.JSONDecodeError:
         print(f"Erro: O arquivo '{input_path}' não é um JSON válido.")
+        return None
     except Exception as e:
         print(f"Erro ao ler o arquivo '{input_path}': {e}")
+        return None
         
     return values
 
-def generate_arb_from_values(input_path: str, output_path: str):
+def iter_json_values(f) -> Iterator[Any]:
+    """Lê um array JSON (ou os valores de um objeto) em blocos, decodificando um item por vez.
+    Separadores ausentes, repetidos ou sobrando no fim levantam json.JSONDecodeError."""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buffer, pos, eof
+        chunk = f.read(CHUNK_SIZE)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def skip(chars: str):
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in chars:
+                pos += 1
+            if pos < len(buffer) or not fill():
+                return
+
+    def decode() -> Any:
+        nonlocal pos
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+                # Um número cortado no fim do bloco (ex: '3' de '3.5') pode continuar no próximo.
+                if eof or not isinstance(item, (int, float)) or NUMBER_TAIL.match(buffer, end).end() < len(buffer):
+                    pos = end
+                    return item
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            fill()
+
+    def expect(char: str):
+        # Exatamente um separador: ',' entre os itens e ':' depois de cada chave.
+        nonlocal pos
+        skip(WHITESPACE)
+        if pos >= len(buffer):
+            raise json.JSONDecodeError("fim inesperado do arquivo", buffer, pos)
+        if buffer[pos] != char:
+            raise json.JSONDecodeError(f"'{char}' esperado", buffer, pos)
+        pos += 1
+        skip(WHITESPACE)
+
+    skip(WHITESPACE + '\ufeff')
+    if pos >= len(buffer) or buffer[pos] not in '[{':
+        raise json.JSONDecodeError("esperado um array ou objeto", buffer, pos)
+    is_object = buffer[pos] == '{'
+    if is_object:
+        print("Aviso: O JSON não é uma lista. Usando os valores do objeto.")
+    closing = '}' if is_object else ']'
+    pos += 1
+    skip(WHITESPACE)
+
+    if pos < len(buffer) and buffer[pos] == closing:
+        pos += 1
+    else:
+        while True:
+            if is_object:
+                if pos < len(buffer) and buffer[pos] != '"':
+                    raise json.JSONDecodeError("chave entre aspas esperada", buffer, pos)
+                decode()
+                expect(':')
+            yield decode()
+            skip(WHITESPACE)
+            if pos < len(buffer) and buffer[pos] == closing:
+                pos += 1
+                break
+            expect(',')
+
+    skip(WHITESPACE)
+    if pos < len(buffer):
+        raise json.JSONDecodeError("conteúdo após o fim do JSON", buffer, pos)
+
+def iter_values_from_file(input_path: str) -> Iterator[str]:
+    """Versão preguiçosa de read_values_from_file: gera os valores sem carregar o arquivo inteiro."""
+    _, ext = os.path.splitext(input_path)
+    with open(input_path, 'r', encoding='utf-8') as f:
+        if ext == '.json':
+            for item in iter_json_values(f):
+                yield str(item)
+        elif ext == '.txt':
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield line
+        else:
+            raise ValueError(f"Formato de arquivo não suportado '{ext}'. Use .json ou .txt.")
+
+class KeyIndex:
+    """Índice compacto das chaves geradas no modo streaming.
+
+    A chave é key_<8 primeiros hex do sha1>, então guardamos só inteiros: para
+    cada prefixo de 32 bits, os 32 bits seguintes do hash do primeiro valor
+    (o que basta para reconhecer valores repetidos). Os valores distintos que
+    colidem no prefixo, raros, ficam numa lista à parte cuja posição define o
+    sufixo numérico da chave, como em generate_key_from_value."""
+
+    def __init__(self):
+        self.first: Dict[int, int] = {}
+        self.collisions: Dict[int, List[int]] = {}
+        self.duplicates = 0
+
+    def key_for(self, value: str) -> Optional[str]:
+        """Retorna a chave de um valor novo, ou None se o valor já foi visto."""
+        digest = hashlib.sha1(value.encode('utf-8')).digest()
+        prefix = int.from_bytes(digest[:4], 'big')
+        rest = int.from_bytes(digest[4:8], 'big')
+        base_key = f"key_{prefix:08x}"
+
+        first = self.first.get(prefix)
+        if first is None:
+            self.first[prefix] = rest
+            return base_key
+        if first == rest:
+            self.duplicates += 1
+            return None
+
+        others = self.collisions.setdefault(prefix, [])
+        if rest in others:
+            self.duplicates += 1
+            return None
+        others.append(rest)
+        return f"{base_key}{len(others)}"
+
+    def __len__(self) -> int:
+        return len(self.first) + sum(len(others) for others in self.collisions.values())
+
+def generate_arb_streaming(input_path: str, output_path: str) -> Optional[Tuple[int, int]]:
+    """Gera o .arb lendo os valores aos poucos e gravando cada entrada assim que
+    sua chave é gerada. Valores repetidos entram uma vez só. A saída tem o mesmo
+    formato do json.dump com indent=2. Retorna (valores lidos, chaves geradas),
+    ou None em caso de erro."""
+    index = KeyIndex()
+    read = 0
+    written = 0
+
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    temp_path = f"{output_path}.tmp"
+
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as out:
+            out.write('{')
+            for value in iter_values_from_file(input_path):
+                read += 1
+                if read % PROGRESS_INTERVAL == 0:
+                    print(f"  ... {read} valores lidos, {written} chaves geradas")
+                if not value.strip():
+                    continue
+                key = index.key_for(value)
+                if key is None:
+                    continue
+                out.write(',\n  ' if written else '\n  ')
+                out.write(f"{json.dumps(key)}: {json.dumps(value, ensure_ascii=False)}")
+                written += 1
+            out.write('\n}' if written else '}')
+        os.replace(temp_path, output_path)
+    except FileNotFoundError:
+        print(f"Erro: Arquivo de entrada não encontrado em '{input_path}'")
+    except json.JSONDecodeError as e:
+        print(f"Erro: O arquivo '{input_path}' não é um JSON válido: {e}")
+    except (ValueError, IOError) as e:
+        print(f"Erro: {e}")
+    else:
+        print(f"\nSucesso! Arquivo ARB gerado em: '{output_path}'")
+        print(f"Valores lidos: {read} | Chaves geradas: {written} | Repetidos ignorados: {index.duplicates} | Colisões de prefixo: {len(index) - len(index.first)}")
+        return read, written
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return None
+
+def generate_arb_from_values(input_path: str, output_path: str) -> bool:
     """Gera um arquivo .arb com chaves a partir de um arquivo de valores."""
     values = read_values_from_file(input_path)
+    if values is None:
+        return False
     if not values:
         print("Nenhum valor encontrado para processar.")
-        return
+        return True
 
     print(f"Encontrados {len(values)} valores em '{input_path}'. Gerando chaves...")
 
@@ -69,18 +268,69 @@ def generate_arb_from_values(input_path: str, output_path: str):
             print(f"  - Gerado: '{key}': '{value[:50]}...'")
 
     try:
-        output_dir = os.path.dirname(output_path)
-        if output_dir:
-            os.makedirs(output_dir, exist_ok=True)
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(generated_arb, f, ensure_ascii=False, indent=2)
+        gravar_arb(output_path, generated_arb)
         print(f"\nSucesso! Arquivo ARB gerado em: '{output_path}'")
     except IOError as e:
         print(f"Erro ao escrever o arquivo de saída '{output_path}': {e}")
+        return False
+    return True
+
+def merge_values_into_arb(input_path: str, arb_path: str) -> Optional[int]:
+    """Mescla os valores da entrada num .arb existente: valores que já têm chave
+    mantêm a chave atual e só os valores novos recebem chaves, anexadas ao fim.
+    As chaves existentes nunca são renumeradas, e o arquivo não é reescrito se
+    não houver nada novo. Retorna o número de chaves adicionadas, ou None em caso de erro."""
+    # Um .arb que ainda não existe equivale a um vazio.
+    arb = ler_arb(arb_path, ausente_vazio=True)
+    if arb is None:
+        return None
 
-def main():
+    existing_keys: Set[str] = set(arb)
+    key_by_value: Dict[str, str] = {}
+    for key, value in entradas_de_texto(arb):
+        key_by_value.setdefault(value, key)
+
+    added: Dict[str, str] = {}
+    read = 0
+    try:
+        for value in iter_values_from_file(input_path):
+            read += 1
+            if value in key_by_value:
+                continue
+            key = generate_key_from_value(value, existing_keys)
+            if not key:
+                continue
+            added[key] = value
+            key_by_value[value] = key
+            existing_keys.add(key)
+            print(f"  - Gerado: '{key}': '{value[:50]}...'")
+    except FileNotFoundError:
+        print(f"Erro: Arquivo de entrada não encontrado em '{input_path}'")
+        return None
+    except json.JSONDecodeError as e:
+        print(f"Erro: O arquivo '{input_path}' não é um JSON válido: {e}")
+        return None
+    except ValueError as e:
+        print(f"Erro: {e}")
+        return None
+
+    print(f"\nValores lidos: {read} | Já existentes: {read - len(added)} | Novos: {len(added)}")
+    if not added:
+        print(f"Nada a mesclar; '{arb_path}' não foi alterado.")
+        return 0
+
+    arb.update(added)
+    try:
+        gravar_arb(arb_path, arb)
+        print(f"Sucesso! {len(added)} chaves adicionadas em: '{arb_path}'")
+    except IOError as e:
+        print(f"Erro ao escrever o arquivo de saída '{arb_path}': {e}")
+        return None
+    return len(added)
+
+def main(argv: Optional[List[str]] = None, prog: Optional[str] = None):
     parser = argparse.ArgumentParser(
+        prog=prog,
         description="Gera chaves para um arquivo .arb a partir de uma lista de valores em um arquivo .json ou .txt.",
         formatter_class=argparse.RawTextHelpFormatter
     )
@@ -94,9 +344,25 @@ def main():
         required=True,
         help="Caminho para o novo arquivo .arb a ser gerado.\nEx: 'lib/l10n/app_pt.arb'"
     )
+    parser.add_argument(
+        '--streaming',
+        action='store_true',
+        help="Lê a entrada aos poucos e grava o .arb incrementalmente, com memória proporcional só aos\nvalores distintos. Valores repetidos geram uma única chave. Indicado para milhões de strings."
+    )
+    parser.add_argument(
+        '--mesclar',
+        action='store_true',
+        help="Mescla os valores no .arb de --saida já existente: valores conhecidos mantêm suas chaves e\nsó os novos ganham chaves. Reexecutar com a lista atualizada altera apenas as entradas novas."
+    )
 
-    args = parser.parse_args()
-    generate_arb_from_values(args.entrada, args.saida)
+    args = parser.parse_args(argv)
+    if args.mesclar and args.streaming:
+        parser.error("--mesclar e --streaming não podem ser usados juntos.")
+    if args.mesclar:
+        return merge_values_into_arb(args.entrada, args.saida) is not None
+    if args.streaming:
+        return generate_arb_streaming(args.entrada, args.saida) is not None
+    return generate_arb_from_values(args.entrada, args.saida)
 
 if __name__ == "__main__":
-    main()
+    sys.exit(0 if main() else 1)
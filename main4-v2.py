@@ -1,285 +1,176 @@
 import os
 import re
-import json
+import sys
 import argparse
+import time
+
+from arquivo_arb import gravar_arb
+from dart_lexer import tokenize_literals
+from extraction_rules import DEFAULT_RULES_FILE, RuleProfile, RuleSet
+from manifesto import carregar_manifesto, criar_entrada, hash_conteudo, hash_objeto, salvar_manifesto, stat_inalterado
+from varredura import percorrer_arquivos
 
 BASE_DIR = os.getcwd()
 
 OUTPUT_JSON_FILE = 'translations_pt.json'
-UPPERCASE_WHITELIST = ['PAR-Q', 'ANT+', 'DESAFIO', 'SALVAR', 'PUBLICAR', 'CNPJ', 'CPF', 'ABC?']
+CACHE_FILE = '.autotranslation-extract-cache.json'
+# Mude ao alterar a lógica de extração, para invalidar os caches já gravados.
+EXTRACTION_CACHE_VERSION = 1
 
 
 extracted_strings = {}
 
-ignoredCount = 0
-
-STRING_REGEX = re.compile(
-    r"""
-    (
-        ['"]
-        (
-            [^'"\n]*?
-            [a-zA-ZáàâãéèêíïóôõúçñÁÀÂÃÉÈÊÍÏÓÔÕÚÇÑ]
-            [^'"\n]*?
-        )
-        ['"]
-    )
-    """,
-    re.VERBOSE
-)
+# Regras carregadas em cada processo do pool (ver _init_worker).
+_worker_rules = None
+
+LETTER_REGEX = re.compile(r'[a-zA-ZáàâãéèêíïóôõúçñÁÀÂÃÉÈÊÍÏÓÔÕÚÇÑ]')
 
 def format_string_to_key(text):
     text = re.sub(r'[^\w\s]', '', text).strip().lower()
     text = re.sub(r'\s+', '_', text)
     return text.strip('_')[:50]
 
-def is_ignored(path):
-    IGNORE_SUFFIXES  = [
-        '.g.dart',
-    ]
-
-    if os.path.isdir(path) and not path.endswith('/'):
-        path = path + '/'
-
-
-    for pattern in IGNORE_SUFFIXES:
-        if path.endswith(pattern):
-            return True
-        
-    return False
-
-def extract_from_file(filepath):
-    global ignoredCount
-
-    # ====================
-    #        FILES
-    # ====================
-    # --
-    if 'lib/packages/moovz_models' in filepath or 'lib/packages/moovz_services' in filepath:
-        return
-    
-    # --
-    if 'firebase_options.dart' in os.path.basename(filepath):
-        return
-    
-    # --
-    if 'FirebaseParQModelDocument.dart' in os.path.basename(filepath):
-        return
-    
-    # --
-    if 'lib/main.dart' in filepath:
-        return
-    
-    if 'color_extensions.dart' in os.path.basename(filepath):
-        return
-    
-    # --
-    files_white_list = ['FIrebaseClassSessionModelRepository.dart',
-                            'HeartRateZoneModelData.dart',
-                            'i_base_firebase_repository.dart']
-    
-    is_file_white_list = any(filepath.__contains__(file) for file in files_white_list)
-
-    if 'lib/packages/moovz_commons/src/repositories' in filepath:
-        if not is_file_white_list:
-            return
+def split_interpolations(content, literal):
+    # Interpolações simples ($nome) continuam no texto; apenas ${...} vira uma parte separada.
+    parts = ['']
+    for segment in literal.segments:
+        piece = content[segment.start:segment.end]
+        if segment.interpolation and piece.startswith('${'):
+            parts.extend([piece, ''])
+        else:
+            parts[-1] += piece
+    return parts
+
+def extract_candidates(filepath, rules):
+    """Lista (posição, texto) das strings do arquivo que passam pelas regras, em ordem de posição."""
+    if rules.skip_file(filepath):
+        return []
 
     with open(filepath, 'r', encoding='utf-8') as f:
         content = f.read()
-    
-    matches_iter = STRING_REGEX.finditer(content)
-
-    for match in matches_iter:
-        full_match_content = match.group(2)
-        start_index = match.start(1) # Posição inicial da string completa no arquivo
-
-        # Divide a string por interpolações como ${...}, mantendo os delimitadores
-        # Ex: 'Olá ${name}, bem-vindo!' -> ['Olá ', '${name}', ', bem-vindo!']
-        string_parts = re.split(r'(\$\{.*?\})', full_match_content)
+    return extract_candidates_from_content(content, rules)
 
-        for part in string_parts:
-            text = part.strip()
-
-        # ====================
-        #       OBJECTS
-        # ====================
-            if not text or text.startswith('${'):
-                continue
-
-            if text.isnumeric() or text.startswith(('http', '/', ':')):
-                continue
-            
-        # ====================
-        #   MOST ARE IMPORTS
-        # ====================
-        if text.__contains__('/') and text.__contains__('package') and text.__contains__('.dart'):
+def extract_candidates_from_content(content, rules, profile=None, filepath=None):
+    """Com um RuleProfile em `profile`, as regras são avaliadas uma a uma e medidas,
+    e o tempo e os literais do arquivo são registrados."""
+    started = time.perf_counter()
+    candidates = []
+    literals = 0
+    for literal in tokenize_literals(content):
+        literals += 1
+        full_match_content = literal.content(content)
+        if not LETTER_REGEX.search(full_match_content):
             continue
 
-        if text.__contains__('/') and text.__contains__('.dart'):
-            continue
+        start_index = literal.start # Posição inicial da string completa no arquivo
 
-        if text.__contains__('dart'):
-            continue
-    
-        # ====================
-        #    LOG FUNCTIONS
-        # ====================
-        pre_text = content[max(0, start_index - 30):start_index]
-
-        # --
-        if re.search(r'(log|print|debugPrint|logEvent)\s*\(\s*', pre_text) and not pre_text.__contains__('alog'):
-            continue
-
-        # --
-        if re.search(r'(inspectWithMessage|inspectWithMessageAndTrace|logger.e)\s*\(\s*', pre_text):
-            continue
-
-        # --
-        if re.search(r'(logInfo|logWarning)\s*\(\s*title\s*:\s*', pre_text):
-            continue
+        # Divide a string por interpolações como ${...}, mantendo os delimitadores
+        # Ex: 'Olá ${name}, bem-vindo!' -> ['Olá ', '${name}', ', bem-vindo!']
+        string_parts = split_interpolations(content, literal)
 
-        # ====================
-        #  MOST ARE VARIABLES
-        # ====================
-        # --
-        if (text.__contains__('_') and text.isupper()) or (text.__contains__('_') and text.islower()):
-            continue
-        
-        # --
-        if (not re.search(r'[áàâãéèêíïóôõúçñÁÀÂÃÉÈÊÍÏÓÔÕÚÇÑ]', text)):
-            is_strict_camel_case = re.search(r'^[a-z].*[A-Z]', text)
-            contains_spaces = ' ' in text
+        # Os filtros e a chave usam o trecho depois da última interpolação ${...}.
+        text = string_parts[-1].strip()
+        pre_text = content[max(0, start_index - rules.context_chars):start_index]
 
-            if is_strict_camel_case and not contains_spaces:
+        if profile is None:
+            if rules.rejecting_rule(text, pre_text) is not None:
                 continue
-
-        # --
-        if text.startswith('${') and text.endswith('}') and not ' ' in text:
-            continue
-
-        # --
-        if text.startswith('${') and not ' ' in text:
-            continue
-
-        # --
-        if text.startswith('$') and not ' ' in text:
-            continue
-
-        # --
-        if text.__contains__('substring'):
-            continue
-
-        # -- constants uppercase
-        have_one_lower_letter = any(letter.islower() for letter in text)
-        is_white_list = any(text.__contains__(word) for word in UPPERCASE_WHITELIST)
-        
-        if not have_one_lower_letter and len(text) > 3 and not is_white_list:
-            continue
-
-        # -- from .get()
-        if re.search(r'(get)\s*\(\s*', pre_text) and not 'dget' in pre_text and not 'title' in pre_text:
-            continue
-
-        # --
-
-        # ====================
-        #        FILES
-        # ====================
-        if text.__contains__('.dart') or text.__contains__('.onError') or text.__contains__('.json') or text.__contains__('.png'):
-            continue
-
-        if text.__contains__('.svg') or text.__contains__('jpeg'):
-            continue
-        
-        # ====================
-        #       OBJECTS
-        # ====================
-        if re.search(r'[A-Z][a-zA-Z]*\(.+?\$[a-zA-Z]', text):
+        elif rules.rejecting_rule_profiled(text, pre_text, profile) is not None:
             continue
 
-        # ====================
-        #  DATA and VARIATIONS
-        # ====================
-        # --
-        if (re.search(r'(json)\s*\[\s*', pre_text) or
-        re.search(r'(map)\s*\[\s*', pre_text) or
-        re.search(r'(data)\s*\[\s*', pre_text) or
-        re.search(r'(value)\s*\[\s*', pre_text) or
-        re.search(r'(postBody)\s*\[\s*', pre_text) or
-        re.search(r'(queryParameters)\s*\[\s*', pre_text) or
-        re.search(r'(reqBody)\s*\[\s*', pre_text) or
-        re.search(r'(updateData)\s*\[\s*', pre_text) or
-        re.search(r'(memberData)\s*\[\s*', pre_text)):
-            continue
+        candidates.append((start_index, text))
 
-        # --
-        if (re.search(r'(collection)\s*\(\s*', pre_text) or
-        re.search(r'(where)\s*\(\s*', pre_text)):
-            continue
+    # O lexer entrega strings aninhadas antes da string externa; a posição dá a ordem estável.
+    candidates.sort()
+    if profile is not None:
+        profile.record_file(filepath, time.perf_counter() - started, literals, len(candidates))
+    return candidates
 
-        # -- all like ['variable']
-        VARIABLES = ['Janeiro', 'Início', 'Semanalmente', 'Péssimo']
-        is_variable_white_list = any(text.__contains__(word) for word in VARIABLES)
-        if re.search(r'\[\s*$', pre_text) and not ' ' in text and not is_variable_white_list:
-            if not 'lowerCase' in pre_text and not 'upperCase' in pre_text:
-                continue
-        
-        # ====================
-        #   ENGLISH MESSAGES
-        # ====================
-        # -----------
-        ENGLISH_WORDS = ['Unable', 'Failed', 'Error', '_getIndividualZonePercentageFromTotalTime']
-
-        is_english_word = any(text.__contains__(word) for word in ENGLISH_WORDS)
-        
-        if is_english_word or 'user ' in text.lower():
-            continue
+def add_extracted_string(text, strings=None):
+    """Registra o texto em `strings` (por padrão, a saída global do extrator)."""
+    if strings is None:
+        strings = extracted_strings
+    key = format_string_to_key(text)
 
-        # ----------
-        ENGLISH_WORDS_2 = ['Invalid', 'Unknown', 'parse', 'session', 'found', '.env', ' error',
-                           'unauthorized', 'missing', 'failed']
+    original_key = key
+    counter = 1
+    while key in strings and strings[key] != text:
+        key = f"{original_key}_{counter}"
+        counter += 1
 
-        is_english_word_2 = any(text.__contains__(word) for word in ENGLISH_WORDS_2)
+    strings[key] = text
 
-        if is_english_word_2 or ' text ' in text.lower() and not 'cm.' in text:
-            continue
+def extract_from_file(filepath, rules):
+    for _, text in extract_candidates(filepath, rules):
+        add_extracted_string(text)
 
-        # -----------
-        ENGLISH_WORDS_3 = ['default', 'Could', '?.duration.inSeconds', 'Notifications',
-                           'assets', 'signup', 'rovide', 'ercent', 'Missing', 'invalid',]
+def extract_file_cached(filepath, rules, cache_entry=None, profile=None):
+    """Como extract_candidates, mas reaproveita os candidatos da entrada do cache
+    quando o arquivo não mudou. Retorna (candidatos, nova entrada, veio do cache).
+    No modo de perfil o cache não é lido, para que todo arquivo seja medido."""
+    if rules.skip_file(filepath):
+        if profile is not None:
+            profile.skipped_files += 1
+        return [], None, False
 
-        is_english_word_3 = any(text.__contains__(word) for word in ENGLISH_WORDS_3)
-        if is_english_word_3 or ('the' in text.lower() and not 'anos' in text):
-            continue
+    if profile is not None:
+        cache_entry = None
+    elif stat_inalterado(filepath, cache_entry):
+        return cache_entry['candidates'], cache_entry, True
 
-        # -----------
-        ENGLISH_WORDS_4 = ['newStatus', 'returned', 'vsfFDPBurro', '2346789bcdfghjkmnpqrtwxyz',
-                           'path', 'leadingHashSign', 'json', 'questions', 'christmas']
+    with open(filepath, 'r', encoding='utf-8') as f:
+        content = f.read()
+    content_hash = hash_conteudo(content)
+
+    from_cache = bool(cache_entry) and cache_entry.get('sha1') == content_hash
+    candidates = cache_entry['candidates'] if from_cache else extract_candidates_from_content(content, rules, profile, filepath)
+
+    entry = criar_entrada(filepath, content_hash)
+    entry['candidates'] = candidates
+    return candidates, entry, from_cache
+
+def _init_worker(rules_file):
+    # Cada processo compila as regras uma vez, em vez de recebê-las a cada arquivo.
+    global _worker_rules
+    _worker_rules = RuleSet.load(rules_file)
+
+def _extract_worker(filepath, cache_entry, profiling=False):
+    # No modo de perfil cada arquivo devolve o seu perfil, somado no processo principal.
+    profile = RuleProfile() if profiling else None
+    return extract_file_cached(filepath, _worker_rules, cache_entry, profile) + (profile,)
+
+def list_dart_files(full_dir_path, exclude=(), use_gitignore=True):
+    """Arquivos .dart da pasta fora do .gitignore e do --excluir, ordenados pelo
+    caminho relativo para que a resolução das chaves não dependa da varredura."""
+    filepaths = percorrer_arquivos(full_dir_path, ['.dart'], exclude, use_gitignore)
+    return sorted(filepaths, key=lambda path: os.path.relpath(path, full_dir_path).replace(os.sep, '/'))
+
+def iter_files_candidates(filepaths, rules, rules_file, jobs=1, cache_entries=None, profile=None):
+    """Gera (candidatos, nova entrada do cache, veio do cache) de cada arquivo, na
+    ordem de `filepaths`. Com jobs > 1 os arquivos são analisados num pool de processos."""
+    if cache_entries is None:
+        cache_entries = [None] * len(filepaths)
+
+    if jobs <= 1 or len(filepaths) <= 1:
+        for filepath, entry in zip(filepaths, cache_entries):
+            yield extract_file_cached(filepath, rules, entry, profile)
+        return
 
-        is_english_word_4 = any(text.__contains__(word) for word in ENGLISH_WORDS_4)
-        if is_english_word_4:
-            continue
-        
-            ignoredCount += 1
-            print(f"{'=' * 30} | {ignoredCount} | {'=' * 30}")
-            # print(filepath)
-            print('-' * 70)
-            print(pre_text + ' <-> ' + text)
-            print('=' * 70)
-            print(' ')
-            print(' ')
-            
-        key = format_string_to_key(text)
-
-        original_key = key
-        counter = 1
-        while key in extracted_strings and extracted_strings[key] != text:
-            key = f"{original_key}_{counter}"
-            counter += 1
-
-        extracted_strings[key] = text
-
-def run_extraction(target_dir, output_file):
+    # Importado só aqui: o multiprocessing pesa no início de execuções curtas (ex: hooks do git).
+    from concurrent.futures import ProcessPoolExecutor
+    executor = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(rules_file,))
+    try:
+        chunksize = max(1, len(filepaths) // (jobs * 4))
+        for candidates, entry, from_cache, file_profile in executor.map(
+                _extract_worker, filepaths, cache_entries, [profile is not None] * len(filepaths), chunksize=chunksize):
+            if file_profile is not None:
+                profile.merge(file_profile)
+            yield candidates, entry, from_cache
+    finally:
+        executor.shutdown()
+
+def run_extraction(target_dir, output_file, rules_file=DEFAULT_RULES_FILE, jobs=1, cache_file=None,
+                   exclude=(), use_gitignore=True, profiling=False, profile_json=None):
     if os.path.isabs(target_dir):
         full_dir_path = target_dir
     else:
@@ -287,33 +178,73 @@ def run_extraction(target_dir, output_file):
 
     if not os.path.exists(full_dir_path):
         print(f"Diretório de código não encontrado: {full_dir_path}")
-        return
-    
-    for root, dirs, files in os.walk(full_dir_path):
-        # dirs[:] = [d for d in dirs if not is_ignored(os.path.join(root, d))]
-
-        for file in files:
-            if file.endswith('.dart'):
-                filepath = os.path.join(root, file)
-                if is_ignored(filepath):
-                    continue
+        return False
 
-                extract_from_file(filepath)
+    try:
+        rules = RuleSet.load(rules_file)
+    except (OSError, ValueError) as e:
+        print(f"Erro ao carregar as regras de extração: {e}")
+        return False
+    
+    filepaths = list_dart_files(full_dir_path, exclude, use_gitignore)
+
+    # O cache só vale para o mesmo conjunto de regras e a mesma versão do extrator.
+    cache_reference = hash_objeto([EXTRACTION_CACHE_VERSION, rules.data])
+    cache = carregar_manifesto(cache_file, cache_reference) if cache_file else {}
+    cache_entries = [cache.get(os.path.abspath(filepath)) for filepath in filepaths]
+    new_cache = {}
+    cached_files = 0
+    profile = RuleProfile() if profiling or profile_json else None
+
+    # Os workers só devolvem os candidatos de cada arquivo; as chaves são resolvidas
+    # aqui, na ordem dos caminhos e posições, e a saída é a mesma para qualquer --jobs.
+    results = iter_files_candidates(filepaths, rules, rules_file, jobs, cache_entries, profile)
+    for filepath, (candidates, entry, from_cache) in zip(filepaths, results):
+        for _, text in candidates:
+            add_extracted_string(text)
+        if entry:
+            new_cache[os.path.abspath(filepath)] = entry
+        cached_files += from_cache
+
+    if cache_file:
+        salvar_manifesto(cache_file, cache_reference, new_cache)
     
     print("-" * 30)
     print(f"Total de {len(extracted_strings)} strings únicas encontradas.")
+    if cache_file:
+        print(f"Arquivos reaproveitados do cache: {cached_files} de {len(filepaths)}")
 
-    with open(output_file, "w", encoding='utf-8') as f:
-        json.dump(extracted_strings, f, ensure_ascii=False, indent=2)
+    gravar_arb(output_file, extracted_strings)
     
     print(f"Arquivo JSON de tradução salvo em: {os.path.join(BASE_DIR, output_file)}")
     print("-" * 30)
 
-# --- EXECUÇÃO FINAL ---
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Extrai strings de um projeto Flutter para um arquivo JSON.")
+    if profile is not None:
+        for file_stats in profile.files:
+            file_stats['path'] = os.path.relpath(file_stats['path'], full_dir_path).replace(os.sep, '/')
+        print(profile.table())
+        if profile_json:
+            profile.save_json(profile_json)
+            print(f"Perfil das regras salvo em: {profile_json}")
+    return True
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Extrai strings de um projeto Flutter para um arquivo JSON.")
     parser.add_argument('--pasta', required=True, help="Caminho para a pasta a ser analisada.")
     parser.add_argument('--saida', default=OUTPUT_JSON_FILE, help="Nome do arquivo JSON de saída. Padrão: translations_pt.json")
-    args = parser.parse_args()
+    parser.add_argument('--regras', default=DEFAULT_RULES_FILE, help="Arquivo JSON com as regras de filtragem dos arquivos e literais. Padrão: extraction_rules.json")
+    parser.add_argument('--jobs', type=int, default=1, help="Número de processos que analisam arquivos em paralelo. A saída é a mesma para qualquer valor. Padrão: 1")
+    parser.add_argument('--cache', default=CACHE_FILE, help=f"Cache com as strings de cada arquivo, reaproveitadas enquanto o arquivo e as regras não mudam. Padrão: {CACHE_FILE}")
+    parser.add_argument('--sem-cache', action='store_true', help="Analisa todos os arquivos, sem ler nem gravar o cache.")
+    parser.add_argument('--excluir', nargs='*', default=[], help="Arquivos, pastas ou padrões no formato do .gitignore a serem ignorados. Ex: lib/generated 'build/' '*.freezed.dart'")
+    parser.add_argument('--sem-gitignore', action='store_true', help="Não aplica os arquivos .gitignore da pasta e das pastas acima dela.")
+    parser.add_argument('--perfil', action='store_true', help="Mede cada regra (avaliações, rejeições e tempo) e cada arquivo, e mostra um relatório ordenado no final. Mais lento; ignora o cache.")
+    parser.add_argument('--perfil-json', help="Grava o relatório do --perfil neste arquivo JSON (ativa o --perfil).")
+    args = parser.parse_args(argv)
     
-    run_extraction(args.pasta, args.saida)
+    return run_extraction(args.pasta, args.saida, args.regras, args.jobs, None if args.sem_cache else args.cache,
+                          args.excluir, not args.sem_gitignore, args.perfil, args.perfil_json)
+
+# --- EXECUÇÃO FINAL ---
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -2,6 +2,8 @@ import os
 import re
 import json
 
+from dart_lexer import tokenize_literals
+
 BASE_DIR = os.getcwd()
 
 TARGET_DIRS = ['lib']
@@ -13,20 +15,7 @@ extracted_strings = {}
 
 ignoredCount = 0
 
-STRING_REGEX = re.compile(
-    r"""
-    (
-        ['"]
-        (
-            [^'"\n]*?
-            [a-zA-ZáàâãéèêíïóôõúçñÁÀÂÃÉÈÊÍÏÓÔÕÚÇÑ]
-            [^'"\n]*?
-        )
-        ['"]
-    )
-    """,
-    re.VERBOSE
-)
+LETTER_REGEX = re.compile(r'[a-zA-ZáàâãéèêíïóôõúçñÁÀÂÃÉÈÊÍÏÓÔÕÚÇÑ]')
 
 def format_string_to_key(text):
     text = re.sub(r'[^\w\s]', '', text).strip().lower()
@@ -87,11 +76,12 @@ def extract_from_file(filepath):
     with open(filepath, 'r', encoding='utf-8') as f:
         content = f.read()
     
-    matches_iter = STRING_REGEX.finditer(content)
+    for literal in tokenize_literals(content):
+        text_content = literal.content(content)
+        if not LETTER_REGEX.search(text_content):
+            continue
 
-    for match in matches_iter:
-        text_content = match.group(2)
-        start_index = match.start(1)
+        start_index = literal.start
         text = text_content.strip()
 
         # ====================
@@ -0,0 +1,68 @@
+import os
+import json
+import hashlib
+from typing import Any, Dict, Optional
+
+ARQUIVO_MANIFESTO_PADRAO = '.autotranslation-cache.json'
+VERSAO_MANIFESTO = 1
+
+
+def hash_conteudo(conteudo: str) -> str:
+    return hashlib.sha1(conteudo.encode('utf-8')).hexdigest()
+
+
+def hash_objeto(objeto: Any) -> str:
+    """Hash estável de um objeto serializável em JSON (ex: o mapa de substituição)."""
+    serializado = json.dumps(objeto, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hash_conteudo(serializado)
+
+
+def criar_entrada(caminho: str, hash_arquivo: str) -> Dict[str, Any]:
+    info = os.stat(caminho)
+    return {'tamanho': info.st_size, 'mtime_ns': info.st_mtime_ns, 'sha1': hash_arquivo}
+
+
+def stat_inalterado(caminho: str, entrada: Optional[Dict[str, Any]]) -> bool:
+    """Verificação rápida, sem ler o arquivo: mesmo tamanho e mesma data de modificação."""
+    if not entrada:
+        return False
+    try:
+        info = os.stat(caminho)
+    except OSError:
+        return False
+    return info.st_size == entrada.get('tamanho') and info.st_mtime_ns == entrada.get('mtime_ns')
+
+
+def carregar_manifesto(caminho_manifesto: str, hash_referencia: str) -> Dict[str, Dict[str, Any]]:
+    """Retorna as entradas por arquivo, ou um dicionário vazio se o manifesto
+    não existir, estiver corrompido ou tiver sido gerado com outra referência."""
+    try:
+        with open(caminho_manifesto, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (json.JSONDecodeError, OSError) as e:
+        print(f"Aviso: Manifesto '{caminho_manifesto}' ignorado. Erro: {e}")
+        return {}
+
+    if not isinstance(dados, dict) or dados.get('versao') != VERSAO_MANIFESTO:
+        return {}
+    if dados.get('hash_referencia') != hash_referencia:
+        return {}
+
+    return dados.get('arquivos', {})
+
+
+def salvar_manifesto(caminho_manifesto: str, hash_referencia: str, entradas: Dict[str, Dict[str, Any]]):
+    dados = {
+        'versao': VERSAO_MANIFESTO,
+        'hash_referencia': hash_referencia,
+        'arquivos': entradas,
+    }
+    caminho_temporario = f"{caminho_manifesto}.tmp"
+    try:
+        with open(caminho_temporario, 'w', encoding='utf-8') as f:
+            json.dump(dados, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(caminho_temporario, caminho_manifesto)
+    except OSError as e:
+        print(f"Aviso: Não foi possível salvar o manifesto '{caminho_manifesto}'. Erro: {e}")
@@ -0,0 +1,141 @@
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+ARQUIVO_MEMORIA_PADRAO = '.autotranslation-memoria.sqlite'
+
+# Limite de variáveis por consulta nas versões mais antigas do SQLite.
+TAMANHO_CONSULTA = 500
+
+
+def normalizar_texto(texto: str) -> str:
+    # Só NFC: espaços nas pontas fazem parte do valor do .arb, então " Olá " e "Olá"
+    # são entradas diferentes e a tradução de um não serve para o outro.
+    return unicodedata.normalize('NFC', texto)
+
+
+class MemoriaTraducao:
+    """Memória de tradução persistente em SQLite, indexada por
+    (idioma de origem, idioma de destino, texto de origem normalizado)."""
+
+    def __init__(self, caminho: str = ARQUIVO_MEMORIA_PADRAO, max_entradas: Optional[int] = None):
+        self.caminho = caminho
+        self.max_entradas = max_entradas
+        self.acertos = 0
+        self.falhas = 0
+        self._pendentes = 0
+
+        # A mesma memória é compartilhada pelas threads que traduzem vários idiomas.
+        self._trava = threading.RLock()
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self._conexao.execute('PRAGMA journal_mode=WAL')
+        self._conexao.execute('PRAGMA synchronous=NORMAL')
+        self._conexao.execute(
+            """
+            CREATE TABLE IF NOT EXISTS traducoes (
+                idioma_fonte TEXT NOT NULL,
+                idioma_alvo TEXT NOT NULL,
+                texto TEXT NOT NULL,
+                traducao TEXT NOT NULL,
+                ultimo_uso REAL NOT NULL,
+                PRIMARY KEY (idioma_fonte, idioma_alvo, texto)
+            ) WITHOUT ROWID
+            """
+        )
+        self._conexao.execute('CREATE INDEX IF NOT EXISTS idx_traducoes_uso ON traducoes (ultimo_uso)')
+        self._conexao.commit()
+
+    def buscar(self, idioma_fonte: str, idioma_alvo: str, texto: str) -> Optional[str]:
+        return self.buscar_varios(idioma_fonte, idioma_alvo, [texto]).get(texto)
+
+    def buscar_varios(self, idioma_fonte: str, idioma_alvo: str, textos: Iterable[str]) -> Dict[str, str]:
+        """Retorna {texto: tradução} para os textos presentes na memória."""
+        with self._trava:
+            por_normalizado: Dict[str, List[str]] = {}
+            for texto in textos:
+                por_normalizado.setdefault(normalizar_texto(texto), []).append(texto)
+
+            encontrados: Dict[str, str] = {}
+            normalizados = list(por_normalizado)
+            for inicio in range(0, len(normalizados), TAMANHO_CONSULTA):
+                parte = normalizados[inicio:inicio + TAMANHO_CONSULTA]
+                marcadores = ','.join('?' * len(parte))
+                linhas = self._conexao.execute(
+                    f"SELECT texto, traducao FROM traducoes WHERE idioma_fonte = ? AND idioma_alvo = ? AND texto IN ({marcadores})",
+                    [idioma_fonte, idioma_alvo, *parte],
+                ).fetchall()
+                for normalizado, traducao in linhas:
+                    for texto in por_normalizado[normalizado]:
+                        encontrados[texto] = traducao
+
+            if encontrados:
+                agora = time.time()
+                self._conexao.executemany(
+                    "UPDATE traducoes SET ultimo_uso = ? WHERE idioma_fonte = ? AND idioma_alvo = ? AND texto = ?",
+                    [(agora, idioma_fonte, idioma_alvo, normalizar_texto(texto)) for texto in encontrados],
+                )
+                self._conexao.commit()
+
+            quantidade = sum(len(v) for v in por_normalizado.values())
+            self.acertos += len(encontrados)
+            self.falhas += quantidade - len(encontrados)
+            return encontrados
+
+    def gravar(self, idioma_fonte: str, idioma_alvo: str, texto: str, traducao: str):
+        self.gravar_varios(idioma_fonte, idioma_alvo, [(texto, traducao)])
+
+    def gravar_varios(self, idioma_fonte: str, idioma_alvo: str, pares: Iterable[Tuple[str, str]]):
+        with self._trava:
+            agora = time.time()
+            linhas = [(idioma_fonte, idioma_alvo, normalizar_texto(texto), traducao, agora) for texto, traducao in pares]
+            self._conexao.executemany(
+                "INSERT OR REPLACE INTO traducoes (idioma_fonte, idioma_alvo, texto, traducao, ultimo_uso) VALUES (?, ?, ?, ?, ?)",
+                linhas,
+            )
+            # As gravações são confirmadas em blocos para não pagar um fsync por chave.
+            self._pendentes += len(linhas)
+            if self._pendentes >= 100:
+                self._conexao.commit()
+                self._pendentes = 0
+
+    def tamanho(self) -> int:
+        with self._trava:
+            return self._conexao.execute("SELECT COUNT(*) FROM traducoes").fetchone()[0]
+
+    def evictar(self) -> int:
+        """Remove as entradas usadas há mais tempo até respeitar max_entradas.
+        Retorna quantas entradas foram removidas."""
+        with self._trava:
+            if not self.max_entradas:
+                return 0
+            excedente = self.tamanho() - self.max_entradas
+            if excedente <= 0:
+                return 0
+            self._conexao.execute(
+                """
+                DELETE FROM traducoes WHERE (idioma_fonte, idioma_alvo, texto) IN (
+                    SELECT idioma_fonte, idioma_alvo, texto FROM traducoes ORDER BY ultimo_uso LIMIT ?
+                )
+                """,
+                (excedente,),
+            )
+            self._conexao.commit()
+            return excedente
+
+    def taxa_acerto(self) -> float:
+        total = self.acertos + self.falhas
+        return self.acertos / total if total else 0.0
+
+    def fechar(self):
+        with self._trava:
+            self._conexao.commit()
+            self.evictar()
+            self._conexao.close()
+
+    def __enter__(self) -> 'MemoriaTraducao':
+        return self
+
+    def __exit__(self, *_):
+        self.fechar()
@@ -0,0 +1,167 @@
+import json
+import math
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from arquivo_arb import gravar_atomicamente
+
+# Limites superiores (segundos) dos buckets do histograma de latência.
+BUCKETS_LATENCIA = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUANTIS = (0.5, 0.95, 0.99)
+PREFIXO_PROMETHEUS = 'autotranslation'
+
+
+def quantil(ordenados: List[float], q: float) -> float:
+    """Quantil pelo método do posto mais próximo sobre uma lista já ordenada."""
+    if not ordenados:
+        return 0.0
+    return ordenados[max(0, math.ceil(q * len(ordenados)) - 1)]
+
+
+class MetricasTraducao:
+    """Coleta thread-safe das métricas de uma execução de tradução: requisições
+    ao backend e suas latências, caracteres enviados, novas tentativas e
+    limitações. As latências medem só a chamada ao backend, sem a espera do
+    limitador de taxa, que é acumulada à parte."""
+
+    def __init__(self):
+        self.inicio = time.monotonic()
+        self.requisicoes = 0
+        self.requisicoes_com_erro = 0
+        self.valores_traduzidos = 0
+        self.caracteres_traduzidos = 0
+        self.novas_tentativas = 0
+        self.limitacoes = 0
+        self.espera_limitador = 0.0
+        self.espera_novas_tentativas = 0.0
+        self.latencias: List[float] = []
+        self._trava = threading.Lock()
+
+    def registrar_requisicao(self, latencia: float, itens: int, caracteres: int, erro: bool = False):
+        with self._trava:
+            self.requisicoes += 1
+            self.latencias.append(latencia)
+            if erro:
+                self.requisicoes_com_erro += 1
+            else:
+                self.valores_traduzidos += itens
+                self.caracteres_traduzidos += caracteres
+
+    def registrar_nova_tentativa(self, espera: float, limitacao: bool):
+        with self._trava:
+            self.novas_tentativas += 1
+            self.espera_novas_tentativas += espera
+            if limitacao:
+                self.limitacoes += 1
+
+    def registrar_espera_limitador(self, espera: float):
+        with self._trava:
+            self.espera_limitador += espera
+
+    def resumo(self, memoria: Optional[Any] = None, taxa_final: Optional[float] = None) -> Dict[str, Any]:
+        with self._trava:
+            duracao = time.monotonic() - self.inicio
+            ordenadas = sorted(self.latencias)
+            resumo: Dict[str, Any] = {
+                'duracao_segundos': round(duracao, 3),
+                'requisicoes': self.requisicoes,
+                'requisicoes_com_erro': self.requisicoes_com_erro,
+                'requisicoes_por_segundo': round(self.requisicoes / duracao, 3) if duracao else 0.0,
+                'latencia_segundos': {
+                    'media': round(sum(ordenadas) / len(ordenadas), 4) if ordenadas else 0.0,
+                    'maxima': round(ordenadas[-1], 4) if ordenadas else 0.0,
+                    **{f"p{int(q * 100)}": round(quantil(ordenadas, q), 4) for q in QUANTIS},
+                },
+                'valores_traduzidos': self.valores_traduzidos,
+                'caracteres_traduzidos': self.caracteres_traduzidos,
+                'novas_tentativas': self.novas_tentativas,
+                'limitacoes': self.limitacoes,
+                'espera_limitador_segundos': round(self.espera_limitador, 3),
+                'espera_novas_tentativas_segundos': round(self.espera_novas_tentativas, 3),
+                'taxa_final': taxa_final,
+            }
+        if memoria is not None:
+            resumo['memoria'] = {
+                'acertos': memoria.acertos,
+                'falhas': memoria.falhas,
+                'taxa_acerto': round(memoria.taxa_acerto(), 4),
+            }
+        return resumo
+
+    def _histograma(self) -> List[int]:
+        with self._trava:
+            contagens = [0] * len(BUCKETS_LATENCIA)
+            for latencia in self.latencias:
+                for i, limite in enumerate(BUCKETS_LATENCIA):
+                    if latencia <= limite:
+                        contagens[i] += 1
+                        break
+        # Buckets do Prometheus são cumulativos.
+        for i in range(1, len(contagens)):
+            contagens[i] += contagens[i - 1]
+        return contagens
+
+    def texto_prometheus(self, memoria: Optional[Any] = None, taxa_final: Optional[float] = None) -> str:
+        """Métricas no formato de texto do Prometheus, para o textfile collector do node exporter."""
+        resumo = self.resumo(memoria, taxa_final)
+        p = PREFIXO_PROMETHEUS
+        linhas: List[str] = []
+
+        def metrica(nome: str, tipo: str, ajuda: str, amostras: List[str]):
+            linhas.append(f"# HELP {p}_{nome} {ajuda}")
+            linhas.append(f"# TYPE {p}_{nome} {tipo}")
+            linhas.extend(f"{p}_{amostra}" for amostra in amostras)
+
+        metrica('requisicoes_total', 'counter', 'Requisições enviadas ao backend de tradução.', [
+            f'requisicoes_total{{resultado="sucesso"}} {resumo["requisicoes"] - resumo["requisicoes_com_erro"]}',
+            f'requisicoes_total{{resultado="erro"}} {resumo["requisicoes_com_erro"]}',
+        ])
+        metrica('requisicoes_por_segundo', 'gauge', 'Média de requisições por segundo na execução.',
+                [f'requisicoes_por_segundo {resumo["requisicoes_por_segundo"]}'])
+
+        contagens = self._histograma()
+        amostras = [f'latencia_requisicao_segundos_bucket{{le="{limite}"}} {contagem}'
+                    for limite, contagem in zip(BUCKETS_LATENCIA, contagens)]
+        amostras.append(f'latencia_requisicao_segundos_bucket{{le="+Inf"}} {resumo["requisicoes"]}')
+        amostras.append(f'latencia_requisicao_segundos_sum {sum(self.latencias):.6f}')
+        amostras.append(f'latencia_requisicao_segundos_count {resumo["requisicoes"]}')
+        metrica('latencia_requisicao_segundos', 'histogram', 'Latência de cada requisição ao backend.', amostras)
+        metrica('latencia_requisicao_quantil_segundos', 'gauge', 'Quantis da latência das requisições.', [
+            f'latencia_requisicao_quantil_segundos{{quantil="{q}"}} {resumo["latencia_segundos"][f"p{int(q * 100)}"]}'
+            for q in QUANTIS
+        ])
+
+        metrica('valores_traduzidos_total', 'counter', 'Valores devolvidos traduzidos pelo backend.',
+                [f'valores_traduzidos_total {resumo["valores_traduzidos"]}'])
+        metrica('caracteres_traduzidos_total', 'counter', 'Caracteres de origem traduzidos pelo backend.',
+                [f'caracteres_traduzidos_total {resumo["caracteres_traduzidos"]}'])
+        metrica('novas_tentativas_total', 'counter', 'Requisições repetidas após falha transitória.',
+                [f'novas_tentativas_total {resumo["novas_tentativas"]}'])
+        metrica('limitacoes_total', 'counter', 'Respostas de limitação de taxa (HTTP 429).',
+                [f'limitacoes_total {resumo["limitacoes"]}'])
+        metrica('espera_segundos_total', 'counter', 'Tempo parado esperando o limitador ou uma nova tentativa.', [
+            f'espera_segundos_total{{motivo="limitador"}} {resumo["espera_limitador_segundos"]}',
+            f'espera_segundos_total{{motivo="nova_tentativa"}} {resumo["espera_novas_tentativas_segundos"]}',
+        ])
+        metrica('duracao_segundos', 'gauge', 'Duração da execução.', [f'duracao_segundos {resumo["duracao_segundos"]}'])
+
+        if 'memoria' in resumo:
+            metrica('memoria_consultas_total', 'counter', 'Consultas à memória de tradução.', [
+                f'memoria_consultas_total{{resultado="acerto"}} {resumo["memoria"]["acertos"]}',
+                f'memoria_consultas_total{{resultado="falha"}} {resumo["memoria"]["falhas"]}',
+            ])
+            metrica('memoria_taxa_acerto', 'gauge', 'Fração das consultas atendidas pela memória.',
+                    [f'memoria_taxa_acerto {resumo["memoria"]["taxa_acerto"]}'])
+
+        return '\n'.join(linhas) + '\n'
+
+
+def gravar_metricas(metricas: MetricasTraducao, caminho_json: Optional[str] = None, caminho_prometheus: Optional[str] = None,
+                    memoria: Optional[Any] = None, taxa_final: Optional[float] = None):
+    if caminho_json:
+        gravar_atomicamente(caminho_json, json.dumps(metricas.resumo(memoria, taxa_final), ensure_ascii=False, indent=2) + '\n')
+    if caminho_prometheus:
+        # O node exporter pode ler o arquivo a qualquer momento; o rename evita leituras pela metade.
+        gravar_atomicamente(caminho_prometheus, metricas.texto_prometheus(memoria, taxa_final))
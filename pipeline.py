@@ -0,0 +1,365 @@
+import argparse
+import importlib
+import json
+import os
+import queue
+import sys
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from arquivo_arb import caminho_snapshot, entradas_de_texto, gravar_arb, ler_arb, nome_arquivo_idioma
+from extraction_rules import DEFAULT_RULES_FILE, RuleSet
+from limitador import LimitadorTaxa, TradutorLimitado
+from main import mapa_de_substituicao, processar_arquivos_na_pasta
+from main2 import (IDIOMAS_SIMULTANEOS_PADRAO, OpcoesTraducao, TAXA_PADRAO, carregar_json_opcional, criar_limitador,
+                   imprimir_resumo_compartilhado, resolver_simultaneas)
+from main3 import generate_key_from_value
+from memoria_traducao import ARQUIVO_MEMORIA_PADRAO, MemoriaTraducao
+from metricas import MetricasTraducao
+from traducao import LIMITE_CARACTERES_PADRAO, traduzir_valores
+from tradutores import TRADUTORES
+
+# O módulo do extrator tem hífen no nome e não pode ser importado com `import`.
+extrator = importlib.import_module('main4-v2')
+
+# Arquivos já analisados aguardando a geração de chaves. Com a fila cheia, a extração
+# espera, então a memória não cresce se as etapas seguintes forem mais lentas.
+TAMANHO_FILA_ARQUIVOS = 64
+# Valores novos aguardando tradução, por idioma.
+TAMANHO_FILA_TRADUCAO = 2000
+# Cada idioma junta até tantos valores por rodada de tradução, esperando no máximo
+# ESPERA_LOTE segundos por mais valores antes de enviar o que já tem.
+VALORES_POR_RODADA = 200
+ESPERA_LOTE = 0.2
+
+FIM = None
+
+
+class TradutorEmFluxo(threading.Thread):
+    """Traduz para um idioma os pares (chave, valor) que chegam pela fila,
+    em rodadas, enquanto a extração ainda está em andamento.
+
+    Como no main2 --incremental, uma tradução de `existentes` só é mantida se o
+    valor de origem não mudou desde a última execução (`fonte_anterior`, o snapshot
+    gravado ao lado do .arb do idioma); sem snapshot, todas são mantidas."""
+
+    def __init__(self, idioma_alvo: str, idioma_fonte: str, opcoes: OpcoesTraducao, limitador: LimitadorTaxa,
+                 fonte: Dict[str, Any], existentes: Dict[str, Any], fonte_anterior: Optional[Dict[str, Any]] = None,
+                 memoria: Optional[MemoriaTraducao] = None, metricas: Optional[MetricasTraducao] = None,
+                 executor: Optional[Executor] = None):
+        super().__init__(name=f"traducao-{idioma_alvo}", daemon=True)
+        self.idioma_alvo = idioma_alvo
+        self.idioma_fonte = idioma_fonte
+        self.opcoes = opcoes
+        self.memoria = memoria
+        self.executor = executor
+        self.fila: 'queue.Queue[Optional[Tuple[str, str]]]' = queue.Queue(maxsize=TAMANHO_FILA_TRADUCAO)
+        anteriores = dict(entradas_de_texto(existentes))
+        self.traducoes: Dict[str, str] = {
+            chave: anteriores[chave]
+            for chave, valor in entradas_de_texto(fonte)
+            if chave in anteriores and (fonte_anterior is None or fonte_anterior.get(chave) == valor)
+        }
+        self.mantidas = len(self.traducoes)
+        self.traduzidas = 0
+        self.chaves_com_erro: List[str] = []
+        self.falha: Optional[BaseException] = None
+
+        self._classe = TRADUTORES[opcoes.tradutor]
+        self._tradutor = TradutorLimitado(lambda: self._classe(idioma_fonte, idioma_alvo), limitador,
+                                          opcoes.tentativas, metricas=metricas)
+        self._limite_caracteres = min(opcoes.limite_caracteres, self._classe.limite_caracteres)
+        self._prefixo = f"[{idioma_alvo}] "
+        self._alimentador: Optional[threading.Thread] = None
+
+    def enviar(self, chave: str, valor: str):
+        if chave not in self.traducoes:
+            self.fila.put((chave, valor))
+
+    def enviar_em_segundo_plano(self, pares: List[Tuple[str, str]]):
+        """Envia os pares por uma thread própria, para que quem chama não fique
+        bloqueado na fila cheia enquanto o idioma traduz."""
+        def alimentar():
+            for chave, valor in pares:
+                self.enviar(chave, valor)
+        self._alimentador = threading.Thread(target=alimentar, name=f"pendentes-{self.idioma_alvo}", daemon=True)
+        self._alimentador.start()
+
+    def finalizar(self):
+        if self._alimentador:
+            self._alimentador.join()
+        self.fila.put(FIM)
+
+    def _proxima_rodada(self) -> Tuple[List[Tuple[str, str]], bool]:
+        rodada = []
+        item = self.fila.get()
+        while item is not FIM:
+            rodada.append(item)
+            if len(rodada) >= VALORES_POR_RODADA:
+                return rodada, False
+            try:
+                item = self.fila.get(timeout=ESPERA_LOTE)
+            except queue.Empty:
+                return rodada, False
+        return rodada, True
+
+    def run(self):
+        terminou = False
+        while not terminou:
+            rodada, terminou = self._proxima_rodada()
+            # Depois de uma falha a fila continua sendo consumida até o FIM, sem traduzir,
+            # para que quem envia não fique bloqueado na fila cheia.
+            if rodada and self.falha is None:
+                try:
+                    self._traduzir(rodada)
+                except Exception as e:
+                    self.falha = e
+
+    def _traduzir(self, pares: List[Tuple[str, str]]):
+        chaves_por_valor: Dict[str, List[str]] = {}
+        for chave, valor in pares:
+            chaves_por_valor.setdefault(valor, []).append(chave)
+
+        if self.memoria:
+            da_memoria = self.memoria.buscar_varios(self.idioma_fonte, self.idioma_alvo, list(chaves_por_valor))
+            for valor, traducao in da_memoria.items():
+                for chave in chaves_por_valor.pop(valor):
+                    self.traducoes[chave] = traducao
+
+        valores = list(chaves_por_valor)
+        for indice, resultado in traduzir_valores(self._tradutor, valores, self.opcoes.em_lotes, self._limite_caracteres,
+                                                  self.opcoes.simultaneas, self.executor, self._classe.limite_itens):
+            valor = valores[indice]
+            if resultado.erro is not None:
+                for chave in chaves_por_valor[valor]:
+                    self.chaves_com_erro.append(chave)
+                    print(f"{self._prefixo}Erro ao traduzir a chave '{chave}': {resultado.erro}")
+                continue
+            if self.memoria:
+                self.memoria.gravar(self.idioma_fonte, self.idioma_alvo, valor, resultado.traduzido)
+            for chave in chaves_por_valor[valor]:
+                self.traducoes[chave] = resultado.traduzido
+                self.traduzidas += 1
+                if not self.opcoes.silencioso:
+                    print(f"{self._prefixo}'{chave}': '{valor}' -> '{resultado.traduzido}'")
+
+
+def _extrair_arquivos(caminhos: List[str], regras: RuleSet, arquivo_regras: str, jobs: int,
+                      saida: 'queue.Queue[Any]'):
+    """Etapa de extração: envia (caminho, textos) de cada arquivo, na ordem, e FIM no final.
+    Uma exceção é repassada pela fila para ser relançada na thread principal."""
+    try:
+        for caminho, (candidatos, _, _) in zip(caminhos, extrator.iter_files_candidates(caminhos, regras, arquivo_regras, jobs)):
+            saida.put((caminho, [texto for _, texto in candidatos]))
+    except BaseException as e:
+        saida.put(e)
+    saida.put(FIM)
+
+
+def _gravar_depuracao(pasta: str, nome: str, dados: Any):
+    os.makedirs(pasta, exist_ok=True)
+    caminho = os.path.join(pasta, nome)
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(dados, f, ensure_ascii=False, indent=2)
+    print(f"Depuração: '{caminho}' gravado.")
+
+
+def executar_pipeline(pasta: str, caminho_arb: str, idiomas: List[str], idioma_fonte: str,
+                      pasta_saida: Optional[str] = None, opcoes: Optional[OpcoesTraducao] = None,
+                      memoria: Optional[MemoriaTraducao] = None, arquivo_regras: str = DEFAULT_RULES_FILE,
+                      jobs: int = 1, excluir: Optional[List[str]] = None, usar_gitignore: bool = True,
+                      substituir: bool = True, pasta_depuracao: Optional[str] = None) -> bool:
+    """Extrai as strings de `pasta`, gera chaves para as novas no .arb de origem,
+    substitui as strings nos arquivos e traduz o .arb para `idiomas`, tudo no mesmo
+    processo. As traduções começam assim que os primeiros valores novos aparecem,
+    enquanto os arquivos seguintes ainda estão sendo analisados."""
+    opcoes = opcoes or OpcoesTraducao()
+    excluir = excluir or []
+    pasta_saida = pasta_saida or os.path.dirname(caminho_arb)
+
+    if not os.path.isdir(pasta):
+        print(f"Erro: A pasta '{pasta}' não existe.")
+        return False
+    try:
+        regras = RuleSet.load(arquivo_regras)
+    except (OSError, ValueError) as e:
+        print(f"Erro ao carregar as regras de extração: {e}")
+        return False
+
+    # Um .arb de origem que ainda não existe equivale a um vazio; valores já presentes mantêm a chave.
+    arb = ler_arb(caminho_arb, ausente_vazio=True)
+    if arb is None:
+        return False
+    chave_por_valor: Dict[str, str] = {}
+    for chave, valor in entradas_de_texto(arb):
+        chave_por_valor.setdefault(valor, chave)
+    chaves_existentes = set(arb)
+
+    idiomas = [idioma for idioma in dict.fromkeys(idiomas) if idioma != idioma_fonte]
+    arbs_alvo = {}
+    for idioma in idiomas:
+        caminho_alvo = os.path.join(pasta_saida, nome_arquivo_idioma(idioma))
+        existente = ler_arb(caminho_alvo, ausente_vazio=True)
+        if existente is None:
+            return False
+        arbs_alvo[idioma] = (caminho_alvo, existente, carregar_json_opcional(caminho_snapshot(caminho_alvo)))
+
+    caminhos = extrator.list_dart_files(pasta, excluir, usar_gitignore)
+    destino = f" e traduzindo para {', '.join(idiomas)}" if idiomas else ''
+    print(f"Analisando {len(caminhos)} arquivos de '{pasta}'{destino}...")
+    fila_arquivos: 'queue.Queue[Any]' = queue.Queue(maxsize=TAMANHO_FILA_ARQUIVOS)
+    extracao = threading.Thread(target=_extrair_arquivos, args=(caminhos, regras, arquivo_regras, jobs, fila_arquivos),
+                                name='extracao', daemon=True)
+    extracao.start()
+
+    limitador = criar_limitador(opcoes)
+    metricas = MetricasTraducao()
+    pool_traducao = ThreadPoolExecutor(max_workers=max(1, opcoes.simultaneas))
+    tradutores = [
+        TradutorEmFluxo(idioma, idioma_fonte, opcoes, limitador, arb, existente, fonte_anterior, memoria, metricas,
+                        pool_traducao)
+        for idioma, (_, existente, fonte_anterior) in arbs_alvo.items()
+    ]
+    pendentes = list(entradas_de_texto(arb))
+    for tradutor in tradutores:
+        tradutor.start()
+        # Chaves do .arb de origem sem tradução válida no idioma entram junto com as novas.
+        tradutor.enviar_em_segundo_plano(pendentes)
+
+    # Mesmo conteúdo da --saida do main4-v2: todos os textos extraídos, não só os novos.
+    extraidos: Dict[str, str] = {}
+    novas: Dict[str, str] = {}
+    falha: Optional[BaseException] = None
+    try:
+        # Etapa de chaves: cada valor novo ganha uma chave (como no main3 --mesclar)
+        # e segue imediatamente para os tradutores.
+        while True:
+            item = fila_arquivos.get()
+            if item is FIM:
+                break
+            if isinstance(item, BaseException):
+                falha = item
+                continue
+            _, textos = item
+            for texto in textos:
+                if pasta_depuracao:
+                    extrator.add_extracted_string(texto, extraidos)
+                if texto in chave_por_valor:
+                    continue
+                chave = generate_key_from_value(texto, chaves_existentes)
+                if not chave:
+                    continue
+                chave_por_valor[texto] = chave
+                chaves_existentes.add(chave)
+                novas[chave] = texto
+                for tradutor in tradutores:
+                    tradutor.enviar(chave, texto)
+    finally:
+        for tradutor in tradutores:
+            tradutor.finalizar()
+    extracao.join()
+
+    if falha is not None:
+        print(f"Erro na extração: {falha}")
+        for tradutor in tradutores:
+            tradutor.join()
+        pool_traducao.shutdown()
+        return False
+
+    print(f"Extração concluída: {len(novas)} chaves novas, {len(arb)} já existentes em '{caminho_arb}'.")
+    arb.update(novas)
+    if novas or not os.path.exists(caminho_arb):
+        gravar_arb(caminho_arb, arb)
+        print(f".arb de origem salvo em: '{caminho_arb}'")
+
+    sucesso = True
+    # A substituição usa o mapa completo, como o main.py com o .arb final, e roda
+    # enquanto as últimas traduções ainda estão em andamento.
+    if substituir:
+        sucesso = processar_arquivos_na_pasta(pasta, mapa_de_substituicao(arb), ['.dart'], excluir, jobs, None, usar_gitignore)
+
+    for tradutor in tradutores:
+        tradutor.join()
+    pool_traducao.shutdown()
+
+    for tradutor in tradutores:
+        caminho_alvo, _, _ = arbs_alvo[tradutor.idioma_alvo]
+        if tradutor.falha is not None:
+            print(f"Erro ao traduzir para '{tradutor.idioma_alvo}': {tradutor.falha}")
+            sucesso = False
+            continue
+        dados_traduzidos = {chave: tradutor.traducoes.get(chave, valor) for chave, valor in arb.items()}
+        try:
+            gravar_arb(caminho_alvo, dados_traduzidos)
+            # Só entram no snapshot as chaves realmente traduzidas; as que falharam são tentadas de novo.
+            gravar_arb(caminho_snapshot(caminho_alvo), {chave: arb[chave] for chave in tradutor.traducoes if chave in arb})
+        except OSError as e:
+            print(f"Erro ao escrever o arquivo de saída '{caminho_alvo}': {e}")
+            sucesso = False
+            continue
+        print(f"[{tradutor.idioma_alvo}] {tradutor.mantidas} chaves mantidas, {tradutor.traduzidas} traduzidas; "
+              f"arquivo salvo em: '{caminho_alvo}'")
+        if tradutor.chaves_com_erro:
+            print(f"[{tradutor.idioma_alvo}] Aviso: {len(tradutor.chaves_com_erro)} chaves ficaram com o valor original. "
+                  f"Execute novamente para tentar só elas.")
+            sucesso = False
+
+    if pasta_depuracao:
+        _gravar_depuracao(pasta_depuracao, 'extraidos.json', extraidos)
+        _gravar_depuracao(pasta_depuracao, 'chaves_novas.json', novas)
+
+    if idiomas:
+        imprimir_resumo_compartilhado(limitador, memoria, metricas, opcoes)
+    return sucesso
+
+
+def main(argv: Optional[List[str]] = None, prog: Optional[str] = None):
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description="Extrai as strings, gera as chaves, substitui nos arquivos e traduz, num único processo e sem\n"
+                    "arquivos intermediários. As traduções começam enquanto os arquivos ainda estão sendo analisados.",
+        formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument('--pasta', required=True, help="Pasta com os arquivos Dart. Ex: lib")
+    parser.add_argument('--arb', required=True, help="Arquivo .arb de origem; criado se não existir, e só as strings novas ganham chaves.\nEx: lib/l10n/app_pt.arb")
+    parser.add_argument('--idiomas', nargs='*', default=[], help="Idiomas de destino; cada um gera app_<idioma>.arb. Ex: --idiomas en es")
+    parser.add_argument('--fonte', default='auto', help="Código do idioma de origem. Padrão: 'auto'")
+    parser.add_argument('--pasta-saida', help="Pasta dos arquivos app_<idioma>.arb. Padrão: a pasta do --arb")
+    parser.add_argument('--sem-substituir', action='store_true', help="Não altera os arquivos Dart; só atualiza e traduz os .arb.")
+    parser.add_argument('--regras', default=DEFAULT_RULES_FILE, help="Arquivo JSON com as regras de extração. Padrão: extraction_rules.json")
+    parser.add_argument('--jobs', type=int, default=1, help="Processos para a extração e a substituição. Padrão: 1")
+    parser.add_argument('--excluir', nargs='*', default=[], help="Arquivos, pastas ou padrões no formato do .gitignore a serem ignorados.")
+    parser.add_argument('--sem-gitignore', action='store_true', help="Não aplica os arquivos .gitignore.")
+    parser.add_argument('--tradutor', choices=sorted(TRADUTORES), default='google', help="Backend de tradução. Padrão: google")
+    parser.add_argument('--lotes', action='store_true', help="Agrupa vários valores em cada requisição.")
+    parser.add_argument('--limite-caracteres', type=int, default=LIMITE_CARACTERES_PADRAO, help=f"Tamanho máximo de cada requisição em lote. Padrão: {LIMITE_CARACTERES_PADRAO}")
+    parser.add_argument('--simultaneas', type=int, default=None, help=f"Requisições em andamento ao mesmo tempo, no pool que todos os idiomas dividem.\nPadrão: {IDIOMAS_SIMULTANEOS_PADRAO}, como no main2 com --idiomas")
+    parser.add_argument('--taxa', type=float, default=TAXA_PADRAO, help=f"Taxa inicial de requisições por segundo. Padrão: {TAXA_PADRAO}")
+    parser.add_argument('--tentativas', type=int, default=5, help="Tentativas por requisição em falhas transitórias. Padrão: 5")
+    parser.add_argument('--memoria', default=ARQUIVO_MEMORIA_PADRAO, help=f"Memória de tradução (SQLite). Padrão: {ARQUIVO_MEMORIA_PADRAO}")
+    parser.add_argument('--sem-memoria', action='store_true', help="Não consulta nem grava a memória de tradução.")
+    parser.add_argument('--silencioso', action='store_true', help="Não imprime uma linha por chave traduzida.")
+    parser.add_argument('--depurar', metavar='PASTA', help="Grava nesta pasta os artefatos intermediários: extraidos.json, com todas as strings\nextraídas no mesmo formato da --saida do main4-v2, e chaves_novas.json.")
+    args = parser.parse_args(argv)
+
+    opcoes = OpcoesTraducao(
+        em_lotes=args.lotes,
+        limite_caracteres=args.limite_caracteres,
+        simultaneas=resolver_simultaneas(args.simultaneas, IDIOMAS_SIMULTANEOS_PADRAO, bool(args.idiomas)),
+        taxa=args.taxa,
+        tentativas=args.tentativas,
+        tradutor=args.tradutor,
+        silencioso=args.silencioso,
+    )
+    memoria = None if args.sem_memoria or not args.idiomas else MemoriaTraducao(args.memoria)
+    try:
+        return executar_pipeline(args.pasta, args.arb, args.idiomas, args.fonte, args.pasta_saida, opcoes, memoria,
+                                 args.regras, args.jobs, args.excluir, not args.sem_gitignore, not args.sem_substituir,
+                                 args.depurar)
+    finally:
+        if memoria:
+            memoria.fechar()
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,46 @@
+import random
+
+from aho_corasick import AhoCorasick
+from main import criar_automato_de_substituicao, mapa_de_substituicao, substituir_conteudo
+
+
+def substituir_como_no_original(conteudo, mapa):
+    # O laço de str.replace do main.py original, do valor mais longo para o mais curto.
+    substituicoes = 0
+    for valor, chave in mapa.items():
+        alvo = f"'{valor}'"
+        substituicoes += conteudo.count(alvo)
+        conteudo = conteudo.replace(alvo, f'AppLocalizations.of(context)!.{chave}')
+    return conteudo, substituicoes
+
+
+def test_encontrar_gera_ocorrencias_sobrepostas():
+    automato = AhoCorasick(['he', 'she', 'hers'])
+    assert sorted(automato.encontrar('ushers')) == [(1, 4), (2, 4), (2, 6)]
+
+
+def test_automato_vazio():
+    automato = AhoCorasick(['', ''])
+    assert not automato
+    assert list(automato.encontrar('abc')) == []
+    assert not automato.contem_algum('abc')
+
+
+def test_valor_mais_longo_vence_mesmo_mais_a_direita():
+    mapa = mapa_de_substituicao({'k_curto': 'sim', 'k_longo': ' ou '})
+    conteudo = "'sim' ou '"
+    resultado = substituir_conteudo(conteudo, mapa, criar_automato_de_substituicao(mapa))
+    assert resultado == ("'simAppLocalizations.of(context)!.k_longo", 1)
+    assert resultado == substituir_como_no_original(conteudo, mapa)
+
+
+def test_mesmo_resultado_do_laco_original():
+    gerador = random.Random(20240501)
+    alfabeto = "ab' "
+    for _ in range(5000):
+        valores = {''.join(gerador.choice(alfabeto) for _ in range(gerador.randint(1, 5)))
+                   for _ in range(gerador.randint(1, 6))}
+        mapa = mapa_de_substituicao({f"k{indice}": valor for indice, valor in enumerate(sorted(valores))})
+        conteudo = ''.join(gerador.choice(alfabeto) for _ in range(gerador.randint(0, 30)))
+        assert substituir_conteudo(conteudo, mapa, criar_automato_de_substituicao(mapa)) == \
+            substituir_como_no_original(conteudo, mapa), (conteudo, mapa)
@@ -0,0 +1,159 @@
+import json
+import os
+
+import pytest
+
+from arquivo_arb import caminho_snapshot
+from catalogo import CatalogoTraducoes, main
+
+
+def escrever(caminho, dados):
+    caminho.write_text(json.dumps(dados, ensure_ascii=False, indent=2), encoding='utf-8')
+    return str(caminho)
+
+
+def ler(caminho):
+    with open(caminho, encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def projeto(tmp_path):
+    pasta = tmp_path / 'l10n'
+    pasta.mkdir()
+    fonte = escrever(pasta / 'app_pt.arb', {
+        '@@locale': 'pt', 'ola': 'Olá', '@ola': {'description': 'saudação'}, 'sair': 'Sair'})
+    # Sem @@locale: o idioma vem do nome do arquivo.
+    alvo = escrever(pasta / 'app_en.arb', {'ola': 'Hello', 'sair': 'Exit'})
+    catalogo = CatalogoTraducoes(str(tmp_path / 'catalogo.sqlite'))
+    catalogo.idioma_fonte = 'pt'
+    yield catalogo, fonte, alvo, pasta
+    catalogo.fechar()
+
+
+def test_traducoes_sem_snapshot_ficam_pendentes(projeto):
+    catalogo, fonte, alvo, _ = projeto
+    assert catalogo.importar_arb(fonte) == 3
+    assert catalogo.importar_arb(alvo) == 2
+
+    assert catalogo.pendentes('en') == [('ola', 'Olá'), ('sair', 'Sair')]
+    assert catalogo.valores_da_chave('ola') == {'en': 'Hello', 'pt': 'Olá'}
+
+
+def test_snapshot_indica_de_qual_fonte_cada_traducao_foi_feita(projeto):
+    catalogo, fonte, alvo, _ = projeto
+    with open(caminho_snapshot(alvo), 'w', encoding='utf-8') as f:
+        json.dump({'ola': 'Olá', 'sair': 'Sair antigo'}, f)
+    catalogo.importar_arb(fonte)
+    catalogo.importar_arb(alvo)
+
+    assert catalogo.pendentes('en') == [('sair', 'Sair')]
+
+    catalogo.definir('pt', {'ola': 'Oi'})
+    assert catalogo.pendentes('en') == [('ola', 'Oi'), ('sair', 'Sair')]
+
+    # Uma tradução definida depois da fonte guarda o hash do valor atual.
+    catalogo.definir('en', {'ola': 'Hi', 'sair': 'Leave'})
+    assert catalogo.pendentes('en') == []
+
+
+def test_importar_arquivo_inalterado_nao_o_relê(projeto):
+    catalogo, fonte, _, _ = projeto
+    assert catalogo.importar_arb(fonte) == 3
+    assert catalogo.importar_arb(fonte) is None
+
+    # Só a data de modificação mudou: o conteúdo é o mesmo.
+    info = os.stat(fonte)
+    os.utime(fonte, ns=(info.st_atime_ns, info.st_mtime_ns + 10 ** 9))
+    assert catalogo.importar_arb(fonte) is None
+    assert catalogo.importar_arb(fonte, forcar=True) == 0
+
+
+def test_exportar_reescreve_so_os_idiomas_alterados(projeto):
+    catalogo, fonte, alvo, _ = projeto
+    catalogo.importar_arb(fonte)
+    catalogo.importar_arb(alvo)
+    assert catalogo.exportar() == []
+
+    catalogo.definir('en', {'novo': 'New'})
+    assert catalogo.exportar() == [os.path.abspath(alvo)]
+    assert list(ler(alvo).items()) == [('ola', 'Hello'), ('sair', 'Exit'), ('novo', 'New')]
+    assert catalogo.exportar() == []
+
+    # O arquivo de origem volta com os metadados logo após a chave.
+    assert catalogo.exportar(forcar=True, idiomas=['pt']) == [os.path.abspath(fonte)]
+    assert list(ler(fonte)) == ['@@locale', 'ola', '@ola', 'sair']
+
+
+def test_exportar_mtime_alterado_nao_reescreve(projeto):
+    catalogo, fonte, _, _ = projeto
+    catalogo.importar_arb(fonte)
+    info = os.stat(fonte)
+    os.utime(fonte, ns=(info.st_atime_ns, info.st_mtime_ns + 10 ** 9))
+
+    assert catalogo.exportar() == []
+    assert os.stat(fonte).st_mtime_ns == info.st_mtime_ns + 10 ** 9
+
+
+def test_exportar_nao_sobrescreve_edicoes_externas(projeto, capsys):
+    catalogo, fonte, alvo, _ = projeto
+    catalogo.importar_arb(fonte)
+    catalogo.importar_arb(alvo)
+    catalogo.definir('en', {'ola': 'Hi'})
+    editado = {'ola': 'Hey', 'sair': 'Exit'}
+    with open(alvo, 'w', encoding='utf-8') as f:
+        json.dump(editado, f)
+    os.utime(alvo, ns=(0, 10 ** 9))
+
+    assert catalogo.exportar() == []
+    assert 'alterado fora do catálogo' in capsys.readouterr().out
+    assert ler(alvo) == editado
+    assert catalogo.exportar(forcar=True) != []
+    assert ler(alvo)['ola'] == 'Hi'
+
+
+def test_exportar_para_outra_pasta_so_grava_uma_vez(projeto, tmp_path):
+    catalogo, fonte, alvo, _ = projeto
+    catalogo.importar_arb(fonte)
+    catalogo.importar_arb(alvo)
+    destino = tmp_path / 'saida'
+    destino.mkdir()
+
+    gravados = catalogo.exportar(str(destino))
+    assert sorted(os.path.basename(caminho) for caminho in gravados) == ['app_en.arb', 'app_pt.arb']
+    assert catalogo.exportar(str(destino)) == []
+
+
+def test_idioma_sem_arquivo_vai_para_a_pasta_da_fonte(projeto):
+    catalogo, fonte, _, pasta = projeto
+    catalogo.importar_arb(fonte)
+    catalogo.definir('de', {'ola': 'Hallo'})
+
+    assert catalogo.exportar() == [os.path.abspath(str(pasta / 'app_de.arb'))]
+    assert ler(str(pasta / 'app_de.arb')) == {'ola': 'Hallo'}
+
+
+def test_remover(projeto):
+    catalogo, fonte, alvo, _ = projeto
+    catalogo.importar_arb(fonte)
+    catalogo.importar_arb(alvo)
+    catalogo.remover(['ola'])
+
+    assert catalogo.valores_da_chave('ola') == {}
+    assert catalogo.exportar() == sorted([os.path.abspath(alvo), os.path.abspath(fonte)])
+    assert ler(fonte) == {'@@locale': 'pt', 'sair': 'Sair'}
+
+
+def test_comandos_retornam_o_status(tmp_path, capsys):
+    banco = str(tmp_path / 'catalogo.sqlite')
+    fonte = escrever(tmp_path / 'app_pt.arb', {'ola': 'Olá'})
+    quebrado = tmp_path / 'app_en.arb'
+    quebrado.write_text('{"ola": ', encoding='utf-8')
+
+    assert main(['--catalogo', banco, 'importar']) is False
+    assert main(['--catalogo', banco, 'pendentes']) is False
+    assert main(['--catalogo', banco, 'importar', '--fonte', 'pt', fonte, str(quebrado)]) is False
+    assert main(['--catalogo', banco, 'definir', '--idioma', 'en', 'ola']) is False
+    assert main(['--catalogo', banco, 'definir', '--idioma', 'en', 'ola', 'Hello']) is True
+    assert main(['--catalogo', banco, 'pendentes', '--detalhes']) is True
+    assert 'en: 0 chaves pendentes' in capsys.readouterr().out
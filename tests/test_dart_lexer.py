@@ -0,0 +1,81 @@
+from dart_lexer import tokenize_literals
+
+
+def conteudos(source):
+    return [literal.content(source) for literal in tokenize_literals(source)]
+
+
+def test_aspas_simples_e_duplas():
+    source = """Text('Olá'); print("mundo");"""
+    literais = list(tokenize_literals(source))
+    assert [literal.content(source) for literal in literais] == ['Olá', 'mundo']
+    assert [literal.quote for literal in literais] == ["'", '"']
+    assert source[literais[0].start:literais[0].end] == "'Olá'"
+
+
+def test_comentarios_sao_ignorados():
+    source = """
+    // Text('linha')
+    /* Text('bloco') /* 'aninhado' */ 'ainda comentário' */
+    Text('código');
+    """
+    assert conteudos(source) == ['código']
+
+
+def test_aspas_escapadas():
+    source = r"""Text('it\'s'); Text("diz \"oi\"");"""
+    assert conteudos(source) == [r"it\'s", r'diz \"oi\"']
+
+
+def test_string_raw():
+    source = r"""final a = r'C:\pasta\'; final b = R"$nome";"""
+    literais = list(tokenize_literals(source))
+    assert [literal.content(source) for literal in literais] == ['C:\\pasta\\', '$nome']
+    assert all(literal.raw for literal in literais)
+    assert all(not any(segmento.interpolation for segmento in literal.segments) for literal in literais)
+    assert source[literais[0].start] == 'r'
+
+
+def test_r_no_fim_de_um_identificador_nao_e_raw():
+    source = "var r = 1; Text(ler'x');"
+    literal, = tokenize_literals(source)
+    assert not literal.raw
+    assert literal.content(source) == 'x'
+
+
+def test_strings_triplas_e_multilinha():
+    source = "Text('''linha 1\n'linha' 2'''); Text(\"\"\"a \"b\" c\"\"\");"
+    literais = list(tokenize_literals(source))
+    assert [literal.content(source) for literal in literais] == ["linha 1\n'linha' 2", 'a "b" c']
+    assert [literal.quote for literal in literais] == ["'''", '"""']
+
+
+def test_string_nao_terminada_e_descartada_na_quebra_de_linha():
+    source = "Text('sem fim\nText('ok');"
+    assert conteudos(source) == ['ok']
+
+
+def test_interpolacoes():
+    source = "Text('Olá $nome, você tem ${itens.length} itens');"
+    literal, = tokenize_literals(source)
+    partes = [(segmento.interpolation, source[segmento.start:segmento.end]) for segmento in literal.segments]
+    assert partes == [
+        (False, 'Olá '), (True, '$nome'), (False, ', você tem '),
+        (True, '${itens.length}'), (False, ' itens'),
+    ]
+
+
+def test_literais_dentro_de_interpolacoes_saem_antes_do_externo():
+    source = "Text('a ${mapa['chave'] ?? \"${x ? 'b' : 'c'}\"} d');"
+    literais = list(tokenize_literals(source))
+    assert [(literal.content(source), literal.depth) for literal in literais] == [
+        ('chave', 1), ('b', 2), ('c', 2), ('${x ? \'b\' : \'c\'}', 1),
+        ('a ${mapa[\'chave\'] ?? "${x ? \'b\' : \'c\'}"} d', 0),
+    ]
+
+
+def test_chaves_de_blocos_dentro_de_interpolacao():
+    source = "Text('${() { return 'x'; }()}'); Text('depois');"
+    assert [(literal.content(source), literal.depth) for literal in tokenize_literals(source)] == [
+        ('x', 1), ("${() { return 'x'; }()}", 0), ('depois', 0),
+    ]
@@ -0,0 +1,96 @@
+import json
+import os
+from dataclasses import replace
+
+from diario import DiarioTraducao, caminho_diario
+from limitador import LimitadorTaxa
+from main2 import OpcoesTraducao, traduzir_dados_arb
+from tradutores import TRADUTORES
+
+
+class NotValidPayload(Exception):
+    pass
+
+
+class TradutorDeTeste:
+    """Traduz para maiúsculas, registra os textos recebidos e falha nos de `falhar`."""
+
+    nome = 'teste'
+    limite_caracteres = 5000
+    limite_itens = 100
+    taxa_maxima = None
+    recebidos = []
+    falhar = set()
+
+    def __init__(self, idioma_fonte, idioma_alvo):
+        pass
+
+    def translate(self, texto):
+        TradutorDeTeste.recebidos.append(texto)
+        if texto in TradutorDeTeste.falhar:
+            raise NotValidPayload(texto)
+        return texto.upper()
+
+    def translate_batch(self, textos):
+        return [self.translate(texto) for texto in textos]
+
+
+def test_retomar_le_as_traducoes_e_ignora_linha_truncada(tmp_path):
+    saida = str(tmp_path / 'app_en.arb')
+    diario = DiarioTraducao(saida)
+    diario.registrar('a', 'um', 'one')
+    diario.registrar('b', 'dois', 'two')
+    diario._arquivo.close()
+    with open(caminho_diario(saida), 'a', encoding='utf-8') as f:
+        f.write('["c", "tr')
+
+    retomado = DiarioTraducao(saida, retomar=True)
+    assert retomado.entradas == {'a': ('um', 'one'), 'b': ('dois', 'two')}
+    # Uma chave cujo valor de origem mudou não é reaproveitada.
+    assert retomado.traducoes_validas({'a': 'um', 'b': 'dois alterado'}) == {'a': 'one'}
+    retomado.remover()
+    assert not os.path.exists(caminho_diario(saida))
+
+
+def test_sem_retomar_comeca_vazio(tmp_path):
+    saida = str(tmp_path / 'app_en.arb')
+    DiarioTraducao(saida).registrar('a', 'um', 'one')
+    assert DiarioTraducao(saida).entradas == {}
+
+
+def test_compacta_so_as_linhas_substituidas(tmp_path):
+    saida = str(tmp_path / 'app_en.arb')
+    diario = DiarioTraducao(saida, intervalo_compactacao=10)
+    for indice in range(100):
+        diario.registrar(f'chave{indice}', 'fonte', 'tradução')
+    for rodada in range(25):
+        diario.registrar('chave0', 'fonte', f'tradução {rodada}')
+    diario._arquivo.flush()
+    with open(diario.caminho, 'r', encoding='utf-8') as f:
+        linhas = f.readlines()
+    assert len(linhas) < 100 + 10
+    diario.fechar()
+    assert DiarioTraducao(saida, retomar=True).entradas['chave0'] == ('fonte', 'tradução 24')
+
+
+def test_resume_recupera_depois_de_uma_requisicao_com_falha(tmp_path, monkeypatch):
+    monkeypatch.setitem(TRADUTORES, TradutorDeTeste.nome, TradutorDeTeste)
+    monkeypatch.setattr(TradutorDeTeste, 'recebidos', [])
+    monkeypatch.setattr(TradutorDeTeste, 'falhar', {'dois'})
+    saida = str(tmp_path / 'app_en.arb')
+    fonte = {'a': 'um', 'b': 'dois', 'c': 'três', '@a': {'description': 'x'}}
+    opcoes = OpcoesTraducao(tradutor=TradutorDeTeste.nome, tentativas=1, silencioso=True)
+
+    assert not traduzir_dados_arb(fonte, saida, 'en', 'pt', opcoes, LimitadorTaxa(None))
+    with open(saida, 'r', encoding='utf-8') as f:
+        assert json.load(f) == {'a': 'UM', 'b': 'dois', 'c': 'TRÊS', '@a': {'description': 'x'}}
+    assert os.path.exists(caminho_diario(saida))
+
+    TradutorDeTeste.recebidos.clear()
+    TradutorDeTeste.falhar.clear()
+    assert traduzir_dados_arb(fonte, saida, 'en', 'pt', replace(opcoes, retomar=True), LimitadorTaxa(None))
+    # Só a chave que falhou volta para o tradutor.
+    assert TradutorDeTeste.recebidos == ['dois']
+    with open(saida, 'r', encoding='utf-8') as f:
+        assert json.load(f) == {'a': 'UM', 'b': 'DOIS', 'c': 'TRÊS', '@a': {'description': 'x'}}
+    assert not os.path.exists(caminho_diario(saida))
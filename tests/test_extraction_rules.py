@@ -0,0 +1,183 @@
+import random
+import re
+
+import pytest
+
+from extraction_rules import RuleProfile, RuleSet, keywords_first_chars, keywords_pattern, with_first_char_filter
+
+UPPERCASE_WHITELIST = ['PAR-Q', 'ANT+', 'DESAFIO', 'SALVAR', 'PUBLICAR', 'CNPJ', 'CPF', 'ABC?']
+
+
+def rejected_like_the_original(text, pre_text):
+    # The filter chain main4-v2.py had hard-coded before extraction_rules.json.
+    lower = text.lower()
+    return bool(
+        'dart' in text
+        or (re.search(r'(log|print|debugPrint|logEvent)\s*\(\s*', pre_text) and 'alog' not in pre_text)
+        or re.search(r'(inspectWithMessage|inspectWithMessageAndTrace|logger.e)\s*\(\s*', pre_text)
+        or re.search(r'(logInfo|logWarning)\s*\(\s*title\s*:\s*', pre_text)
+        or ('_' in text and (text.isupper() or text.islower()))
+        or (not re.search(r'[áàâãéèêíïóôõúçñÁÀÂÃÉÈÊÍÏÓÔÕÚÇÑ]', text) and re.search(r'^[a-z].*[A-Z]', text) and ' ' not in text)
+        or (text.startswith('$') and ' ' not in text)
+        or 'substring' in text
+        or (not any(letter.islower() for letter in text) and len(text) > 3 and not any(word in text for word in UPPERCASE_WHITELIST))
+        or (re.search(r'(get)\s*\(\s*', pre_text) and 'dget' not in pre_text and 'title' not in pre_text)
+        or any(word in text for word in ['.dart', '.onError', '.json', '.png', '.svg', 'jpeg'])
+        or re.search(r'[A-Z][a-zA-Z]*\(.+?\$[a-zA-Z]', text)
+        or any(re.search(rf'({word})\s*\[\s*', pre_text) for word in
+               ['json', 'map', 'data', 'value', 'postBody', 'queryParameters', 'reqBody', 'updateData', 'memberData'])
+        or re.search(r'(collection)\s*\(\s*', pre_text) or re.search(r'(where)\s*\(\s*', pre_text)
+        or (re.search(r'\[\s*$', pre_text) and ' ' not in text
+            and not any(word in text for word in ['Janeiro', 'Início', 'Semanalmente', 'Péssimo'])
+            and 'lowerCase' not in pre_text and 'upperCase' not in pre_text)
+        or any(word in text for word in ['Unable', 'Failed', 'Error', '_getIndividualZonePercentageFromTotalTime'])
+        or 'user ' in lower
+        or any(word in text for word in ['Invalid', 'Unknown', 'parse', 'session', 'found', '.env', ' error',
+                                         'unauthorized', 'missing', 'failed'])
+        or (' text ' in lower and 'cm.' not in text)
+        or any(word in text for word in ['default', 'Could', '?.duration.inSeconds', 'Notifications',
+                                         'assets', 'signup', 'rovide', 'ercent', 'Missing', 'invalid'])
+        or ('the' in lower and 'anos' not in text)
+        or any(word in text for word in ['newStatus', 'returned', 'vsfFDPBurro', '2346789bcdfghjkmnpqrtwxyz',
+                                         'path', 'leadingHashSign', 'json', 'questions', 'christmas'])
+    )
+
+
+TEXTS = [
+    'Olá, mundo', 'Salvar', 'SALVAR', 'CPF', 'ABCD', 'MAX_VALUE', 'user_id', 'userName', 'Olá ${nome}',
+    '$nome', '${valor}', 'package:app/main.dart', 'icone.png', 'Unable to load', 'Invalid user ', 'The end',
+    'Nathan', 'Trinta anos the', 'medida em cm. e o text aqui', 'um text simples', 'Widget(a: $b)',
+    'substring', 'Janeiro', 'Péssimo', 'Semanalmente', 'valor', 'Início rápido', 'açãoX', 'aB', 'a b C',
+    'ANT+', 'PAR-Q!', '1234', 'Default', 'default', 'json', 'Meu path', 'Questão', 'Próximo passo',
+]
+CONTEXTS = [
+    '', 'Text(', 'print(', 'debugPrint(  ', 'dialog(', 'log(', 'logInfo(title: ', 'inspectWithMessage(',
+    'json[', 'data [ ', 'map[', 'widget.get(', 'widget.dget(', 'get(title, ', 'collection(', 'where (',
+    'cores[', 'lowerCase[', 'labels[ ', 'Text(texto: ', 'getValue(', 'values[', "Text('a' + ",
+]
+
+
+@pytest.fixture(scope='module')
+def rules():
+    return RuleSet.load()
+
+
+def test_default_rules_match_the_original_filters(rules):
+    for text in TEXTS:
+        for context in CONTEXTS:
+            assert (rules.rejecting_rule(text, context) is not None) == rejected_like_the_original(text, context), (text, context)
+
+
+def test_profiled_mode_rejects_the_same_literals(rules):
+    profile = RuleProfile()
+    for text in TEXTS:
+        for context in CONTEXTS:
+            fast = rules.rejecting_rule(text, context)
+            profiled = rules.rejecting_rule_profiled(text, context, profile)
+            assert (fast is None) == (profiled is None), (text, context)
+    assert set(profile.rules) <= set(rules.rule_names)
+    assert sum(rejections for _, rejections, _ in profile.rules.values()) == sum(
+        rules.rejecting_rule(text, context) is not None for text in TEXTS for context in CONTEXTS)
+
+
+def test_keywords_first_chars():
+    assert keywords_first_chars(['abc', 'abd', 'x']) == {'a', 'x'}
+    assert keywords_first_chars(['abc', '']) is None
+    assert keywords_first_chars([]) is None
+    assert with_first_char_filter('ab', None) == 'ab'
+
+
+def test_keyword_trie_with_filter_finds_the_same_matches():
+    generator = random.Random(17)
+    alphabet = 'ab.-]^\\ '
+    for _ in range(2000):
+        keywords = [''.join(generator.choice(alphabet) for _ in range(generator.randint(1, 4)))
+                    for _ in range(generator.randint(1, 5))]
+        text = ''.join(generator.choice(alphabet) for _ in range(generator.randint(0, 12)))
+        plain = re.compile(keywords_pattern(keywords))
+        filtered = re.compile(with_first_char_filter(keywords_pattern(keywords), keywords_first_chars(keywords)))
+        positions = [i for i in range(len(text)) if any(text.startswith(keyword, i) for keyword in keywords)]
+
+        assert [m.span() for m in plain.finditer(text)] == [m.span() for m in filtered.finditer(text)]
+        match = filtered.search(text)
+        assert (match.start() if match else None) == (positions[0] if positions else None)
+        if match:
+            # At the leftmost match the trie prefers the longest keyword.
+            assert match.group() == max((k for k in keywords if text.startswith(k, match.start())), key=len)
+
+
+@pytest.mark.parametrize('rule', [
+    {'name': 'optional_prefix', 'text_regex': 'a{,3}b'},
+    {'name': 'optional_prefix', 'text_regex': 'a{,3}b', 'unless_text_contains': ['zzz']},
+    {'name': 'optional_prefix', 'text_regex': '(?:x)?b|c*b'},
+])
+def test_regex_rules_match_at_any_first_char(rule):
+    rules = RuleSet({'literals': [rule]})
+    assert rules.rejecting_rule('b', '') == 'optional_prefix'
+    assert rules.rejecting_rule('  aab', '') == 'optional_prefix'
+    assert rules.rejecting_rule('nada', '') is None
+
+
+def test_shared_keyword_is_reported_for_the_first_rule():
+    rules = RuleSet({'literals': [
+        {'name': 'primeira', 'text_contains': ['Error', 'Falha']},
+        {'name': 'segunda', 'text_contains': ['Falha', 'Erro']},
+        {'name': 'minusculas', 'text_contains_lower': ['aviso']},
+    ]})
+    assert rules.rejecting_rule('Falha ao salvar', '') == 'primeira'
+    assert rules.rejecting_rule('Erro', '') == 'segunda'
+    assert rules.rejecting_rule('AVISO', '') == 'minusculas'
+    assert rules.rejecting_rule('Tudo certo', '') is None
+
+
+def test_composite_rule_needs_every_condition():
+    rules = RuleSet({'literals': [
+        {'name': 'chave', 'context_regex': r'\[\s*$', 'unless_text_contains': [' '], 'unless_context_contains': ['lowerCase']},
+    ]})
+    assert rules.rejecting_rule('id', 'json[') == 'chave'
+    assert rules.rejecting_rule('com espaço', 'json[') is None
+    assert rules.rejecting_rule('id', 'lowerCase[') is None
+    assert rules.rejecting_rule('id', 'Text(') is None
+
+
+@pytest.mark.parametrize('rule', [
+    {'name': 'r', 'text_has': ['x']},
+    {'name': 'r', 'unless_text_contains': ['x']},
+    {'name': 'r', 'text_regex': '('},
+    {'name': 'r', 'text_regex': '(', 'unless_text_contains': ['x']},
+    {'name': 'r', 'text_contains': 'xy', 'unless_text_contains': ['y']},
+    {'name': 'r', 'text_contains': 'xy'},
+    {'name': 'r', 'text_startswith': '$'},
+    {'name': 'r', 'context_regex': ['x']},
+])
+def test_invalid_rules_are_rejected(rule):
+    with pytest.raises(ValueError):
+        RuleSet({'literals': [rule]})
+
+
+def test_skip_file(rules):
+    assert rules.skip_file('lib/models/user.g.dart')
+    assert rules.skip_file('lib/firebase_options.dart')
+    assert rules.skip_file('lib/main.dart')
+    assert rules.skip_file('lib/packages/moovz_commons/src/repositories/outro.dart')
+    assert not rules.skip_file('lib/packages/moovz_commons/src/repositories/HeartRateZoneModelData.dart')
+    assert not rules.skip_file('lib/screens/home.dart')
+
+
+def test_profile_merge_and_report():
+    first, second = RuleProfile(), RuleProfile()
+    first.record_rule('a', 0.5, True)
+    second.record_rule('a', 0.25, False)
+    second.record_rule('b', 1.0, True)
+    second.record_file('lib/x.dart', 0.1, 3, 2)
+    second.skipped_files = 1
+    first.merge(second)
+
+    report = first.to_dict()
+    assert report['rules'] == [
+        {'rule': 'b', 'evaluations': 1, 'rejections': 1, 'seconds': 1.0},
+        {'rule': 'a', 'evaluations': 2, 'rejections': 1, 'seconds': 0.75},
+    ]
+    assert report['totals']['literals'] == 3 and report['totals']['extracted'] == 2
+    assert report['totals']['skipped_files'] == 1
+    assert 'lib/x.dart' in first.table()
@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from importar_memoria import carregar_arb, idioma_do_arb, importar_pares_arb
+from memoria_traducao import MemoriaTraducao
+
+
+def escrever(caminho, conteudo):
+    caminho.write_text(conteudo if isinstance(conteudo, str) else json.dumps(conteudo), encoding='utf-8')
+    return str(caminho)
+
+
+@pytest.mark.parametrize('conteudo', ['{"a": "b"', '{"a": "b",}', '{"a" "b"}', '', '{"a": "b"} x'])
+def test_carregar_arb_rejeita_json_invalido(tmp_path, conteudo):
+    with pytest.raises(ValueError):
+        carregar_arb(escrever(tmp_path / 'app_de.arb', conteudo))
+
+
+def test_carregar_arb_rejeita_o_que_nao_e_objeto(tmp_path):
+    with pytest.raises(ValueError):
+        carregar_arb(escrever(tmp_path / 'app_de.arb', ['a', 'b']))
+
+
+@pytest.mark.parametrize('nome, idioma', [
+    ('app_pt.arb', 'pt'),
+    ('app_de.arb', 'de'),
+    ('my_app_de.arb', 'de'),
+    ('v1-en.arb', 'en'),
+    ('app_zh_CN.arb', 'zh-CN'),
+    ('l10n_app_en_US.arb', 'en-US'),
+    ('app_zh_Hant.arb', 'zh-Hant'),
+    ('intl_fil.arb', 'fil'),
+    ('strings.arb', None),
+])
+def test_idioma_do_nome(tmp_path, nome, idioma):
+    assert idioma_do_arb(escrever(tmp_path / nome, {'ola': 'x'})) == idioma
+
+
+def test_locale_do_arquivo_tem_precedencia_sobre_o_nome(tmp_path):
+    dados = {'ola': 'Hallo', '@@locale': 'pt_BR'}
+    caminho = escrever(tmp_path / 'app_de.arb', dados)
+
+    assert idioma_do_arb(caminho) == 'pt-BR'
+    assert idioma_do_arb(caminho, dados) == 'pt-BR'
+
+
+def test_importar_pares_arb_une_pela_chave(tmp_path, capsys):
+    fonte = escrever(tmp_path / 'app_pt.arb', {'@@locale': 'pt', 'ola': 'Olá', 'sair': 'Sair', 'vazio': ' ', '@ola': {}})
+    de = escrever(tmp_path / 'app_de.arb', {'ola': 'Hallo', 'sair': 'Beenden', 'orfa': 'Waise', '@ola': {}})
+    quebrado = escrever(tmp_path / 'app_fr.arb', '{"ola": ')
+    sem_idioma = escrever(tmp_path / 'strings.arb', {'ola': 'Hi'})
+
+    with MemoriaTraducao(str(tmp_path / 'memoria.db')) as memoria:
+        importados = importar_pares_arb(memoria, fonte, 'pt', [fonte, de, quebrado, sem_idioma])
+
+        assert importados == {'de': 2}
+        assert memoria.buscar('pt', 'de', 'Olá') == 'Hallo'
+        assert memoria.buscar('pt', 'de', 'Sair') == 'Beenden'
+        assert memoria.tamanho() == 2
+
+    saida = capsys.readouterr().out
+    assert "Não foi possível ler" in saida and 'app_fr.arb' in saida
+    assert "Não foi possível identificar o idioma" in saida
+
+
+def test_importar_pares_arb_com_fonte_invalida(tmp_path, capsys):
+    fonte = escrever(tmp_path / 'app_pt.arb', '[1, 2]')
+    de = escrever(tmp_path / 'app_de.arb', {'ola': 'Hallo'})
+
+    with MemoriaTraducao(str(tmp_path / 'memoria.db')) as memoria:
+        assert importar_pares_arb(memoria, fonte, 'pt', [de]) == {}
+        assert memoria.tamanho() == 0
+    assert "Erro: Não foi possível ler o .arb de origem" in capsys.readouterr().out
@@ -0,0 +1,100 @@
+import time
+
+import pytest
+
+from limitador import LimitadorTaxa, TradutorLimitado, eh_limitacao
+
+
+class TooManyRequests(Exception):
+    pass
+
+
+class NotValidPayload(Exception):
+    pass
+
+
+class TradutorComFalhas:
+    """Levanta os erros da lista, um por chamada, e depois traduz."""
+
+    def __init__(self, erros):
+        self.erros = list(erros)
+        self.chamadas = 0
+
+    def translate(self, texto):
+        self.chamadas += 1
+        if self.erros:
+            raise self.erros.pop(0)
+        return texto.upper()
+
+
+def test_sem_taxa_nao_limita():
+    limitador = LimitadorTaxa(None)
+    inicio = time.monotonic()
+    for _ in range(1000):
+        limitador.adquirir()
+    limitador.registrar_sucesso()
+    limitador.registrar_limitacao()
+    assert time.monotonic() - inicio < 0.5
+    assert limitador.taxa is None
+    assert limitador.limitacoes == 1
+
+
+def test_token_bucket_respeita_a_taxa():
+    limitador = LimitadorTaxa(20.0)
+    inicio = time.monotonic()
+    for _ in range(11):
+        limitador.adquirir()
+    # O primeiro token está disponível de imediato; os outros dez chegam a 20 por segundo.
+    assert time.monotonic() - inicio >= 0.45
+
+
+def test_aimd_soma_no_sucesso_e_corta_uma_vez_por_intervalo():
+    limitador = LimitadorTaxa(4.0, taxa_minima=1.0, taxa_maxima=4.5, incremento=0.25, intervalo_reducao=60)
+    limitador.registrar_sucesso()
+    limitador.registrar_sucesso()
+    limitador.registrar_sucesso()
+    assert limitador.taxa == 4.5
+
+    limitador.registrar_limitacao()
+    limitador.registrar_limitacao()
+    assert limitador.taxa == 2.25
+    assert limitador.limitacoes == 2
+
+
+def test_reducao_respeita_a_taxa_minima():
+    limitador = LimitadorTaxa(1.0, taxa_minima=0.8, intervalo_reducao=0)
+    limitador.registrar_limitacao()
+    assert limitador.taxa == 0.8
+
+
+def test_eh_limitacao():
+    assert eh_limitacao(TooManyRequests())
+    assert eh_limitacao(Exception("HTTP 429"))
+    assert eh_limitacao(Exception("Too Many Requests"))
+    assert not eh_limitacao(Exception("500 Internal Server Error"))
+
+
+def test_falhas_transitorias_sao_repetidas():
+    tradutor = TradutorComFalhas([TooManyRequests(), ConnectionError()])
+    limitador = LimitadorTaxa(None)
+    limitado = TradutorLimitado(lambda: tradutor, limitador, tentativas=3, espera_base=0.001, espera_maxima=0.001)
+    assert limitado.translate('oi') == 'OI'
+    assert tradutor.chamadas == 3
+    assert limitado.novas_tentativas == 2
+    assert limitador.limitacoes == 1
+
+
+def test_erro_definitivo_nao_e_repetido():
+    tradutor = TradutorComFalhas([NotValidPayload()])
+    limitado = TradutorLimitado(lambda: tradutor, LimitadorTaxa(None), tentativas=5, espera_base=0.001)
+    with pytest.raises(NotValidPayload):
+        limitado.translate('oi')
+    assert tradutor.chamadas == 1
+
+
+def test_desiste_depois_das_tentativas():
+    tradutor = TradutorComFalhas([ConnectionError()] * 3)
+    limitado = TradutorLimitado(lambda: tradutor, LimitadorTaxa(None), tentativas=3, espera_base=0.001, espera_maxima=0.001)
+    with pytest.raises(ConnectionError):
+        limitado.translate('oi')
+    assert tradutor.chamadas == 3
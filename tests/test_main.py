@@ -0,0 +1,37 @@
+from main import mapa_de_substituicao, substituir_literais_dart
+
+CHAMADA = 'AppLocalizations.of(context)!.'
+
+
+def test_substitui_so_literais_de_aspas_simples_no_codigo():
+    mapa = mapa_de_substituicao({'saudacao': 'Olá', 'despedida': 'Tchau'})
+    conteudo = (
+        "// Text('Olá')\n"
+        "Text('Olá');\n"
+        "Text(\"Olá\");\n"
+        "Text(r'Olá');\n"
+        "Text('Olá mundo');\n"
+        "Text('Tchau');\n"
+    )
+    resultado, substituicoes = substituir_literais_dart(conteudo, mapa)
+    assert substituicoes == 2
+    assert resultado == (
+        "// Text('Olá')\n"
+        f"Text({CHAMADA}saudacao);\n"
+        "Text(\"Olá\");\n"
+        "Text(r'Olá');\n"
+        "Text('Olá mundo');\n"
+        f"Text({CHAMADA}despedida);\n"
+    )
+
+
+def test_literal_interno_some_junto_com_o_externo_substituido():
+    mapa = mapa_de_substituicao({'externo': "Oi ${x ? 'a' : 'b'}", 'interno': 'a'})
+    resultado, substituicoes = substituir_literais_dart("Text('Oi ${x ? 'a' : 'b'}');", mapa)
+    assert (resultado, substituicoes) == (f"Text({CHAMADA}externo);", 1)
+
+
+def test_literal_interno_e_substituido_se_o_externo_nao_esta_no_mapa():
+    mapa = mapa_de_substituicao({'interno': 'a'})
+    resultado, substituicoes = substituir_literais_dart("Text('Oi ${x ? 'a' : 'b'}');", mapa)
+    assert (resultado, substituicoes) == (f"Text('Oi ${{x ? {CHAMADA}interno : 'b'}}');", 1)
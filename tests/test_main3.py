@@ -0,0 +1,94 @@
+import io
+import json
+import random
+
+import pytest
+
+import main3
+from main3 import iter_json_values
+
+
+def parse(text):
+    return list(iter_json_values(io.StringIO(text)))
+
+
+@pytest.mark.parametrize('text', [
+    '[,,"a" "b",]',
+    '["a" "b"]',
+    '["a",,"b"]',
+    '[,"a"]',
+    '["a",]',
+    '[1,2,]',
+    '[1] x',
+    '[1][2]',
+    '["a"',
+    '["a",',
+    '{"k" "v"}',
+    '{"k"::"v"}',
+    '{"k": "v",}',
+    '{"k": "v" "j": "w"}',
+    '{1: "v"}',
+    '"a"',
+    '',
+])
+def test_malformed_input_is_rejected(text, chunk_size):
+    with pytest.raises(json.JSONDecodeError):
+        parse(text)
+
+
+@pytest.mark.parametrize('text, values', [
+    ('[]', []),
+    (' [ ] ', []),
+    ('{}', []),
+    ('\ufeff["a"]', ['a']),
+    ('["a", "b"]', ['a', 'b']),
+    ('[1, 2.5, -3e2, true, null, "x"]', [1, 2.5, -300.0, True, None, 'x']),
+    ('{"k": "v", "j": ["w"]}', ['v', ['w']]),
+    ('\n[\n  "a,b",\n  "c]"\n]\n', ['a,b', 'c]']),
+])
+def test_valid_input(text, values, chunk_size):
+    assert parse(text) == values
+
+
+@pytest.fixture(params=[1, 2, 3, 7, main3.CHUNK_SIZE])
+def chunk_size(request, monkeypatch):
+    monkeypatch.setattr(main3, 'CHUNK_SIZE', request.param)
+    return request.param
+
+
+def test_numbers_split_across_chunks(chunk_size):
+    values = [3.5, 12345, -0.25, 1e10, 2.5e-3, 0, 100]
+    assert parse(json.dumps(values)) == values
+    assert parse(json.dumps(values, separators=(',', ':'))) == values
+
+
+def test_matches_json_loads_on_random_documents(chunk_size):
+    rng = random.Random(15)
+    alphabet = 'ab ,:[]{}"\\é\n'
+    for _ in range(200):
+        items = [
+            rng.choice([
+                ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 8))),
+                rng.randint(-10 ** 6, 10 ** 6),
+                rng.uniform(-1e3, 1e3),
+                None,
+                [rng.randint(0, 9)],
+                {'k': 'v'},
+            ])
+            for _ in range(rng.randint(0, 6))
+        ]
+        as_object = rng.random() < 0.3
+        document = {f'key{i}': item for i, item in enumerate(items)} if as_object else items
+        text = json.dumps(document, indent=rng.choice([None, 2]), ensure_ascii=rng.random() < 0.5)
+        assert parse(text) == items
+
+
+@pytest.mark.parametrize('name, content', [
+    ('values.json', json.dumps(['Olá', 1, 2.5, None, 'Sair'])),
+    ('values.json', json.dumps({'a': 'Olá', 'b': 'Sair'})),
+    ('values.txt', 'Olá\n\n  Sair  \n'),
+])
+def test_streaming_reader_matches_eager_reader(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content, encoding='utf-8')
+    assert list(main3.iter_values_from_file(str(path))) == main3.read_values_from_file(str(path))
@@ -0,0 +1,90 @@
+import threading
+
+import pipeline
+from limitador import LimitadorTaxa
+from main2 import OpcoesTraducao, resolver_simultaneas
+from memoria_traducao import MemoriaTraducao
+from pipeline import TradutorEmFluxo
+from tradutores import TradutorPseudo
+
+OPCOES = OpcoesTraducao(tradutor=TradutorPseudo.nome, tentativas=1, silencioso=True)
+
+
+def pseudo(valor, idioma='en'):
+    return TradutorPseudo('pt', idioma).translate(valor)
+
+
+def criar(fonte, existentes, fonte_anterior=None, **kwargs):
+    return TradutorEmFluxo('en', 'pt', OPCOES, LimitadorTaxa(None), fonte, existentes, fonte_anterior, **kwargs)
+
+
+def test_mantem_so_traducoes_cuja_fonte_nao_mudou():
+    fonte = {'@@locale': 'pt', 'a': 'A novo', 'b': 'B', 'c': 'C', '@b': {}}
+    existentes = {'a': 'A old', 'b': 'B en', 'orfa': 'X'}
+
+    tradutor = criar(fonte, existentes, fonte_anterior={'a': 'A', 'b': 'B'})
+    assert tradutor.traducoes == {'b': 'B en'}
+    assert tradutor.mantidas == 1
+
+    # Sem snapshot, toda tradução existente de uma chave da fonte é mantida.
+    tradutor = criar(fonte, existentes)
+    assert tradutor.traducoes == {'a': 'A old', 'b': 'B en'}
+
+
+def test_traduz_so_o_que_nao_foi_mantido(monkeypatch):
+    monkeypatch.setattr(pipeline, 'ESPERA_LOTE', 0.01)
+    fonte = {'a': 'A novo', 'b': 'B', 'c': 'B'}
+    tradutor = criar(fonte, {'a': 'A old', 'b': 'B en'}, fonte_anterior={'a': 'A', 'b': 'B'})
+    tradutor.start()
+    for chave, valor in fonte.items():
+        tradutor.enviar(chave, valor)
+    tradutor.finalizar()
+    tradutor.join()
+
+    assert tradutor.falha is None
+    assert tradutor.traducoes == {'a': pseudo('A novo'), 'b': 'B en', 'c': pseudo('B')}
+    assert tradutor.traduzidas == 2
+
+
+def test_envio_em_segundo_plano_nao_bloqueia_com_a_fila_cheia(monkeypatch):
+    monkeypatch.setattr(pipeline, 'TAMANHO_FILA_TRADUCAO', 2)
+    monkeypatch.setattr(pipeline, 'VALORES_POR_RODADA', 3)
+    monkeypatch.setattr(pipeline, 'ESPERA_LOTE', 0.01)
+    pares = [(f"k{i}", f"valor {i}") for i in range(50)]
+    tradutor = criar(dict(pares), {})
+
+    # O tradutor ainda não começou a consumir a fila; quem envia segue adiante.
+    enviado = threading.Event()
+    chamador = threading.Thread(target=lambda: (tradutor.enviar_em_segundo_plano(pares), enviado.set()))
+    chamador.start()
+    assert enviado.wait(5)
+
+    tradutor.start()
+    tradutor.finalizar()
+    tradutor.join(10)
+
+    assert not tradutor.is_alive()
+    assert tradutor.traducoes == {chave: pseudo(valor) for chave, valor in pares}
+
+
+def test_usa_e_alimenta_a_memoria(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline, 'ESPERA_LOTE', 0.01)
+    with MemoriaTraducao(str(tmp_path / 'memoria.db')) as memoria:
+        memoria.gravar('pt', 'en', 'Olá', 'Hello')
+        tradutor = criar({'ola': 'Olá', 'sair': 'Sair'}, {}, memoria=memoria)
+        tradutor.start()
+        tradutor.enviar('ola', 'Olá')
+        tradutor.enviar('sair', 'Sair')
+        tradutor.finalizar()
+        tradutor.join()
+
+        assert tradutor.traducoes == {'ola': 'Hello', 'sair': pseudo('Sair')}
+        assert tradutor.traduzidas == 1
+        assert memoria.buscar('pt', 'en', 'Sair') == pseudo('Sair')
+
+
+def test_resolver_simultaneas():
+    assert resolver_simultaneas(None, 4, True) == 4
+    assert resolver_simultaneas(None, 4, False) == 1
+    assert resolver_simultaneas(2, 4, True) == 2
+    assert resolver_simultaneas(8, 4, False) == 8
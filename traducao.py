@@ -0,0 +1,122 @@
+import re
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
+from typing import Any, Iterator, List, NamedTuple, Optional, Tuple
+
+# O Google Tradutor aceita até 5000 caracteres por requisição; a folga cobre os marcadores.
+LIMITE_CARACTERES_PADRAO = 4500
+LIMITE_ITENS_PADRAO = 1000
+
+# Cada valor do lote é precedido por um marcador numerado, que o tradutor preserva
+# e que permite separar e conferir os valores traduzidos.
+MARCADOR = '§§{}§§'
+MARCADOR_REGEX = re.compile(r'\s*§\s*§\s*(\d+)\s*§\s*§\s*')
+
+
+class ResultadoTraducao(NamedTuple):
+    traduzido: Optional[str]
+    erro: Optional[Exception] = None
+
+
+def traduzir_valor(tradutor: Any, valor: str) -> ResultadoTraducao:
+    try:
+        return ResultadoTraducao(tradutor.translate(valor))
+    except Exception as e:
+        return ResultadoTraducao(None, e)
+
+
+def montar_lotes(valores: List[str], limite_caracteres: int = LIMITE_CARACTERES_PADRAO,
+                 limite_itens: int = LIMITE_ITENS_PADRAO) -> Iterator[List[int]]:
+    """Agrupa os índices dos valores em lotes cujo texto montado cabe nos limites.
+    Valores que sozinhos estouram o limite, ou que contêm o marcador, vão em lotes unitários."""
+    lote: List[int] = []
+    tamanho_lote = 0
+
+    for indice, valor in enumerate(valores):
+        tamanho = len(valor) + len(MARCADOR.format(len(lote))) + 1
+        if tamanho > limite_caracteres or '§' in valor:
+            yield [indice]
+            continue
+        if lote and (tamanho_lote + tamanho > limite_caracteres or len(lote) >= limite_itens):
+            yield lote
+            lote, tamanho_lote = [], 0
+            tamanho = len(valor) + len(MARCADOR.format(0)) + 1
+        lote.append(indice)
+        tamanho_lote += tamanho
+
+    if lote:
+        yield lote
+
+
+def juntar_lote(valores: List[str]) -> str:
+    return '\n'.join(f"{MARCADOR.format(i)} {valor}" for i, valor in enumerate(valores))
+
+
+def separar_lote(texto_traduzido: str, quantidade: int) -> Optional[List[str]]:
+    """Separa a resposta de um lote. Retorna None se os marcadores não voltaram
+    completos e na ordem, caso em que o lote não é confiável."""
+    if not isinstance(texto_traduzido, str):
+        return None
+
+    partes = MARCADOR_REGEX.split(texto_traduzido)
+    if partes[0].strip() or len(partes) != 2 * quantidade + 1:
+        return None
+
+    indices = partes[1::2]
+    if indices != [str(i) for i in range(quantidade)]:
+        return None
+
+    return [parte.strip() for parte in partes[2::2]]
+
+
+def traduzir_lote(tradutor: Any, valores: List[str]) -> List[ResultadoTraducao]:
+    """Traduz vários valores numa única requisição (translate_batch do backend);
+    se o lote falhar ou voltar incompleto, traduz os valores um a um."""
+    if len(valores) == 1:
+        return [traduzir_valor(tradutor, valores[0])]
+
+    try:
+        separados = tradutor.translate_batch(valores)
+    except Exception:
+        separados = None
+
+    if separados is None or len(separados) != len(valores):
+        return [traduzir_valor(tradutor, valor) for valor in valores]
+
+    return [ResultadoTraducao(traduzido) for traduzido in separados]
+
+
+def traduzir_valores(tradutor: Any, valores: List[str], em_lotes: bool = False,
+                     limite_caracteres: int = LIMITE_CARACTERES_PADRAO,
+                     simultaneas: int = 1, executor: Optional[Executor] = None,
+                     limite_itens: int = LIMITE_ITENS_PADRAO) -> Iterator[Tuple[int, ResultadoTraducao]]:
+    """Gera (índice, resultado) à medida que cada requisição termina. Com
+    `simultaneas` > 1, ou com um `executor` compartilhado, as requisições rodam
+    em threads e a ordem de chegada pode diferir da ordem dos valores."""
+    if em_lotes:
+        unidades = list(montar_lotes(valores, limite_caracteres, limite_itens))
+    else:
+        unidades = [[indice] for indice in range(len(valores))]
+
+    def traduzir_unidade(unidade: List[int]) -> List[Tuple[int, ResultadoTraducao]]:
+        if len(unidade) == 1:
+            return [(unidade[0], traduzir_valor(tradutor, valores[unidade[0]]))]
+        return list(zip(unidade, traduzir_lote(tradutor, [valores[i] for i in unidade])))
+
+    if executor is None and simultaneas <= 1:
+        for unidade in unidades:
+            yield from traduzir_unidade(unidade)
+        return
+
+    executor_proprio = None
+    if executor is None:
+        executor = executor_proprio = ThreadPoolExecutor(max_workers=simultaneas)
+
+    futuros = [executor.submit(traduzir_unidade, unidade) for unidade in unidades]
+    try:
+        for futuro in as_completed(futuros):
+            yield from futuro.result()
+    finally:
+        for futuro in futuros:
+            futuro.cancel()
+        if executor_proprio:
+            executor_proprio.shutdown()
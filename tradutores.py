@@ -0,0 +1,91 @@
+import re
+import time
+from typing import Dict, List, Optional, Protocol, Type
+
+from traducao import juntar_lote, separar_lote
+
+
+class ErroSeparacaoLote(Exception):
+    """A resposta de um lote não pôde ser separada com segurança nos valores originais."""
+
+
+class Tradutor(Protocol):
+    """Interface dos backends de tradução.
+
+    Os limites são declarados na classe e usados para montar os lotes e
+    configurar o limitador de taxa: `limite_caracteres` e `limite_itens` por
+    requisição e `taxa_maxima` em requisições por segundo (None = sem limite)."""
+
+    nome: str
+    limite_caracteres: int
+    limite_itens: int
+    taxa_maxima: Optional[float]
+
+    def translate(self, texto: str) -> str: ...
+
+    def translate_batch(self, textos: List[str]) -> List[str]: ...
+
+
+class TradutorGoogle:
+    """Google Tradutor via deep_translator. Não há chamada em lote na API
+    gratuita, então o lote é enviado como um único texto com marcadores."""
+
+    nome = 'google'
+    limite_caracteres = 5000
+    limite_itens = 1000
+    taxa_maxima: Optional[float] = 50.0
+
+    def __init__(self, idioma_fonte: str, idioma_alvo: str):
+        # Importado aqui para que quem não usa o Google não pague pelo deep_translator/requests.
+        from deep_translator import GoogleTranslator
+        self._tradutor = GoogleTranslator(source=idioma_fonte, target=idioma_alvo)
+
+    def translate(self, texto: str) -> str:
+        return self._tradutor.translate(texto)
+
+    def translate_batch(self, textos: List[str]) -> List[str]:
+        separados = separar_lote(self._tradutor.translate(juntar_lote(textos)), len(textos))
+        if separados is None:
+            raise ErroSeparacaoLote(f"marcadores perdidos num lote de {len(textos)} valores")
+        return separados
+
+
+class TradutorPseudo:
+    """Backend offline e determinístico de pseudo-localização, para testes de
+    throughput e CI sem rede. Acentua as letras, expande o texto em ~30% e
+    preserva placeholders ({nome}, $nome, ${...}, tags HTML)."""
+
+    nome = 'pseudo'
+    limite_caracteres = 100000
+    limite_itens = 10000
+    taxa_maxima: Optional[float] = None
+
+    ACENTOS = str.maketrans('aeiouyAEIOUYcCnN', 'àéîõüýÀÉÎÕÜÝçÇñÑ')
+    PROTEGIDOS = re.compile(r'(\$\{[^}]*\}|\$\w+|\{[^}]*\}|<[^>]+>|%\w)')
+
+    def __init__(self, idioma_fonte: str, idioma_alvo: str, latencia: float = 0.0):
+        self.idioma_alvo = idioma_alvo
+        self.latencia = latencia
+
+    def _pseudo(self, texto: str) -> str:
+        partes = self.PROTEGIDOS.split(texto)
+        for i in range(0, len(partes), 2):
+            partes[i] = partes[i].translate(self.ACENTOS)
+        expansao = '~' * (len(texto) * 3 // 10)
+        return f"⟦{self.idioma_alvo}: {''.join(partes)}{expansao}⟧"
+
+    def translate(self, texto: str) -> str:
+        if self.latencia:
+            time.sleep(self.latencia)
+        return self._pseudo(texto)
+
+    def translate_batch(self, textos: List[str]) -> List[str]:
+        if self.latencia:
+            time.sleep(self.latencia)
+        return [self._pseudo(texto) for texto in textos]
+
+
+TRADUTORES: Dict[str, Type] = {
+    TradutorGoogle.nome: TradutorGoogle,
+    TradutorPseudo.nome: TradutorPseudo,
+}
@@ -0,0 +1,229 @@
+import os
+import re
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+# Pastas que nunca contêm código-fonte do projeto, ignoradas mesmo sem .gitignore.
+PASTAS_SEMPRE_IGNORADAS = ['.git/', '.dart_tool/']
+
+
+def _glob_para_regex(padrao: str) -> str:
+    """Traduz um glob no estilo do .gitignore (*, ?, [..], **) para regex."""
+    partes: List[str] = []
+    i = 0
+    while i < len(padrao):
+        c = padrao[i]
+        if c == '*':
+            if padrao.startswith('**', i):
+                if padrao.startswith('**/', i):
+                    partes.append('(?:.*/)?')
+                    i += 3
+                    continue
+                if i + 2 == len(padrao):
+                    partes.append('.*')
+                    i += 2
+                    continue
+            partes.append('[^/]*')
+        elif c == '?':
+            partes.append('[^/]')
+        elif c == '[':
+            fim = padrao.find(']', i + 2)
+            if fim == -1:
+                partes.append(re.escape(c))
+            else:
+                classe = padrao[i + 1:fim]
+                if classe.startswith('!'):
+                    classe = '^' + classe[1:]
+                partes.append(f"[{classe.replace(chr(92), chr(92) * 2)}]")
+                i = fim
+        elif c == '\\' and i + 1 < len(padrao):
+            i += 1
+            partes.append(re.escape(padrao[i]))
+        else:
+            partes.append(re.escape(c))
+        i += 1
+    return ''.join(partes)
+
+
+class RegraIgnorar(NamedTuple):
+    regex: str
+    negada: bool
+    so_pasta: bool
+
+
+def interpretar_linha(linha: str) -> Optional[RegraIgnorar]:
+    """Converte uma linha de .gitignore numa regra, ou None para linhas vazias e comentários."""
+    linha = linha.rstrip('\n\r')
+    if linha.endswith('\\ '):
+        linha = linha[:-2].rstrip(' ') + '\\ '
+    else:
+        linha = linha.rstrip(' ')
+    if not linha or linha.startswith('#'):
+        return None
+
+    negada = linha.startswith('!')
+    if negada:
+        linha = linha[1:]
+    elif linha.startswith(('\\!', '\\#')):
+        linha = linha[1:]
+
+    so_pasta = linha.endswith('/')
+    linha = linha.rstrip('/')
+    if not linha:
+        return None
+
+    # Com uma barra no início ou no meio, o padrão é relativo à pasta do .gitignore;
+    # sem barra, vale para o nome em qualquer nível.
+    ancorado = '/' in linha
+    regex = _glob_para_regex(linha.lstrip('/'))
+    if not ancorado:
+        regex = '(?:.*/)?' + regex
+    return RegraIgnorar(regex, negada, so_pasta)
+
+
+class PadroesIgnorados:
+    """Padrões de um .gitignore (ou do --excluir), relativos a uma pasta base,
+    compilados numa única regex para arquivos e outra para pastas.
+
+    As alternativas ficam na ordem inversa do arquivo e são testadas com
+    fullmatch, então a primeira que casa é a última regra aplicável, como no git
+    (inclusive para as negações com '!')."""
+
+    def __init__(self, linhas: Iterable[str]):
+        regras = [regra for regra in map(interpretar_linha, linhas) if regra]
+        self.vazio = not regras
+        self._arquivos = self._compilar([regra for regra in regras if not regra.so_pasta])
+        self._pastas = self._compilar(regras)
+
+    @staticmethod
+    def _compilar(regras: Sequence[RegraIgnorar]) -> Optional['re.Pattern']:
+        if not regras:
+            return None
+        alternativas = [
+            f"(?P<{'r' if regra.negada else 'i'}{indice}>{regra.regex})"
+            for indice, regra in enumerate(reversed(regras))
+        ]
+        return re.compile('|'.join(alternativas), re.DOTALL)
+
+    @classmethod
+    def de_arquivo(cls, caminho: str) -> 'PadroesIgnorados':
+        try:
+            with open(caminho, 'r', encoding='utf-8', errors='replace') as f:
+                return cls(f)
+        except OSError:
+            return cls([])
+
+    def verificar(self, caminho_relativo: str, eh_pasta: bool) -> Optional[bool]:
+        """True se ignorado, False se re-incluído por uma negação, None se nenhuma regra se aplica."""
+        regex = self._pastas if eh_pasta else self._arquivos
+        if regex is None:
+            return None
+        encontrado = regex.fullmatch(caminho_relativo)
+        if not encontrado:
+            return None
+        return encontrado.lastgroup[0] == 'i'
+
+
+class _Escopo(NamedTuple):
+    """Padrões válidos numa subárvore. O caminho relativo à base dos padrões é
+    `prefixo + caminho_relativo_a_raiz[corte:]`."""
+    padroes: PadroesIgnorados
+    prefixo: str
+    corte: int
+
+
+def _escopos_ancestrais(raiz: str) -> List[_Escopo]:
+    """Os .gitignore das pastas acima da raiz, até a raiz do repositório git
+    (ex: o .gitignore do projeto quando a pasta analisada é lib/). Fora de um
+    repositório, nenhum."""
+    escopos: List[_Escopo] = []
+    pasta = os.path.abspath(raiz)
+    caminho_ate_raiz = ''
+    while not os.path.exists(os.path.join(pasta, '.git')):
+        pai = os.path.dirname(pasta)
+        if pai == pasta:
+            return []
+        caminho_ate_raiz = os.path.basename(pasta) + '/' + caminho_ate_raiz
+        pasta = pai
+        padroes = PadroesIgnorados.de_arquivo(os.path.join(pasta, '.gitignore'))
+        if not padroes.vazio:
+            escopos.append(_Escopo(padroes, caminho_ate_raiz, 0))
+    # Do mais externo para o mais interno.
+    return escopos[::-1]
+
+
+def _glob_literal(caminho: str) -> str:
+    return re.sub(r'([*?\[\\])', r'\\\1', caminho)
+
+
+def padroes_de_exclusao(raiz: str, excluir: Iterable[str]) -> List[str]:
+    """Converte as entradas do --excluir em padrões relativos à raiz. Caminhos
+    existentes viram padrões ancorados; o resto é usado como glob do .gitignore."""
+    raiz_abs = os.path.abspath(raiz)
+    padroes = []
+    for entrada in excluir:
+        if os.path.exists(entrada):
+            relativo = os.path.relpath(os.path.abspath(entrada), raiz_abs).replace(os.sep, '/')
+            if relativo != '.' and not relativo.startswith('../'):
+                padroes.append('/' + _glob_literal(relativo))
+            continue
+        padroes.append(entrada)
+    return padroes
+
+
+def _decidir(escopos: Sequence[_Escopo], relativo: str, eh_pasta: bool) -> bool:
+    # Os escopos mais internos (e o --excluir, que fica por último) têm prioridade.
+    for escopo in reversed(escopos):
+        resultado = escopo.padroes.verificar(escopo.prefixo + relativo[escopo.corte:], eh_pasta)
+        if resultado is not None:
+            return resultado
+    return False
+
+
+def percorrer_arquivos(raiz: str, extensoes: Optional[Sequence[str]] = None, excluir: Iterable[str] = (),
+                       usar_gitignore: bool = True) -> Iterator[str]:
+    """Gera os arquivos de `raiz` (como os.path.join(raiz, ...), igual ao os.walk)
+    que terminam com uma das `extensoes`, respeitando os .gitignore e os padrões
+    de `excluir`. Pastas ignoradas são descartadas inteiras, sem serem listadas."""
+    extensoes_tupla = tuple(extensoes) if extensoes else None
+    fixos = PadroesIgnorados(PASTAS_SEMPRE_IGNORADAS + padroes_de_exclusao(raiz, excluir))
+    escopos_iniciais = _escopos_ancestrais(raiz) if usar_gitignore else []
+
+    pilha: List[Tuple[str, str, List[_Escopo]]] = [(raiz, '', escopos_iniciais)]
+    while pilha:
+        pasta, relativo_pasta, escopos = pilha.pop()
+
+        if usar_gitignore:
+            padroes = PadroesIgnorados.de_arquivo(os.path.join(pasta, '.gitignore'))
+            if not padroes.vazio:
+                escopos = escopos + [_Escopo(padroes, '', len(relativo_pasta))]
+        escopos_com_fixos = escopos + [_Escopo(fixos, '', 0)]
+
+        try:
+            entradas = sorted(os.scandir(pasta), key=lambda entrada: entrada.name)
+        except OSError:
+            continue
+
+        subpastas = []
+        for entrada in entradas:
+            relativo = relativo_pasta + entrada.name
+            try:
+                eh_pasta = entrada.is_dir(follow_symlinks=False)
+                # Como no os.walk, links para pastas não são percorridos.
+                if not eh_pasta and entrada.is_symlink() and entrada.is_dir():
+                    continue
+            except OSError:
+                continue
+
+            if eh_pasta:
+                if not _decidir(escopos_com_fixos, relativo, True):
+                    subpastas.append((entrada.path, relativo + '/', escopos))
+                continue
+
+            if extensoes_tupla and not entrada.name.endswith(extensoes_tupla):
+                continue
+            if _decidir(escopos_com_fixos, relativo, False):
+                continue
+            yield entrada.path
+
+        # Em ordem inversa na pilha para visitar as subpastas em ordem alfabética.
+        pilha.extend(reversed(subpastas))